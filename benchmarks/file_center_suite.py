@@ -0,0 +1,578 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+Runs the benchmark suite for the hot paths of the file center on SQLite and
+a temporary local file store and writes the results as JSON:
+
+    python benchmarks/file_center_suite.py [--output PATH] [--baseline PATH]
+        [--rows 10000,100000,1000000] [--fan-outs 10,100,1000,10000]
+
+Results of a previous run given as baseline are compared to the current
+ones. Metrics worse than the tolerance given are reported as regressions
+and result in exit code 1.
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from random import Random
+from tempfile import TemporaryDirectory
+from time import time
+import json
+import os
+import platform
+import sys
+
+from dNG.data.file_center.environment import Environment
+
+CHUNK_SIZE = 65536
+"""
+Chunk size used for streaming reads and writes
+"""
+OWNER_ENTRIES = 1000
+"""
+Number of entries created below each owner root directory
+"""
+SAVE_BATCH_SIZE = 1000
+"""
+Number of entries saved with one "Entry.save_many()" call
+"""
+
+def compare(baseline, results, tolerance = 0.2):
+    """
+Compares the metrics of the given results with the ones of the baseline.
+Metrics ending with "_per_second" are expected to be higher, ones ending
+with "_ms" or "_seconds" to be lower.
+
+:param baseline: Results of a previous run
+:param results: Results of the current run
+:param tolerance: Relative difference tolerated
+
+:return: (list) Regressions found as tuples of metric, baseline and value
+    """
+
+    _return = [ ]
+
+    baseline_metrics = _flatten_metrics(baseline.get("results", { }))
+    metrics = _flatten_metrics(results.get("results", { }))
+
+    for name in sorted(metrics):
+        baseline_value = baseline_metrics.get(name)
+        value = metrics[name]
+
+        if (baseline_value is None or value is None or baseline_value <= 0): continue
+
+        if (name.endswith("_per_second")): is_regression = (value < baseline_value * (1 - tolerance))
+        elif (name.endswith("_ms") or name.endswith("_seconds")): is_regression = (value > baseline_value * (1 + tolerance))
+        else: is_regression = False
+
+        if (is_regression): _return.append(( name, baseline_value, value ))
+    #
+
+    return _return
+#
+
+def _flatten_metrics(data, prefix = ""):
+    """
+Returns all numeric values of the given nested dictionary by their path.
+
+:return: (dict) Numeric values by path
+    """
+
+    _return = { }
+
+    for key in data:
+        name = prefix + str(key)
+
+        if (isinstance(data[key], dict)): _return.update(_flatten_metrics(data[key], name + "."))
+        elif (isinstance(data[key], ( int, float )) and (not isinstance(data[key], bool))): _return[name] = data[key]
+    #
+
+    return _return
+#
+
+def _get_latency_stats(timings):
+    """
+Returns the latency statistics of the given timings.
+
+:param timings: List of timings in seconds
+
+:return: (dict) Latency statistics in milliseconds
+    """
+
+    timings = sorted(timings)
+    timings_count = len(timings)
+
+    return { "samples": timings_count,
+             "mean_ms": 1000.0 * sum(timings) / timings_count,
+             "p50_ms": 1000.0 * timings[int(timings_count * 0.5)],
+             "p95_ms": 1000.0 * timings[min(int(timings_count * 0.95), timings_count - 1)],
+             "p99_ms": 1000.0 * timings[min(int(timings_count * 0.99), timings_count - 1)],
+             "max_ms": 1000.0 * timings[-1]
+           }
+#
+
+def _get_rate(count, seconds):
+    """
+Returns the rate per second for the given count and duration.
+
+:return: (float) Rate per second
+    """
+
+    return count / max(seconds, 0.000001)
+#
+
+def _new_directory(parent, title, owner_id):
+    """
+Creates a new directory entry below the given parent. A new main entry is
+created if no parent is given.
+
+:return: (object) Entry instance
+    """
+
+    from dNG.data.file_center.entry import Entry
+
+    _return = Entry()
+
+    _return.set_data_attributes(title = title,
+                                vfs_type = Entry.VFS_TYPE_DIRECTORY,
+                                owner_type = "u",
+                                owner_id = owner_id,
+                                mimeclass = "directory",
+                                mimetype = "text/directory"
+                               )
+
+    if (parent is None):
+        _return.set_as_main_entry()
+        _return.save()
+    else: parent.add_entry(_return)
+
+    return _return
+#
+
+def _new_file_entry(title, owner_id, data):
+    """
+Creates a new entry for a stored file with the given content. The entry is
+not saved.
+
+:return: (object) Entry instance
+    """
+
+    from dNG.data.file_center.entry import Entry
+
+    _return = Entry.new_stored_file()
+
+    _return.set_data_attributes(title = title,
+                                owner_type = "u",
+                                owner_id = owner_id,
+                                mimeclass = "application",
+                                mimetype = "application/octet-stream"
+                               )
+
+    _return.write(data)
+    _return.flush()
+
+    return _return
+#
+
+def _populate_lookup_entries(rows_present, rows):
+    """
+Adds entries with synthetic VFS URLs and role IDs until the given number of
+rows exists. Each owner root directory contains "OWNER_ENTRIES" entries.
+
+:param rows_present: Number of entries already created
+:param rows: Number of entries requested
+
+:return: (float) Number of seconds spent
+    """
+
+    from dNG.data.file_center.entry import Entry
+
+    time_started = time()
+
+    for owner_offset in range(rows_present, rows, OWNER_ENTRIES):
+        owner_id = "benchmark_owner_{0:d}".format(owner_offset // OWNER_ENTRIES)
+        owner_root_directory = Entry.load_or_create_owner_root_directory(owner_id)
+
+        entries = [ ]
+
+        for position in range(owner_offset, min(owner_offset + OWNER_ENTRIES, rows)):
+            entry = Entry()
+
+            entry.set_data_attributes(title = "{0:d}".format(position),
+                                      vfs_type = Entry.VFS_TYPE_ITEM,
+                                      vfs_url = "x-file-store:///benchmark/{0:d}".format(position),
+                                      role_id = "benchmark_{0:d}".format(position),
+                                      owner_type = "u",
+                                      owner_id = owner_id,
+                                      mimeclass = "application",
+                                      mimetype = "application/octet-stream"
+                                     )
+
+            entries.append(entry)
+        #
+
+        Entry.save_many(entries, owner_root_directory)
+    #
+
+    return time() - time_started
+#
+
+def run_create(count):
+    """
+Measures the throughput of "Entry.new_stored_file()" followed by
+"Entry.save()" for small stored files.
+
+:param count: Number of stored files created
+
+:return: (dict) Results
+    """
+
+    from dNG.data.file_center.entry import Entry
+
+    time_started = time()
+
+    for position in range(count):
+        entry = Entry.new_stored_file()
+
+        entry.set_data_attributes(title = "create_{0:d}".format(position),
+                                  owner_type = "u",
+                                  owner_id = "benchmark_create",
+                                  mimeclass = "application",
+                                  mimetype = "application/octet-stream"
+                                 )
+
+        entry.set_as_main_entry()
+        entry.write(b"benchmark")
+        entry.save()
+        entry.close()
+    #
+
+    seconds = time() - time_started
+
+    return { "count": count, "seconds": seconds, "entries_per_second": _get_rate(count, seconds) }
+#
+
+def run_delete(width, depth):
+    """
+Measures recursive "Entry.delete()" calls for a deep and a wide tree. Each
+directory of the deep tree contains a stored file and the next directory.
+The wide tree is a directory containing the given number of stored files.
+
+:param width: Number of stored files of the wide tree
+:param depth: Number of directory levels of the deep tree
+
+:return: (dict) Results by tree shape
+    """
+
+    from dNG.data.file_center.entry import Entry
+
+    _return = { }
+
+    root = _new_directory(None, "deep", "benchmark_delete")
+    parent = root
+
+    for level in range(depth):
+        Entry.save_many([ _new_file_entry("file_{0:d}".format(level), "benchmark_delete", b"benchmark") ], parent)
+        parent = _new_directory(parent, "level_{0:d}".format(level), "benchmark_delete")
+    #
+
+    time_started = time()
+    stats = root.delete()
+    seconds = time() - time_started
+
+    _return['deep'] = { "depth": depth,
+                        "entries": stats['entries'],
+                        "seconds": seconds,
+                        "entries_per_second": _get_rate(stats['entries'], seconds)
+                      }
+
+    root = _new_directory(None, "wide", "benchmark_delete")
+
+    for offset in range(0, width, SAVE_BATCH_SIZE):
+        entries = [ _new_file_entry("file_{0:d}".format(position), "benchmark_delete", b"benchmark")
+                    for position in range(offset, min(offset + SAVE_BATCH_SIZE, width))
+                  ]
+
+        Entry.save_many(entries, root)
+        for entry in entries: entry.close()
+    #
+
+    time_started = time()
+    stats = root.delete()
+    seconds = time() - time_started
+
+    _return['wide'] = { "width": width,
+                        "entries": stats['entries'],
+                        "seconds": seconds,
+                        "entries_per_second": _get_rate(stats['entries'], seconds)
+                      }
+
+    return _return
+#
+
+def run_listing(fan_outs, page_size = 50):
+    """
+Measures listing directories of the given fan-outs with
+"Entry.iter_content_list()".
+
+:param fan_outs: List of numbers of entries per directory
+:param page_size: Number of entries of the first page listed
+
+:return: (dict) Results by fan-out
+    """
+
+    from dNG.data.file_center.entry import Entry
+
+    _return = { }
+
+    for fan_out in fan_outs:
+        directory = _new_directory(None, "listing_{0:d}".format(fan_out), "benchmark_listing")
+
+        for offset in range(0, fan_out, SAVE_BATCH_SIZE):
+            entries = [ ]
+
+            for position in range(offset, min(offset + SAVE_BATCH_SIZE, fan_out)):
+                entry = Entry()
+
+                entry.set_data_attributes(title = "{0:08d}".format(position),
+                                          vfs_type = Entry.VFS_TYPE_ITEM,
+                                          vfs_url = "x-file-store:///benchmark/listing/{0:d}/{1:d}".format(fan_out, position),
+                                          owner_type = "u",
+                                          owner_id = "benchmark_listing",
+                                          mimeclass = "application",
+                                          mimetype = "application/octet-stream"
+                                         )
+
+                entries.append(entry)
+            #
+
+            Entry.save_many(entries, directory)
+        #
+
+        time_started = time()
+        count = sum(1 for _ in directory.iter_content_list(limit = page_size))
+        first_page_seconds = time() - time_started
+
+        time_started = time()
+        entries_count = sum(1 for _ in directory.iter_content_list())
+        seconds = time() - time_started
+
+        _return[str(fan_out)] = { "entries": entries_count,
+                                  "first_page_entries": count,
+                                  "first_page_ms": 1000.0 * first_page_seconds,
+                                  "seconds": seconds,
+                                  "entries_per_second": _get_rate(entries_count, seconds)
+                                }
+    #
+
+    return _return
+#
+
+def run_lookups(rows_list, samples = 1000, seed = 0):
+    """
+Measures the latency of "Entry.load_vfs_url()", "Entry.load_role_id()" and
+"Entry.load_owner_root_directory()" after populating the database with the
+given numbers of entries.
+
+:param rows_list: List of numbers of entries
+:param samples: Number of lookups per method and number of entries
+:param seed: Seed used to select the entries looked up
+
+:return: (dict) Results by number of entries
+    """
+
+    from dNG.data.file_center.entry import Entry
+    from dNG.data.file_center.owner_root_directory_cache import OwnerRootDirectoryCache
+
+    _return = { }
+
+    random = Random(seed)
+    rows_present = 0
+
+    for rows in sorted(rows_list):
+        populate_seconds = _populate_lookup_entries(rows_present, rows)
+        rows_present = max(rows, rows_present)
+
+        positions = [ random.randrange(rows_present) for _ in range(samples) ]
+        results = { "populate_seconds": populate_seconds }
+
+        for ( name, callback, value_format ) in ( ( "load_vfs_url", Entry.load_vfs_url, "x-file-store:///benchmark/{0:d}" ),
+                                                  ( "load_role_id", Entry.load_role_id, "benchmark_{0:d}" )
+                                                ):
+            timings = [ ]
+
+            for position in positions:
+                time_started = time()
+                callback(value_format.format(position))
+                timings.append(time() - time_started)
+            #
+
+            results[name] = _get_latency_stats(timings)
+        #
+
+        owner_root_directory_cache = OwnerRootDirectoryCache.get_instance()
+        owner_root_directory_cache.clear()
+
+        for name in ( "load_owner_root_directory_uncached", "load_owner_root_directory" ):
+            timings = [ ]
+
+            for position in positions:
+                owner_id = "benchmark_owner_{0:d}".format(position // OWNER_ENTRIES)
+                if (name == "load_owner_root_directory_uncached"): owner_root_directory_cache.invalidate(owner_id)
+
+                time_started = time()
+                Entry.load_owner_root_directory(owner_id)
+                timings.append(time() - time_started)
+            #
+
+            results[name] = _get_latency_stats(timings)
+        #
+
+        _return[str(rows)] = results
+    #
+
+    return _return
+#
+
+def run_streaming(size, repetitions = 3):
+    """
+Measures streaming writes of a stored file with "Entry.write()" and reads
+with all read paths of "read_throughput.py".
+
+:param size: Size of the stored file in bytes
+:param repetitions: Number of repetitions for each read path
+
+:return: (dict) Results
+    """
+
+    import read_throughput
+
+    data = os.urandom(CHUNK_SIZE)
+    directory = _new_directory(None, "streaming", "benchmark_streaming")
+
+    entry = _new_file_entry("streaming", "benchmark_streaming", b"")
+    directory.add_entry(entry)
+
+    time_started = time()
+
+    for _ in range(0, size, CHUNK_SIZE): entry.write(data)
+    entry.close()
+
+    seconds = time() - time_started
+
+    _return = { "size": size,
+                "write_megabytes_per_second": _get_rate(size / 1048576.0, seconds)
+              }
+
+    read_results = read_throughput.run(entry, repetitions)
+
+    for name in read_results:
+        _return["{0}_megabytes_per_second".format(name)] = read_results[name]
+    #
+
+    return _return
+#
+
+def main(args = None):
+    """
+Command line entry point.
+
+:param args: Command line arguments
+
+:return: (int) Exit code
+    """
+
+    from argparse import ArgumentParser
+
+    argument_parser = ArgumentParser(description = "Runs the file center benchmark suite")
+    argument_parser.add_argument("--output", dest = "output_path")
+    argument_parser.add_argument("--baseline", dest = "baseline_path")
+    argument_parser.add_argument("--tolerance", dest = "tolerance", type = float, default = 0.2)
+    argument_parser.add_argument("--rows", dest = "rows", default = "10000,100000,1000000")
+    argument_parser.add_argument("--samples", dest = "samples", type = int, default = 1000)
+    argument_parser.add_argument("--fan-outs", dest = "fan_outs", default = "10,100,1000,10000")
+    argument_parser.add_argument("--create-count", dest = "create_count", type = int, default = 1000)
+    argument_parser.add_argument("--delete-width", dest = "delete_width", type = int, default = 10000)
+    argument_parser.add_argument("--delete-depth", dest = "delete_depth", type = int, default = 100)
+    argument_parser.add_argument("--stream-size", dest = "stream_size", type = int, default = 268435456)
+    argument_parser.add_argument("--setting", dest = "settings", action = "append", default = [ ])
+
+    parsed_args = argument_parser.parse_args(args)
+
+    parameters = { "rows": [ int(value) for value in parsed_args.rows.split(",") ],
+                   "samples": parsed_args.samples,
+                   "fan_outs": [ int(value) for value in parsed_args.fan_outs.split(",") ],
+                   "create_count": parsed_args.create_count,
+                   "delete_width": parsed_args.delete_width,
+                   "delete_depth": parsed_args.delete_depth,
+                   "stream_size": parsed_args.stream_size
+                 }
+
+    with TemporaryDirectory() as path:
+        Environment.setup(path, [ ], parsed_args.settings, True)
+
+        results = { "create": run_create(parameters['create_count']),
+                    "streaming": run_streaming(parameters['stream_size']),
+                    "listing": run_listing(parameters['fan_outs']),
+                    "delete": run_delete(parameters['delete_width'], parameters['delete_depth']),
+                    "lookups": run_lookups(parameters['rows'], parameters['samples'])
+                  }
+    #
+
+    output = { "created": time(),
+               "python": platform.python_version(),
+               "platform": platform.platform(),
+               "parameters": parameters,
+               "results": results
+             }
+
+    output_data = json.dumps(output, indent = 2, sort_keys = True)
+
+    if (parsed_args.output_path is None): sys.stdout.write(output_data + "\n")
+    else:
+        with open(parsed_args.output_path, "w") as file_object: file_object.write(output_data + "\n")
+    #
+
+    _return = 0
+
+    if (parsed_args.baseline_path is not None):
+        with open(parsed_args.baseline_path) as file_object: baseline = json.load(file_object)
+
+        regressions = compare(baseline, output, parsed_args.tolerance)
+
+        for ( name, baseline_value, value ) in regressions:
+            sys.stderr.write("Regression: {0} changed from {1:.3f} to {2:.3f}\n".format(name, baseline_value, value))
+        #
+
+        if (len(regressions) > 0): _return = 1
+    #
+
+    return _return
+#
+
+if (__name__ == "__main__"): sys.exit(main())
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+Compares the throughput of the read paths of a stored file:
+
+    python benchmarks/read_throughput.py <entry ID> [repetitions]
+
+The PAS environment (settings, database and file store) must be configured
+before running it.
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from time import time
+import os
+import sys
+
+from dNG.data.file_center.entry import Entry
+
+CHUNK_SIZE = 65536
+
+def read_bytes(entry):
+    """
+Reads the stored file with "read()" calls returning new byte strings.
+
+:return: (int) Number of bytes read
+    """
+
+    _return = 0
+
+    vfs_object = entry.get_vfs_object(True)
+    vfs_object.seek(0)
+
+    while True:
+        data = vfs_object.read(CHUNK_SIZE)
+        if (len(data) < 1): break
+
+        _return += len(data)
+    #
+
+    return _return
+#
+
+def read_range(entry):
+    """
+Reads the stored file into a reused buffer with "Entry.iter_range()".
+
+:return: (int) Number of bytes read
+    """
+
+    return sum(len(chunk) for chunk in entry.iter_range(chunk_size = CHUNK_SIZE))
+#
+
+def read_range_mmap(entry):
+    """
+Reads the stored file with "Entry.iter_range_mmap()".
+
+:return: (int) Number of bytes read
+    """
+
+    return sum(len(chunk) for chunk in entry.iter_range_mmap(chunk_size = CHUNK_SIZE))
+#
+
+def read_sendfile(entry):
+    """
+Sends the stored file to "os.devnull" with "os.sendfile()".
+
+:return: (int) Number of bytes sent
+    """
+
+    _return = 0
+    ( file_descriptor, offset, length ) = entry.get_file_range()
+
+    with open(os.devnull, "wb") as file_object:
+        while (_return < length):
+            size = os.sendfile(file_object.fileno(), file_descriptor, offset + _return, length - _return)
+            if (size < 1): break
+
+            _return += size
+        #
+    #
+
+    return _return
+#
+
+def run(entry, repetitions = 5):
+    """
+Runs all read paths and returns their throughput.
+
+:param entry: Entry instance of a stored file
+:param repetitions: Number of repetitions for each read path
+
+:return: (dict) Megabytes per second by read path; None if not supported
+    """
+
+    _return = { }
+
+    for read_callback in ( read_bytes, read_range, read_range_mmap, read_sendfile ):
+        try:
+            size = 0
+            time_started = time()
+
+            for _ in range(repetitions): size += read_callback(entry)
+
+            _return[read_callback.__name__] = size / 1048576.0 / max(time() - time_started, 0.000001)
+        except Exception: _return[read_callback.__name__] = None
+    #
+
+    return _return
+#
+
+if (__name__ == "__main__"):
+    entry_id = sys.argv[1]
+    entries = Entry.load_ids([ entry_id ])
+
+    if (entry_id not in entries): sys.exit("Entry ID '{0}' is invalid".format(entry_id))
+
+    results = run(entries[entry_id], (int(sys.argv[2]) if (len(sys.argv) > 2) else 5))
+
+    for name in sorted(results):
+        sys.stdout.write("{0}: {1}\n".format(name, ("not supported" if (results[name] is None) else "{0:.1f} MB/s".format(results[name]))))
+    #
+#
@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from itertools import islice
+from posixpath import splitext
+from time import localtime, time
+from zipfile import ZIP64_LIMIT, ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
+import tarfile
+
+from dNG.database.connection import Connection
+from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+from dNG.runtime.value_exception import ValueException
+from dNG.vfs.implementation import Implementation
+
+from .entry import Entry
+
+class ArchiveExport(object):
+    """
+"ArchiveExport" streams a directory entry and all entries below it as a tar
+or zip archive. The tree is walked depth-first one listing chunk at a time
+and stored files are copied in chunks, so memory usage depends on the tree
+depth and chunk sizes only. The first bytes are available before the tree
+has been walked.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    FORMAT_TAR = "tar"
+    """
+POSIX (pax) tar archive
+    """
+    FORMAT_ZIP = "zip"
+    """
+Zip archive with data descriptors
+    """
+
+    def __init__(self, entry, archive_format = FORMAT_TAR, permission_batch = None, is_compressed = False, chunk_size = 65536):
+        """
+Constructor __init__(ArchiveExport)
+
+:param entry: Directory Entry instance
+:param archive_format: Archive format
+:param permission_batch: PermissionBatch instance of the user; None to
+                         export all entries. Its cache is cleared after
+                         each listing chunk.
+:param is_compressed: True to deflate files added to zip archives
+:param chunk_size: Maximum number of bytes read from a stored file at once
+
+:since: v0.2.00
+        """
+
+        if (archive_format not in ( ArchiveExport.FORMAT_TAR, ArchiveExport.FORMAT_ZIP )):
+            raise ValueException("Archive format given is not supported")
+        #
+
+        self.archive_format = archive_format
+        """
+Archive format
+        """
+        self.batch_size = Entry._get_batch_size()
+        """
+Number of entries listed at once
+        """
+        self.chunk_size = chunk_size
+        """
+Maximum number of bytes read from a stored file at once
+        """
+        self.entry = entry
+        """
+Directory Entry instance exported
+        """
+        self.is_compressed = is_compressed
+        """
+True to deflate files added to zip archives
+        """
+        self.output = [ ]
+        """
+Data written by "zipfile" but not yet returned
+        """
+        self.permission_batch = permission_batch
+        """
+PermissionBatch instance of the user
+        """
+        self.stats = { }
+        """
+Statistics of the current export
+        """
+    #
+
+    def flush(self):
+        """
+python.org: Flush the write buffers of the stream if applicable.
+
+:since: v0.2.00
+        """
+
+        pass
+    #
+
+    def _get_output(self):
+        """
+Returns and clears the data written by "zipfile".
+
+:return: (bytes) Data written
+:since:  v0.2.00
+        """
+
+        _return = b"".join(self.output)
+        self.output = [ ]
+
+        return _return
+    #
+
+    def get_stats(self):
+        """
+Returns the statistics of the current export.
+
+:return: (dict) Number of directories and files exported, bytes exported,
+         files skipped because their stored file could not be opened and
+         files truncated while being exported
+:since:  v0.2.00
+        """
+
+        _return = self.stats.copy()
+        _return['seconds'] = time() - _return.pop("time_started", time())
+
+        return _return
+    #
+
+    def iter_data(self):
+        """
+Returns a generator yielding the archive data.
+
+:return: (object) Generator yielding bytes
+:since:  v0.2.00
+        """
+
+        if (not self.entry.is_vfs_type(Entry.VFS_TYPE_DIRECTORY)): raise ValueException("Only directories can be exported")
+
+        if (self.permission_batch is not None and (not self.permission_batch.is_readable(self.entry))):
+            raise ValueException("Entry is not readable")
+        #
+
+        self.stats = { "directories": 0, "files": 0, "size": 0, "skipped": 0, "truncated": 0, "time_started": time() }
+
+        return (self._iter_tar_data() if (self.archive_format == ArchiveExport.FORMAT_TAR) else self._iter_zip_data())
+    #
+
+    def _iter_entries(self):
+        """
+Returns a generator walking the tree depth-first. Directories are returned
+before the entries below them.
+
+:return: (object) Generator yielding tuples of archive path, modification
+         time and VFS URL; the VFS URL is None for directories
+:since:  v0.2.00
+        """
+
+        entry_data = self.entry.get_data_attributes("title", "time_sortable")
+        path = ArchiveExport._get_name(entry_data['title'])
+
+        yield ( path, entry_data['time_sortable'], None )
+
+        stack = [ ( path, set(), self._iter_sub_entries(self.entry) ) ]
+
+        while (len(stack) > 0):
+            ( path, names, sub_entries ) = stack[-1]
+            sub_entry_data = next(sub_entries, None)
+
+            if (sub_entry_data is None):
+                stack.pop()
+                continue
+            #
+
+            ( entry_view, vfs_url ) = sub_entry_data
+
+            unique_name = ArchiveExport._get_name(entry_view.title)
+
+            if (unique_name in names):
+                ( name, extension ) = splitext(unique_name)
+                unique_counter = 1
+
+                while (unique_name in names):
+                    unique_counter += 1
+                    unique_name = "{0} ({1:d}){2}".format(name, unique_counter, extension)
+                #
+            #
+
+            names.add(unique_name)
+            sub_path = "{0}/{1}".format(path, unique_name)
+
+            if (entry_view.is_vfs_type(Entry.VFS_TYPE_DIRECTORY)):
+                yield ( sub_path, entry_view.time_sortable, None )
+                stack.append(( sub_path, set(), self._iter_sub_entries(entry_view.load_entry()) ))
+            elif (vfs_url is not None): yield ( sub_path, entry_view.time_sortable, vfs_url )
+        #
+    #
+
+    def _iter_file_data(self, vfs_object, size):
+        """
+Returns a generator yielding exactly the given number of bytes of the given
+VFS object. The archive member header has been written already, so missing
+bytes of a stored file truncated in the meantime are filled with zeros to
+keep the archive readable. The file is counted as truncated as its archive
+member is corrupted.
+
+:param vfs_object: VFS object
+:param size: Number of bytes
+
+:return: (object) Generator yielding bytes
+:since:  v0.2.00
+        """
+
+        is_truncated = False
+
+        while (size > 0):
+            data = (b"" if (is_truncated) else vfs_object.read(min(self.chunk_size, size)))
+
+            if (len(data) < 1):
+                if (not is_truncated):
+                    is_truncated = True
+                    self.stats['truncated'] += 1
+                #
+
+                data = bytes(min(self.chunk_size, size))
+            #
+
+            size -= len(data)
+            yield data
+        #
+    #
+
+    def _iter_sub_entries(self, entry):
+        """
+Returns a generator yielding the entries readable below the given one
+together with their VFS URL.
+
+:param entry: Directory Entry instance
+
+:return: (object) Generator yielding EntryView instance and VFS URL tuples
+:since:  v0.2.00
+        """
+
+        entry_views = entry.iter_content_views(chunk_size = self.batch_size)
+
+        while True:
+            entry_views_chunk = list(islice(entry_views, self.batch_size))
+            if (len(entry_views_chunk) < 1): break
+
+            if (self.permission_batch is not None):
+                self.permission_batch.get_permissions(entry_views_chunk)
+                entry_views_chunk = [ entry_view for entry_view in entry_views_chunk if self.permission_batch.is_readable(entry_view) ]
+
+                self.permission_batch.clear()
+            #
+
+            item_ids = [ entry_view.id for entry_view in entry_views_chunk if entry_view.is_vfs_type(Entry.VFS_TYPE_ITEM) ]
+            vfs_urls = { }
+
+            if (len(item_ids) > 0):
+                connection = Connection.get_instance()
+
+                with connection:
+                    vfs_urls = dict(connection.query(_DbFileCenterEntry.id, _DbFileCenterEntry.vfs_url)
+                                    .filter(_DbFileCenterEntry.id.in_(item_ids))
+                                    .all()
+                                   )
+                #
+            #
+
+            for entry_view in entry_views_chunk: yield ( entry_view, vfs_urls.get(entry_view.id) )
+        #
+    #
+
+    def _iter_tar_data(self):
+        """
+Returns a generator yielding the data of a POSIX (pax) tar archive.
+
+:return: (object) Generator yielding bytes
+:since:  v0.2.00
+        """
+
+        archive_size = 0
+
+        for ( path, mtime, vfs_url ) in self._iter_entries():
+            tar_info = tarfile.TarInfo(path)
+            tar_info.mtime = (mtime or 0)
+
+            if (vfs_url is None):
+                tar_info.mode = 0o755
+                tar_info.type = tarfile.DIRTYPE
+
+                data = tar_info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+                archive_size += len(data)
+
+                self.stats['directories'] += 1
+                yield data
+            else:
+                vfs_object = ArchiveExport._load_vfs_object(vfs_url)
+
+                if (vfs_object is None): self.stats['skipped'] += 1
+                else:
+                    try:
+                        tar_info.mode = 0o644
+                        tar_info.size = vfs_object.get_size()
+
+                        data = tar_info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+                        archive_size += len(data)
+
+                        yield data
+
+                        for data in self._iter_file_data(vfs_object, tar_info.size): yield data
+                    finally: vfs_object.close()
+
+                    padding_size = -tar_info.size % tarfile.BLOCKSIZE
+                    if (padding_size > 0): yield bytes(padding_size)
+
+                    archive_size += tar_info.size + padding_size
+
+                    self.stats['files'] += 1
+                    self.stats['size'] += tar_info.size
+                #
+            #
+        #
+
+        archive_size += 2 * tarfile.BLOCKSIZE
+        yield bytes(2 * tarfile.BLOCKSIZE + (-archive_size % tarfile.RECORDSIZE))
+    #
+
+    def _iter_zip_data(self):
+        """
+Returns a generator yielding the data of a zip archive.
+
+:return: (object) Generator yielding bytes
+:since:  v0.2.00
+        """
+
+        compress_type = (ZIP_DEFLATED if (self.is_compressed) else ZIP_STORED)
+
+        # This instance is not seekable and has no "tell()" method. "zipfile"
+        # writes data descriptors after the file data therefore.
+        zip_file = ZipFile(self, "w", compress_type)
+
+        try:
+            for ( path, mtime, vfs_url ) in self._iter_entries():
+                # Zip archives do not support timestamps before 1980.
+                date_time = localtime(max((mtime or 0), 315532800))[:6]
+
+                if (vfs_url is None):
+                    zip_info = ZipInfo(path + "/", date_time)
+                    zip_info.external_attr = (0o40755 << 16) | 0x10
+
+                    zip_file.writestr(zip_info, b"")
+                    self.stats['directories'] += 1
+                else:
+                    vfs_object = ArchiveExport._load_vfs_object(vfs_url)
+
+                    if (vfs_object is None): self.stats['skipped'] += 1
+                    else:
+                        try:
+                            size = vfs_object.get_size()
+
+                            zip_info = ZipInfo(path, date_time)
+                            zip_info.compress_type = compress_type
+                            zip_info.external_attr = 0o644 << 16
+                            zip_info.file_size = size
+
+                            with zip_file.open(zip_info, "w", force_zip64 = (size > ZIP64_LIMIT)) as zip_entry_file:
+                                for data in self._iter_file_data(vfs_object, size):
+                                    zip_entry_file.write(data)
+
+                                    data = self._get_output()
+                                    if (len(data) > 0): yield data
+                                #
+                            #
+                        finally: vfs_object.close()
+
+                        self.stats['files'] += 1
+                        self.stats['size'] += size
+                    #
+                #
+
+                data = self._get_output()
+                if (len(data) > 0): yield data
+            #
+        finally: zip_file.close()
+
+        yield self._get_output()
+    #
+
+    def write(self, data):
+        """
+python.org: Write the given bytes-like object, b, to the underlying raw
+stream, and return the number of bytes written.
+
+:param data: Bytes-like object
+
+:return: (int) Number of bytes written
+:since:  v0.2.00
+        """
+
+        self.output.append(bytes(data))
+        return len(data)
+    #
+
+    @staticmethod
+    def _get_name(title):
+        """
+Returns the archive member name for the given entry title.
+
+:param title: Entry title
+
+:return: (str) Archive member name
+:since:  v0.2.00
+        """
+
+        _return = ("" if (title is None) else title.replace("/", "_").replace("\\", "_"))
+        if (_return in ( "", ".", ".." )): _return = "_{0}".format(_return)
+
+        return _return
+    #
+
+    @staticmethod
+    def _load_vfs_object(vfs_url):
+        """
+Opens the stored file of the given VFS URL for reading.
+
+:param vfs_url: VFS URL
+
+:return: (object) VFS object; None if it can not be opened
+:since:  v0.2.00
+        """
+
+        try: _return = Implementation.load_vfs_url(vfs_url, True)
+        except Exception: _return = None
+
+        if (_return is not None and (not _return.is_valid())):
+            _return.close()
+            _return = None
+        #
+
+        return _return
+    #
+#
@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
+from itertools import islice
+from threading import Lock
+import asyncio
+
+from dNG.data.settings import Settings
+
+from .entry import Entry
+
+class AsyncEntry(object):
+    """
+"AsyncEntry" is an asyncio facade for an Entry instance. Database
+connections are thread-local, so every Entry is pinned to one worker of a
+bounded pool of single-threaded executors. All calls for an Entry and the
+entries listed by it are run by that worker.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    _executor_index = 0
+    """
+Index of the executor assigned next
+    """
+    _executors = None
+    """
+Single-threaded executors the entries are pinned to
+    """
+    _executors_lock = Lock()
+    """
+Thread safety lock for the executors
+    """
+
+    def __init__(self, entry, executor):
+        """
+Constructor __init__(AsyncEntry)
+
+:param entry: Entry instance
+:param executor: Executor the Entry instance is pinned to
+
+:since: v0.2.00
+        """
+
+        self.entry = entry
+        """
+Encapsulated Entry instance
+        """
+        self.executor = executor
+        """
+Executor the Entry instance is pinned to
+        """
+    #
+
+    async def close(self):
+        """
+Flushes and closes the stored file.
+
+:since: v0.2.00
+        """
+
+        await self.run(self.entry.close)
+    #
+
+    async def delete(self):
+        """
+Deletes this entry and all entries below it.
+
+:return: (dict) Number of database entries and bytes removed
+:since:  v0.2.00
+        """
+
+        return await self.run(self.entry.delete)
+    #
+
+    async def get_data_attributes(self, *args):
+        """
+Returns the requested attributes.
+
+:return: (dict) Values for the requested attributes
+:since:  v0.2.00
+        """
+
+        return await self.run(self.entry.get_data_attributes, *args)
+    #
+
+    def get_entry(self):
+        """
+Returns the encapsulated Entry instance. It must only be used by the
+executor it is pinned to.
+
+:return: (object) Entry instance
+:since:  v0.2.00
+        """
+
+        return self.entry
+    #
+
+    def get_id(self):
+        """
+Returns the ID of the entry.
+
+:return: (str) Entry ID
+:since:  v0.2.00
+        """
+
+        return self.entry.get_id()
+    #
+
+    async def iter_content_list(self, cursor = None, limit = None, chunk_size = None):
+        """
+Returns an asynchronous generator yielding AsyncEntry instances for the
+entries below this one in the default sort order. Entries are fetched one
+chunk at a time when the consumer asks for more.
+
+:param cursor: Cursor returned by "get_content_list_cursor()" of the last
+               entry already listed
+:param limit: Maximum number of entries returned
+:param chunk_size: Number of entries fetched per database query
+
+:return: (object) Asynchronous generator yielding AsyncEntry instances
+:since:  v0.2.00
+        """
+
+        if (chunk_size is None): chunk_size = Entry._get_batch_size()
+
+        entries = await self.run(self.entry.iter_content_list, cursor, limit, chunk_size)
+
+        while True:
+            entries_chunk = await self.run(lambda: list(islice(entries, chunk_size)))
+            if (len(entries_chunk) < 1): break
+
+            for entry in entries_chunk: yield AsyncEntry(entry, self.executor)
+        #
+    #
+
+    async def iter_range(self, offset = 0, length = None, chunk_size = 65536, read_ahead = 2):
+        """
+Returns an asynchronous generator yielding the content of the stored file.
+At most the given number of chunks are read ahead of the consumer, so a
+slow consumer slows down reading.
+
+:param offset: Offset to start reading at
+:param length: Number of bytes to read; None to read to the end
+:param chunk_size: Maximum size of each chunk
+:param read_ahead: Number of chunks read ahead of the consumer
+
+:return: (object) Asynchronous generator yielding bytes
+:since:  v0.2.00
+        """
+
+        queue = asyncio.Queue(max(1, read_ahead))
+        reader_task = asyncio.ensure_future(self._read_into_queue(queue, offset, length, chunk_size))
+
+        try:
+            while True:
+                data = await queue.get()
+
+                if (data is None):
+                    await reader_task
+                    break
+                #
+
+                yield data
+            #
+        finally:
+            if (not reader_task.done()): reader_task.cancel()
+        #
+    #
+
+    async def _read_into_queue(self, queue, offset, length, chunk_size):
+        """
+Reads the stored file into the given queue until it is read completely. A
+full queue pauses reading. If cancelled the stored file is closed by the
+executor the entry is pinned to.
+
+:param queue: asyncio queue
+:param offset: Offset to start reading at
+:param length: Number of bytes to read; None to read to the end
+:param chunk_size: Maximum size of each chunk
+
+:since: v0.2.00
+        """
+
+        is_cancelled = False
+
+        try:
+            vfs_object = await self.run(self.entry.get_vfs_object, True)
+            await self.run(vfs_object.seek, offset)
+
+            while (length is None or length > 0):
+                data = await self.run(vfs_object.read, (chunk_size if (length is None) else min(chunk_size, length)))
+                if (len(data) < 1): break
+
+                if (length is not None): length -= len(data)
+                await queue.put(data)
+            #
+        except asyncio.CancelledError:
+            is_cancelled = True
+            raise
+        finally:
+            if (is_cancelled):
+                # The consumer is gone and will not empty the queue anymore.
+                self.executor.submit(self.entry.close)
+                with suppress(asyncio.QueueFull): queue.put_nowait(None)
+            else: await queue.put(None)
+        #
+    #
+
+    async def run(self, callback, *args, **kwargs):
+        """
+Runs the given callback with the executor the entry is pinned to.
+
+:param callback: Python callback
+
+:return: (mixed) Callback return value
+:since:  v0.2.00
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(callback, *args, **kwargs))
+    #
+
+    async def save(self):
+        """
+Saves changes of the entry.
+
+:since: v0.2.00
+        """
+
+        await self.run(self.entry.save)
+    #
+
+    async def set_data_attributes(self, **kwargs):
+        """
+Sets values given as keyword arguments to this method.
+
+:since: v0.2.00
+        """
+
+        await self.run(partial(self.entry.set_data_attributes, **kwargs))
+    #
+
+    async def write(self, data):
+        """
+Writes the given bytes-like object to the stored file.
+
+:param data: Bytes-like object
+
+:return: (int) Number of bytes written
+:since:  v0.2.00
+        """
+
+        return await self.run(self.entry.write, data)
+    #
+
+    async def write_stream(self, stream):
+        """
+Writes all chunks of the given asynchronous iterable to the stored file.
+The next chunk is only requested after the previous one has been written.
+
+:param stream: Asynchronous iterable yielding bytes-like objects
+
+:return: (int) Number of bytes written
+:since:  v0.2.00
+        """
+
+        _return = 0
+
+        async for data in stream: _return += await self.write(data)
+
+        await self.run(self.entry.checkpoint)
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_executor():
+        """
+Returns the executor to pin a new entry to.
+
+:return: (object) Single-threaded executor
+:since:  v0.2.00
+        """
+
+        with AsyncEntry._executors_lock:
+            if (AsyncEntry._executors is None):
+                AsyncEntry._executors = [ ThreadPoolExecutor(max_workers = 1)
+                                          for _ in range(max(1, int(Settings.get("pas_file_center_async_workers", 4))))
+                                        ]
+            #
+
+            _return = AsyncEntry._executors[AsyncEntry._executor_index % len(AsyncEntry._executors)]
+            AsyncEntry._executor_index += 1
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    async def _load(callback, *args):
+        """
+Runs the given Entry loading callback with the executor assigned next.
+
+:param callback: Python callback returning an Entry instance
+
+:return: (object) AsyncEntry instance
+:since:  v0.2.00
+        """
+
+        executor = AsyncEntry._get_executor()
+        entry = await asyncio.get_running_loop().run_in_executor(executor, partial(callback, *args))
+
+        return AsyncEntry(entry, executor)
+    #
+
+    @staticmethod
+    async def load_id(_id):
+        """
+Loads the entry of the given ID.
+
+:param _id: Entry ID
+
+:return: (object) AsyncEntry instance
+:since:  v0.2.00
+        """
+
+        return await AsyncEntry._load(Entry.load_id, _id)
+    #
+
+    @staticmethod
+    async def load_owner_root_directory(owner_id):
+        """
+Loads the root directory entry of the given owner.
+
+:param owner_id: Owner ID
+
+:return: (object) AsyncEntry instance
+:since:  v0.2.00
+        """
+
+        return await AsyncEntry._load(Entry.load_owner_root_directory, owner_id)
+    #
+
+    @staticmethod
+    async def load_role_id(_id):
+        """
+Loads the entry of the given role ID.
+
+:param _id: Role ID
+
+:return: (object) AsyncEntry instance
+:since:  v0.2.00
+        """
+
+        return await AsyncEntry._load(Entry.load_role_id, _id)
+    #
+
+    @staticmethod
+    async def load_vfs_url(url):
+        """
+Loads the entry of the given VFS URL.
+
+:param url: VFS URL
+
+:return: (object) AsyncEntry instance
+:since:  v0.2.00
+        """
+
+        return await AsyncEntry._load(Entry.load_vfs_url, url)
+    #
+
+    @staticmethod
+    async def new_stored_file():
+        """
+Creates a new entry for a file backed by the file store.
+
+:return: (object) AsyncEntry instance
+:since:  v0.2.00
+        """
+
+        return await AsyncEntry._load(Entry.new_stored_file)
+    #
+
+    @staticmethod
+    def shutdown():
+        """
+Shuts down all executors after the calls pending have been run.
+
+:since: v0.2.00
+        """
+
+        with AsyncEntry._executors_lock:
+            if (AsyncEntry._executors is not None):
+                for executor in AsyncEntry._executors: executor.shutdown()
+                AsyncEntry._executors = None
+            #
+        #
+    #
+#
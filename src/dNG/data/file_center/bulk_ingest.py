@@ -0,0 +1,619 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from hashlib import sha256
+from time import time
+import json
+import mimetypes
+import os
+import sys
+
+from dNG.data.settings import Settings
+from dNG.database.connection import Connection
+from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+from dNG.database.nothing_matched_exception import NothingMatchedException
+from dNG.database.transaction_context import TransactionContext
+from dNG.runtime.value_exception import ValueException
+from dNG.vfs.implementation import Implementation
+
+from .entry import Entry
+from .environment import Environment
+
+class BulkIngest(object):
+    """
+"BulkIngest" copies a local directory tree into the file store. File
+contents are copied in parallel by a thread pool while entries are created
+in batches below the directory entries mirroring the local tree. Completed
+paths are recorded in an optional journal to resume interrupted runs.
+Entries created before an interruption but missing in the journal are
+found by their parent and title when resuming. Copied files not added as
+entries are deleted if a batch fails.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    JOURNAL_TYPE_DIRECTORY = "d"
+    """
+Journal record type of a directory entry created
+    """
+    JOURNAL_TYPE_FILE = "f"
+    """
+Journal record type of a file entry created
+    """
+
+    def __init__(self, source_path, parent_id, owner_id = None, journal_path = None, workers = None):
+        """
+Constructor __init__(BulkIngest)
+
+:param source_path: Local directory path to ingest
+:param parent_id: ID of the directory entry to add the tree to
+:param owner_id: Owner ID of the entries created
+:param journal_path: Path of the journal file used to resume interrupted
+                     runs
+:param workers: Number of threads copying file contents
+
+:since: v0.2.00
+        """
+
+        if (not os.path.isdir(source_path)): raise ValueException("Source path given is not a directory")
+
+        self.batch_size = int(Settings.get("pas_file_center_bulk_ingest_batch_size", 500))
+        """
+Number of file entries created in one transaction
+        """
+        self.directory_ids = { "": parent_id }
+        """
+Directory entry IDs by relative path
+        """
+        self.is_resuming = False
+        """
+True if a journal of an interrupted run has been read
+        """
+        self.journal_file = None
+        """
+Journal file object
+        """
+        self.journal_path = journal_path
+        """
+Path of the journal file
+        """
+        self.owner_id = owner_id
+        """
+Owner ID of the entries created
+        """
+        self.paths_completed = set()
+        """
+Relative paths of files already ingested
+        """
+        self.progress_callback = None
+        """
+Callback called with the current statistics after each batch
+        """
+        self.source_path = os.path.abspath(source_path)
+        """
+Local directory path to ingest
+        """
+        self.stats = { }
+        """
+Statistics of the current run
+        """
+        self.workers = (int(Settings.get("pas_file_center_bulk_ingest_workers", 4)) if (workers is None) else workers)
+        """
+Number of threads copying file contents
+        """
+    #
+
+    def _add_directory(self, path, title):
+        """
+Creates the directory entry for the given relative path unless recorded in
+the journal.
+
+:param path: Relative directory path
+:param title: Directory name
+
+:since: v0.2.00
+        """
+
+        if (path not in self.directory_ids):
+            parent_id = self.directory_ids[os.path.dirname(path)]
+
+            entry_id = (self._get_existing_entry_ids(parent_id, [ title ], Entry.VFS_TYPE_DIRECTORY).get(title)
+                        if (self.is_resuming) else
+                        None
+                       )
+
+            if (entry_id is None):
+                connection = Connection.get_instance()
+
+                with connection, TransactionContext():
+                    parents = Entry.load_ids([ parent_id ])
+
+                    entry = Entry()
+                    entry.set_data_attributes(title = title, vfs_type = Entry.VFS_TYPE_DIRECTORY, mimeclass = "directory")
+                    if (self.owner_id is not None): entry.set_data_attributes(owner_id = self.owner_id)
+
+                    parents[parent_id].add_entry(entry)
+                    entry_id = entry.get_id()
+                #
+
+                self.stats['directories'] += 1
+            #
+
+            self.directory_ids[path] = entry_id
+            self._write_journal([ ( BulkIngest.JOURNAL_TYPE_DIRECTORY, path, entry_id ) ])
+        #
+    #
+
+    def _add_files(self, file_data_list):
+        """
+Creates the file entries for the given copied files in one transaction.
+Files already added before an interruption are skipped and their copies
+deleted. The copies are deleted as well if the transaction fails.
+
+:param file_data_list: List of copied file data dictionaries
+
+:since: v0.2.00
+        """
+
+        if (self.is_resuming): file_data_list = self._remove_existing_files(file_data_list)
+
+        if (len(file_data_list) > 0):
+            connection = Connection.get_instance()
+            journal_records = [ ]
+
+            try:
+                with connection, TransactionContext():
+                    if (self.owner_id is not None):
+                        Entry.check_owner_quota(self.owner_id, sum(file_data['size'] for file_data in file_data_list))
+                    #
+
+                    parent_entries = { }
+
+                    for file_data in file_data_list:
+                        ( mimetype, _ ) = mimetypes.guess_type(file_data['path'])
+                        if (mimetype is None): mimetype = "application/octet-stream"
+
+                        entry = Entry()
+
+                        entry.set_data_attributes(title = os.path.basename(file_data['path']),
+                                                  vfs_url = file_data['vfs_url'],
+                                                  vfs_type = Entry.VFS_TYPE_ITEM,
+                                                  mimeclass = mimetype.split("/", 1)[0],
+                                                  mimetype = mimetype,
+                                                  size = file_data['size']
+                                                 )
+
+                        if (self.owner_id is not None): entry.set_data_attributes(owner_id = self.owner_id)
+
+                        entry.content_hash = file_data['content_hash']
+                        entry.content_hash_size = file_data['size']
+
+                        parent_id = self.directory_ids[os.path.dirname(file_data['path'])]
+                        parent_entries.setdefault(parent_id, [ ]).append(entry)
+
+                        journal_records.append(( BulkIngest.JOURNAL_TYPE_FILE, file_data['path'], entry.get_id() ))
+                    #
+
+                    parents = Entry.load_ids(list(parent_entries))
+                    for parent_id in parent_entries: Entry.save_many(parent_entries[parent_id], parents[parent_id])
+                #
+            except Exception:
+                for file_data in file_data_list: Entry.delete_vfs_url(file_data['vfs_url'])
+                raise
+            #
+
+            self._write_journal(journal_records)
+
+            for file_data in file_data_list:
+                self.paths_completed.add(file_data['path'])
+
+                self.stats['files'] += 1
+                self.stats['size'] += file_data['size']
+            #
+
+            if (self.progress_callback is not None): self.progress_callback(self.get_stats())
+        #
+    #
+
+    def _copy_file(self, path):
+        """
+Copies the content of the given relative file path to a new stored file.
+Called by the thread pool.
+
+:param path: Relative file path
+
+:return: (dict) Copied file data
+:since:  v0.2.00
+        """
+
+        content_hash = (sha256() if (Settings.get("pas_file_center_deduplication_enabled", False)) else None)
+        size = 0
+
+        vfs_object = Implementation.new_vfs_url(Implementation.TYPE_FILE, "x-file-store://")
+
+        try:
+            with open(os.path.join(self.source_path, path), "rb") as file_object:
+                data = file_object.read(65536)
+
+                while (len(data) > 0):
+                    vfs_object.write(data)
+                    if (content_hash is not None): content_hash.update(data)
+
+                    size += len(data)
+                    data = file_object.read(65536)
+                #
+            #
+
+            vfs_url = vfs_object.get_url()
+        finally: vfs_object.close()
+
+        return { "path": path, "vfs_url": vfs_url, "size": size, "content_hash": content_hash }
+    #
+
+    def _get_existing_entry_ids(self, parent_id, titles, vfs_type):
+        """
+Returns the IDs of the entries of the given VFS type and titles below the
+given parent.
+
+:param parent_id: Parent entry ID
+:param titles: List of entry titles
+:param vfs_type: VFS type
+
+:return: (dict) Entry IDs by title
+:since:  v0.2.00
+        """
+
+        connection = Connection.get_instance()
+
+        with connection:
+            return { title: entry_id
+                     for ( entry_id, title ) in (connection.query(_DbFileCenterEntry.id, _DbFileCenterEntry.title)
+                                                 .filter(_DbFileCenterEntry.id_parent == parent_id,
+                                                         _DbFileCenterEntry.title.in_(titles),
+                                                         _DbFileCenterEntry.vfs_type == vfs_type
+                                                        )
+                                                )
+                   }
+        #
+    #
+
+    def get_stats(self):
+        """
+Returns the statistics of the current run.
+
+:return: (dict) Number of directories, files and bytes ingested, files
+         skipped and the throughput in bytes per second
+:since:  v0.2.00
+        """
+
+        _return = self.stats.copy()
+
+        _return['seconds'] = time() - _return.pop("time_started", time())
+        _return['bytes_per_second'] = _return['size'] / max(_return['seconds'], 0.000001)
+
+        return _return
+    #
+
+    def _iter_paths(self):
+        """
+Walks the local directory tree and creates its directory entries. Relative
+paths of files not ingested yet are yielded.
+
+:return: (object) Generator yielding relative file paths
+:since:  v0.2.00
+        """
+
+        for ( directory_path, directory_names, file_names ) in os.walk(self.source_path):
+            directory_names.sort()
+
+            path = os.path.relpath(directory_path, self.source_path)
+            if (path == "."): path = ""
+            else: self._add_directory(path, os.path.basename(directory_path))
+
+            for file_name in sorted(file_names):
+                file_path = os.path.join(path, file_name)
+
+                if (file_path in self.paths_completed): self.stats['files_skipped'] += 1
+                else: yield file_path
+            #
+        #
+    #
+
+    def _read_journal(self):
+        """
+Reads the journal of an interrupted run.
+
+:since: v0.2.00
+        """
+
+        if (os.path.exists(self.journal_path)):
+            with open(self.journal_path, "r", encoding = "utf-8") as journal_file:
+                for line in journal_file:
+                    try: ( record_type, path, entry_id ) = json.loads(line)
+                    except ValueError: continue
+
+                    if (record_type == BulkIngest.JOURNAL_TYPE_DIRECTORY): self.directory_ids[path] = entry_id
+                    elif (record_type == BulkIngest.JOURNAL_TYPE_FILE): self.paths_completed.add(path)
+                #
+            #
+        #
+    #
+
+    def _remove_existing_files(self, file_data_list):
+        """
+Removes the copied files already added as entries before an interruption
+from the given list and deletes their copies.
+
+:param file_data_list: List of copied file data dictionaries
+
+:return: (list) Copied file data dictionaries to be added
+:since:  v0.2.00
+        """
+
+        _return = [ ]
+        file_data_lists = { }
+
+        for file_data in file_data_list:
+            parent_id = self.directory_ids[os.path.dirname(file_data['path'])]
+            file_data_lists.setdefault(parent_id, [ ]).append(file_data)
+        #
+
+        for parent_id in file_data_lists:
+            existing_entry_ids = self._get_existing_entry_ids(parent_id,
+                                                              [ os.path.basename(file_data['path']) for file_data in file_data_lists[parent_id] ],
+                                                              Entry.VFS_TYPE_ITEM
+                                                             )
+
+            for file_data in file_data_lists[parent_id]:
+                entry_id = existing_entry_ids.get(os.path.basename(file_data['path']))
+
+                if (entry_id is None): _return.append(file_data)
+                else:
+                    Entry.delete_vfs_url(file_data['vfs_url'])
+
+                    self._write_journal([ ( BulkIngest.JOURNAL_TYPE_FILE, file_data['path'], entry_id ) ])
+                    self.paths_completed.add(file_data['path'])
+
+                    self.stats['files_skipped'] += 1
+                #
+            #
+        #
+
+        return _return
+    #
+
+    def run(self):
+        """
+Ingests the local directory tree. Copied files not added as entries are
+deleted if the run fails.
+
+:return: (dict) Statistics of the run
+:since:  v0.2.00
+        """
+
+        if (self.directory_ids[''] not in Entry.load_ids([ self.directory_ids[''] ])):
+            raise NothingMatchedException("Parent entry ID '{0}' is invalid".format(self.directory_ids['']))
+        #
+
+        self.stats = { "directories": 0,
+                       "files": 0,
+                       "files_skipped": 0,
+                       "size": 0,
+                       "time_started": time()
+                     }
+
+        if (self.journal_path is not None):
+            self.is_resuming = os.path.exists(self.journal_path)
+
+            self._read_journal()
+            self.journal_file = open(self.journal_path, "a", encoding = "utf-8")
+        #
+
+        file_data_list = [ ]
+        futures = set()
+
+        try:
+            with ThreadPoolExecutor(max_workers = self.workers) as executor:
+                for path in self._iter_paths():
+                    futures.add(executor.submit(self._copy_file, path))
+
+                    if (len(futures) >= 4 * self.workers):
+                        ( futures_done, futures ) = wait(futures, return_when = FIRST_COMPLETED)
+                        BulkIngest._add_copied_file_data(file_data_list, futures_done)
+
+                        if (len(file_data_list) >= self.batch_size):
+                            ( file_data_batch, file_data_list ) = ( file_data_list, [ ] )
+                            self._add_files(file_data_batch)
+                        #
+                    #
+                #
+
+                ( futures_done, futures ) = wait(futures)
+                BulkIngest._add_copied_file_data(file_data_list, futures_done)
+
+                while (len(file_data_list) > 0):
+                    ( file_data_batch, file_data_list ) = ( file_data_list[:self.batch_size], file_data_list[self.batch_size:] )
+                    self._add_files(file_data_batch)
+                #
+            #
+        except Exception:
+            # Copied files not passed to "_add_files()" yet are deleted.
+            for future in wait(futures)[0]:
+                if (future.exception() is None): file_data_list.append(future.result())
+            #
+
+            for file_data in file_data_list: Entry.delete_vfs_url(file_data['vfs_url'])
+
+            raise
+        finally:
+            if (self.journal_file is not None):
+                self.journal_file.close()
+                self.journal_file = None
+            #
+        #
+
+        return self.get_stats()
+    #
+
+    def set_progress_callback(self, callback):
+        """
+Sets a callback called with the current statistics after each batch of
+file entries created.
+
+:param callback: Python callback
+
+:since: v0.2.00
+        """
+
+        self.progress_callback = callback
+    #
+
+    def _write_journal(self, records):
+        """
+Appends the given records to the journal after they have been committed.
+
+:param records: List of journal record tuples
+
+:since: v0.2.00
+        """
+
+        if (self.journal_file is not None):
+            for record in records: self.journal_file.write("{0}\n".format(json.dumps(record)))
+
+            self.journal_file.flush()
+            os.fsync(self.journal_file.fileno())
+        #
+    #
+
+    @staticmethod
+    def _add_copied_file_data(file_data_list, futures):
+        """
+Adds the copied file data of the given completed futures to the given list.
+The first exception raised by a copy is raised after all copied files have
+been added.
+
+:param file_data_list: List of copied file data dictionaries
+:param futures: Completed futures of "_copy_file()"
+
+:since: v0.2.00
+        """
+
+        handled_exception = None
+
+        for future in futures:
+            if (future.exception() is None): file_data_list.append(future.result())
+            elif (handled_exception is None): handled_exception = future.exception()
+        #
+
+        if (handled_exception is not None): raise handled_exception
+    #
+#
+
+def main(args = None):
+    """
+Command line entry point:
+
+    python -m dNG.data.file_center.bulk_ingest <source path> <parent entry ID>
+        [--owner-id ID] [--journal PATH] [--workers COUNT]
+        [--path-data PATH] [--settings-file PATH] [--setting KEY=VALUE]
+
+The settings files below "[path_data]/settings" or the ones given are read
+before running it.
+
+:param args: Command line arguments
+
+:return: (int) Exit code
+:since:  v0.2.00
+    """
+
+    from argparse import ArgumentParser
+
+    argument_parser = ArgumentParser(description = "Ingests a local directory tree into the file center")
+    argument_parser.add_argument("source_path")
+    argument_parser.add_argument("parent_id")
+    argument_parser.add_argument("--owner-id", dest = "owner_id")
+    argument_parser.add_argument("--journal", dest = "journal_path")
+    argument_parser.add_argument("--workers", dest = "workers", type = int)
+
+    Environment.add_arguments(argument_parser)
+
+    parsed_args = argument_parser.parse_args(args)
+    Environment.setup_arguments(parsed_args)
+
+    bulk_ingest = BulkIngest(parsed_args.source_path,
+                             parsed_args.parent_id,
+                             parsed_args.owner_id,
+                             parsed_args.journal_path,
+                             parsed_args.workers
+                            )
+
+    bulk_ingest.set_progress_callback(_write_progress)
+
+    stats = bulk_ingest.run()
+
+    sys.stdout.write("{0:d} files ({1:d} skipped) and {2:d} directories with {3:d} bytes ingested in {4:.1f} seconds\n".format(stats['files'],
+                                                                                                                               stats['files_skipped'],
+                                                                                                                               stats['directories'],
+                                                                                                                               stats['size'],
+                                                                                                                               stats['seconds']
+                                                                                                                              ))
+
+    return 0
+#
+
+def _write_progress(stats):
+    """
+Writes the progress of a command line run to "stderr".
+
+:param stats: Statistics of the current run
+
+:since: v0.2.00
+    """
+
+    sys.stderr.write("{0:d} files ({1:d} skipped), {2:d} directories, {3:d} bytes, {4:.1f} MB/s\n".format(stats['files'],
+                                                                                                      stats['files_skipped'],
+                                                                                                      stats['directories'],
+                                                                                                      stats['size'],
+                                                                                                      stats['bytes_per_second'] / 1048576.0
+                                                                                                     ))
+#
+
+if (__name__ == "__main__"): sys.exit(main())
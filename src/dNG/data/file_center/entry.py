@@ -32,6 +32,17 @@ https://www.direct-netware.de/redirect?licenses;gpl
 
 # pylint: disable=import-error,no-name-in-module
 
+from hashlib import sha256
+from itertools import islice
+from operator import itemgetter
+import heapq
+from time import time
+from uuid import uuid4 as uuid
+import mmap
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.expression import and_, bindparam, false, func, or_, true
+
 from dNG.data.binary import Binary
 from dNG.data.data_linker import DataLinker
 from dNG.data.ownable_lockable_read_mixin import OwnableLockableReadMixin
@@ -40,15 +51,26 @@ from dNG.data.settings import Settings
 from dNG.database.connection import Connection
 from dNG.database.instances.data_linker import DataLinker as _DbDataLinker
 from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+from dNG.database.instances.file_center_owner_usage import FileCenterOwnerUsage as _DbFileCenterOwnerUsage
+from dNG.database.instances.file_center_processing_job import FileCenterProcessingJob as _DbFileCenterProcessingJob
+from dNG.database.instances.file_center_stored_object import FileCenterStoredObject as _DbFileCenterStoredObject
 from dNG.database.lockable_mixin import LockableMixin
 from dNG.database.nothing_matched_exception import NothingMatchedException
 from dNG.database.sort_definition import SortDefinition
 from dNG.database.transaction_context import TransactionContext
+from dNG.module.named_loader import NamedLoader
+from dNG.runtime.io_exception import IOException
 from dNG.runtime.operation_not_supported_exception import OperationNotSupportedException
 from dNG.runtime.value_exception import ValueException
 from dNG.vfs.abstract import Abstract
 from dNG.vfs.implementation import Implementation
 
+from .entry_view import EntryView
+from .instrumentation import Instrumentation
+from .owner_root_directory_cache import OwnerRootDirectoryCache
+from .quota_exceeded_exception import QuotaExceededException
+from .vfs_handle_pool import VfsHandlePool
+
 class Entry(DataLinker, OwnableLockableReadMixin):
     """
 "Entry" represents an database file center entry.
@@ -62,6 +84,22 @@ class Entry(DataLinker, OwnableLockableReadMixin):
              GNU General Public License 2
     """
 
+    PROCESSING_STATE_DONE = "done"
+    """
+Post-ingest processing completed
+    """
+    PROCESSING_STATE_FAILED = "failed"
+    """
+Post-ingest processing failed permanently
+    """
+    PROCESSING_STATE_PROCESSING = "processing"
+    """
+Post-ingest processing in progress
+    """
+    PROCESSING_STATE_QUEUED = "queued"
+    """
+Post-ingest processing queued
+    """
     VFS_TYPE_DIRECTORY = 1
     """
 VFS container type
@@ -75,6 +113,10 @@ VFS item type
     """
 SQLAlchemy database instance class to initialize for new instances.
     """
+    _VFS_OBJECT_WRITING_METHODS = ( "set_size", "truncate" )
+    """
+Methods of the underlying VFS object changing the stored file
+    """
 
     def __init__(self, db_instance = None):
         """
@@ -89,10 +131,58 @@ Constructor __init__(Entry)
         LockableMixin.__init__(self)
         OwnableLockableReadMixin.__init__(self)
 
+        self.content_hash = None
+        """
+Content hash calculated while the stored file is written sequentially from
+its start
+        """
+        self.content_hash_size = 0
+        """
+Number of bytes added to the content hash
+        """
+        self.is_counted_in_totals = (db_instance is not None)
+        """
+True if this entry has been added to the tree totals of its parent
+directories and to the storage used by its owner
+        """
+        self.is_owner_quota_loaded = False
+        """
+True if the quota of the owner has been looked up for the VFS object opened
+        """
+        self.insert_batch = None
+        """
+Parents and totals shared by the entries inserted with "save_many()"
+        """
+        self.is_processing_queued_on_insert = True
+        """
+True to queue post-ingest processing if a stored file is inserted
+        """
+        self.is_vfs_object_pooled = False
+        """
+True if the VFS object has been acquired from the VFS handle pool
+        """
+        self.is_vfs_object_writable = False
+        """
+True if the VFS object has been opened for writing after the stored file
+has been detached from other entries
+        """
+        self.owner_quota_size_limit = None
+        """
+Maximum size of the stored file within the quota of its owner; None if
+unlimited
+        """
         self.vfs_object = None
         """
 Underlying VFS object
         """
+        self.vfs_size_synchronized = None
+        """
+Size of the stored file last written to the database
+        """
+        self.vfs_size_time_synchronized = 0
+        """
+UNIX timestamp of the last size written to the database
+        """
 
         self.set_max_inherited_permissions(OwnableLockableReadMixin.READABLE,
                                            OwnableLockableReadMixin.READABLE
@@ -121,10 +211,79 @@ class tree for self).
 :since:  v0.1.00
         """
 
-        self._ensure_vfs_object_instance()
+        self._ensure_vfs_object_instance(name not in Entry._VFS_OBJECT_WRITING_METHODS)
         return getattr(self.vfs_object, name)
     #
 
+    @Instrumentation.wrap("add_entry")
+    def add_entry(self, child):
+        """
+Adds the given child to this instance and updates the tree totals of the
+old and new parent directories of entries moved.
+
+:param child: DataLinker instance
+
+:since: v0.2.00
+        """
+
+        is_move = (Entry._is_tree_totals_enabled()
+                   and isinstance(child, Entry)
+                   and child.is_counted_in_totals
+                  )
+
+        if (is_move):
+            with child:
+                old_parent_id = child.get_data_attributes("id_parent")['id_parent']
+                if (old_parent_id == self.get_id()): is_move = False
+                elif (old_parent_id is not None): child._update_tree_totals(*child._get_tree_totals(), factor = -1)
+            #
+        #
+
+        DataLinker.add_entry(self, child)
+
+        if (is_move):
+            with child: child._update_tree_totals(*child._get_tree_totals())
+        #
+    #
+
+    def _add_processing_job(self, stages = None, is_new = False):
+        """
+Queues post-ingest processing of this entry. A job already queued is
+replaced.
+
+:param stages: List of processing stage names; None for the configured ones
+:param is_new: True if this entry is inserted and can not have a job queued
+
+:since: v0.2.00
+        """
+
+        # pylint: disable=maybe-no-member
+
+        timestamp = int(time())
+
+        db_processing_job = (None
+                             if (is_new) else
+                             self.local.connection.query(_DbFileCenterProcessingJob).get(self.local.db_instance.id)
+                            )
+
+        if (db_processing_job is None):
+            db_processing_job = _DbFileCenterProcessingJob()
+            db_processing_job.id_entry = self.local.db_instance.id
+
+            self.local.connection.add(db_processing_job)
+        #
+
+        db_processing_job.revision = uuid().hex
+        db_processing_job.stages = (None if (stages is None) else ",".join(stages))
+        db_processing_job.attempts = 0
+        db_processing_job.error = None
+        db_processing_job.time_queued = timestamp
+        db_processing_job.time_scheduled = timestamp + int(Settings.get("pas_file_center_processing_delay", 0))
+        db_processing_job.time_claimed = None
+
+        self.local.db_instance.processing_state = Entry.PROCESSING_STATE_QUEUED
+    #
+
     def _apply_sub_entries_join_condition(self, db_query, context = None):
         """
 Returns the modified SQLAlchemy database query with the "join" condition
@@ -149,6 +308,22 @@ applied.
         return _return
     #
 
+    @Instrumentation.wrap("checkpoint")
+    def checkpoint(self):
+        """
+Flushes the write buffers and writes the size of the stored file to the
+database even if size updates are written behind.
+
+:since: v0.2.00
+        """
+
+        if (self.vfs_object is not None and (not self.is_vfs_object_pooled) and self.vfs_object.is_valid()):
+            if (self.vfs_object.is_supported("flush")): self.vfs_object.flush()
+            self._synchronize_size(True)
+        #
+    #
+
+    @Instrumentation.wrap("close")
     def close(self):
         """
 python.org: Flush and close this stream.
@@ -157,304 +332,2151 @@ python.org: Flush and close this stream.
         """
 
         if (self.vfs_object is not None):
+            is_deduplication_pending = False
+
             try:
-                if (self.vfs_object.is_valid()):
-                    self.flush()
+                if (self.is_vfs_object_pooled):
+                    with self: vfs_url = self.get_vfs_url()
+                    VfsHandlePool.get_instance().release(vfs_url, self.vfs_object)
+                elif (self.vfs_object.is_valid()):
+                    self.checkpoint()
                     self.vfs_object.close()
+
+                    is_deduplication_pending = (self.content_hash is not None
+                                                and self.is_counted_in_totals
+                                                and Entry._is_deduplication_enabled()
+                                               )
                 #
-            finally: self.vfs_object = None
+            finally:
+                self.is_vfs_object_pooled = False
+                self.is_vfs_object_writable = False
+                self.vfs_object = None
+            #
+
+            if (is_deduplication_pending): self.deduplicate()
         #
     #
 
-    def delete(self):
+    @Instrumentation.wrap("copy_subtree")
+    def copy_subtree(self, parent, is_copy_on_write = True, progress_callback = None):
         """
-Deletes this entry from the database.
-
-:since: v0.1.00
+Copies this entry and all entries below it to the given parent directory.
+Database rows are cloned level by level with set-based statements. Stored
+files are shared with the copies until one side is written if copy-on-write
+is used.
+
+:param parent: Parent directory Entry instance
+:param is_copy_on_write: True to share stored files with the copies
+:param progress_callback: Callback called with the number of entries and
+                          bytes copied after each batch
+
+:return: (object) Entry instance of the copy
+:since:  v0.2.00
         """
 
-        with self, TransactionContext():
-            if (self.type & Entry.VFS_TYPE_DIRECTORY == Entry.VFS_TYPE_DIRECTORY):
-                for entry in self.get_content_list(): entry.delete()
-            #
-
-            db_resource_metadata_instance = self.local.db_instance.rel_resource_metadata
-
-            DataLinker.delete(self)
-            if (db_resource_metadata_instance is not None): self.local.connection.delete(db_resource_metadata_instance)
+        if (not isinstance(parent, Entry) or (not parent.is_vfs_type(Entry.VFS_TYPE_DIRECTORY))):
+            raise ValueException("Parent given is not a directory entry")
         #
-    #
 
-    def _ensure_vfs_object_instance(self, readonly = False):
-        """
-Checks or creates a new instance for the stored file.
+        batch_size = Entry._get_batch_size()
+        db_data_linker_table = _DbDataLinker.__table__
+        db_file_center_entry_table = _DbFileCenterEntry.__table__
+        entry_id = self.get_id()
+        stats = { "entries": 0, "size": 0 }
 
-:param readonly: Open stored file in readonly mode
+        connection = Connection.get_instance()
 
-:since: v0.1.00
-        """
+        with connection, TransactionContext():
+            parent_data = parent.get_data_attributes("id", "id_main")
 
-        if (self.vfs_object is None or (not self.vfs_object.is_valid())):
-            with self:
-                vfs_url = self.get_vfs_url()
-                if (vfs_url is None): raise ValueException("VFS URL not defined")
-                self.vfs_object = Implementation.load_vfs_url(vfs_url, readonly)
+            if (entry_id in Entry._get_parent_ids(connection, parent_data['id'])):
+                raise ValueException("Entry can not be copied below itself")
             #
-        #
-    #
 
-    def flush(self):
-        """
-python.org: Flush the write buffers of the stream if applicable.
+            id_main = (parent_data['id'] if (parent_data['id_main'] is None) else parent_data['id_main'])
 
-:since: v0.1.03
-        """
+            entry_ids = [ entry_id ]
+            new_entry_ids = { entry_id: uuid().hex }
+            owner_usage = { }
+            stored_object_references = { }
 
-        if (self.vfs_object is not None and self.vfs_object.is_valid()):
-            if (self.vfs_object.is_supported("flush")): self.vfs_object.flush()
+            while (len(entry_ids) > 0):
+                sub_entry_ids = [ ]
 
-            entry_data = self.get_data_attributes("size")
-            vfs_size = self.vfs_object.get_size()
+                for offset in range(0, len(entry_ids), batch_size):
+                    entry_ids_batch = entry_ids[offset:offset + batch_size]
 
-            if (entry_data['size'] != vfs_size):
-                with self: self.set_data_attributes(size = vfs_size)
-            #
-        #
-    #
+                    db_query = (connection.query(db_data_linker_table.c.id)
+                                .join(db_file_center_entry_table, db_data_linker_table.c.id == db_file_center_entry_table.c.id)
+                                .filter(db_data_linker_table.c.id_parent.in_(entry_ids_batch))
+                               )
 
-    def _get_default_sort_definition(self, context = None):
-        """
-Returns the default sort definition list.
+                    for ( sub_entry_id, ) in db_query:
+                        new_entry_ids[sub_entry_id] = uuid().hex
+                        sub_entry_ids.append(sub_entry_id)
+                    #
 
-:param context: Sort definition context
+                    db_values_list = [ ]
 
-:return: (object) Sort definition
-:since:  v0.1.00
-        """
+                    for db_row in connection.execute(db_data_linker_table.select().where(db_data_linker_table.c.id.in_(entry_ids_batch))):
+                        db_values = dict(db_row)
 
-        if (self.log_handler is not None): self.log_handler.debug("#echo(__FILEPATH__)# -{0!r}._get_default_sort_definition({1})- (#echo(__LINE__)#)", self, context, context = "pas_datalinker")
+                        db_values['id'] = new_entry_ids[db_row['id']]
+                        db_values['id_parent'] = (None if (db_row['id'] == entry_id) else new_entry_ids[db_row['id_parent']])
+                        db_values['id_main'] = (db_values['id'] if (db_row['id'] == entry_id) else id_main)
 
-        return (DataLinker._get_default_sort_definition(self, context)
-                if (context == "DataLinker") else
-                SortDefinition([ ( "position", SortDefinition.ASCENDING ),
-                                 ( "vfs_type", SortDefinition.ASCENDING ),
-                                 ( "title", SortDefinition.ASCENDING ),
-                                 ( "time_sortable", SortDefinition.DESCENDING )
-                               ])
-               )
-    #
+                        db_values_list.append(db_values)
+                    #
 
-    def get_vfs_object(self, readonly = False):
-        """
-Returns the VFS object of this file center entry.
+                    if (len(db_values_list) > 0): connection.execute(db_data_linker_table.insert(), db_values_list)
 
-:param readonly: Open stored file in readonly mode
+                    db_values_list = [ ]
 
-:return: VFS object referenced by this file center entry
-:since:  v0.1.00
-        """
+                    for db_row in connection.execute(db_file_center_entry_table.select().where(db_file_center_entry_table.c.id.in_(entry_ids_batch))):
+                        db_values = dict(db_row)
 
-        self._ensure_vfs_object_instance(readonly)
-        return self.vfs_object
-    #
+                        db_values['id'] = new_entry_ids[db_row['id']]
+                        db_values['role_id'] = None
 
-    get_vfs_type = DataLinker._wrap_getter("vfs_type")
-    """
-Returns the VFS type of this instance.
+                        if (db_row['processing_state'] in ( Entry.PROCESSING_STATE_PROCESSING, Entry.PROCESSING_STATE_QUEUED )):
+                            db_values['processing_state'] = None
+                        #
 
-:return: (int) File center entry VFS type
-:since:  v0.1.00
-    """
+                        if (db_row['vfs_type'] == Entry.VFS_TYPE_ITEM):
+                            if (db_row['owner_id'] is not None):
+                                if (db_row['owner_id'] not in owner_usage): owner_usage[db_row['owner_id']] = [ 0, 0 ]
 
-    get_vfs_url = DataLinker._wrap_getter("vfs_url")
-    """
-Returns the VFS URL of this instance.
+                                owner_usage[db_row['owner_id']][0] += db_row['size']
+                                owner_usage[db_row['owner_id']][1] += 1
+                            #
 
-:return: (str) File center entry VFS URL; None if undefined
-:since:  v0.1.00
-    """
+                            if (db_row['vfs_url'] is not None and db_row['vfs_url'].startswith("x-file-store:")):
+                                if (is_copy_on_write):
+                                    if (db_row['vfs_url_hash'] not in stored_object_references):
+                                        stored_object_references[db_row['vfs_url_hash']] = { "vfs_url": db_row['vfs_url'],
+                                                                                             "content_digest": db_row['content_digest'],
+                                                                                             "size": db_row['size'],
+                                                                                             "references": 0
+                                                                                           }
+                                    #
 
-    def _insert(self):
-        """
-Insert the instance into the database.
+                                    stored_object_references[db_row['vfs_url_hash']]['references'] += 1
+                                else:
+                                    db_values['vfs_url'] = Entry._copy_vfs_url(db_row['vfs_url'])
+                                    db_values['vfs_url_hash'] = Entry.get_vfs_url_hash(db_values['vfs_url'])
+                                    db_values['content_digest'] = None
+                                #
+                            #
 
-:since: v0.1.00
-        """
+                            stats['size'] += db_row['size']
+                        #
 
-        # pylint: disable=maybe-no-member
+                        db_values_list.append(db_values)
+                    #
 
-        DataLinker._insert(self)
+                    if (len(db_values_list) > 0): connection.execute(db_file_center_entry_table.insert(), db_values_list)
 
-        is_acl_missing = (len(self.local.db_instance.rel_acl) == 0)
-        is_data_missing = self.is_data_attribute_none("owner_type")
-        is_directory_mimeclass = (self.local.db_instance.mimeclass == "directory")
-        is_permission_missing = self.is_data_attribute_none("guest_permission", "user_permission")
+                    new_entry_ids_batch = { _id: new_entry_ids[_id] for _id in entry_ids_batch }
 
-        parent_object = (self.load_parent()
-                         if (is_acl_missing or is_data_missing or is_directory_mimeclass or is_permission_missing) else
-                         None
-                        )
+                    Entry._copy_related_db_rows(connection, _DbFileCenterEntry.rel_acl, new_entry_ids_batch)
+                    Entry._copy_related_db_rows(connection, _DbFileCenterEntry.rel_resource_metadata, new_entry_ids_batch)
 
-        if (is_data_missing and isinstance(parent_object, DataLinker)):
-            parent_data = parent_object.get_data_attributes("id_site")
-            if (self.local.db_instance.id_site is None and parent_data['id_site'] is not None): self.local.db_instance.id_site = parent_data['id_site']
-        #
+                    stats['entries'] += len(db_values_list)
+                    if (progress_callback is not None): progress_callback(stats.copy())
+                #
 
-        if (is_directory_mimeclass and isinstance(parent_object, Entry)): self.local.db_instance.mimetype = parent_object.get_mimetype()
+                entry_ids = sub_entry_ids
+            #
 
-        if (isinstance(parent_object, OwnableInstance)):
-            if (is_acl_missing): self._copy_acl_entries_from_instance(parent_object)
-            if (is_permission_missing): self._copy_default_permission_settings_from_instance(parent_object)
-        #
-    #
+            Entry._add_stored_object_references(connection, stored_object_references)
 
-    def is_vfs_type(self, vfs_type):
-        """
-Returns true if this entry is of the given VFS type.
+            for owner_id in owner_usage:
+                Entry._update_owner_usage(connection, owner_id, owner_usage[owner_id][0], owner_usage[owner_id][1])
+            #
 
-:return: (bool) True if this entry is of the given VFS type
-:since:  v0.1.00
-        """
+            _return = Entry.load_ids([ new_entry_ids[entry_id] ])[new_entry_ids[entry_id]]
+            parent.add_entry(_return)
+        #
 
-        return (self.get_vfs_type() == vfs_type)
+        return _return
     #
 
-    def save(self):
+    def deduplicate(self):
         """
-Saves changes of the database task instance.
+Points this entry to an already stored file with the same content and size.
+The stored file of this entry is deleted if it is no longer referenced. The
+content digest calculated while writing is used if it covers the stored file
+completely. Otherwise the stored file is read again.
 
-:since: v0.1.00
+:return: (int) Number of bytes saved
+:since:  v0.2.00
         """
 
-        with self, self.local.connection.no_autoflush:
-            if (self.local.db_instance.vfs_type is None or self.local.db_instance.vfs_type == 0):
-                is_vfs_object_opened = (self.vfs_object is not None)
+        _return = 0
 
-                self._ensure_vfs_object_instance(True)
+        content_hash = self.content_hash
+        content_hash_size = self.content_hash_size
 
-                try:
-                    if (self.vfs_object is None):
-                        if (self.local.db_instance.mimeclass == "directory"): self.local.db_instance.vfs_type = Entry.VFS_TYPE_DIRECTORY
-                    else: self.local.db_instance.vfs_type = (Entry.VFS_TYPE_DIRECTORY if (self.vfs_object.is_directory()) else Entry.VFS_TYPE_ITEM)
-                finally:
-                    if (not is_vfs_object_opened): self.close()
-                #
-            #
+        self.content_hash = None
+        self.close()
 
-            DataLinker.save(self)
+        with self:
+            entry_data = self.get_data_attributes("vfs_type", "vfs_url", "vfs_url_hash", "size")
         #
-    #
 
-    def set_data_attributes(self, **kwargs):
-        """
-Sets values given as keyword arguments to this method.
+        if (entry_data['vfs_type'] == Entry.VFS_TYPE_ITEM
+            and entry_data['vfs_url'] is not None
+            and entry_data['vfs_url'].startswith("x-file-store:")
+           ):
+            if (content_hash is None or content_hash_size != entry_data['size']):
+                content_hash = sha256()
+                for data in self.iter_range(): content_hash.update(data)
 
-:since: v0.1.00
-        """
+                self.close()
+            #
 
-        with self, self.local.connection.no_autoflush:
-            DataLinker.set_data_attributes(self, **kwargs)
+            content_digest = content_hash.hexdigest()
+            unreferenced_vfs_url = None
+
+            with self, TransactionContext():
+                db_stored_object = (self.local.connection.query(_DbFileCenterStoredObject)
+                                    .filter(_DbFileCenterStoredObject.content_digest == content_digest,
+                                            _DbFileCenterStoredObject.size == entry_data['size'],
+                                            _DbFileCenterStoredObject.vfs_url_hash != entry_data['vfs_url_hash']
+                                           )
+                                    .first()
+                                   )
+
+                db_own_stored_object = self.local.connection.query(_DbFileCenterStoredObject).get(entry_data['vfs_url_hash'])
+
+                if (db_stored_object is None):
+                    if (db_own_stored_object is None):
+                        db_own_stored_object = _DbFileCenterStoredObject()
+                        db_own_stored_object.vfs_url_hash = entry_data['vfs_url_hash']
+                        db_own_stored_object.vfs_url = entry_data['vfs_url']
+                        db_own_stored_object.reference_count = 1
+
+                        self.local.connection.add(db_own_stored_object)
+                    #
+
+                    db_own_stored_object.content_digest = content_digest
+                    db_own_stored_object.size = entry_data['size']
+
+                    self.set_data_attributes(content_digest = content_digest)
+                else:
+                    db_stored_object.reference_count += 1
+
+                    self.set_data_attributes(vfs_url = db_stored_object.vfs_url, content_digest = content_digest)
+
+                    if (db_own_stored_object is None):
+                        db_file_center_entry_table = _DbFileCenterEntry.__table__
+
+                        is_referenced = (self.local.connection.query(db_file_center_entry_table.c.id)
+                                         .filter(db_file_center_entry_table.c.vfs_url_hash == entry_data['vfs_url_hash'],
+                                                 db_file_center_entry_table.c.id != self.get_id()
+                                                )
+                                         .first()
+                                         is not None
+                                        )
+
+                        if (not is_referenced): unreferenced_vfs_url = entry_data['vfs_url']
+                    elif (db_own_stored_object.reference_count > 1): db_own_stored_object.reference_count -= 1
+                    else:
+                        self.local.connection.delete(db_own_stored_object)
+                        unreferenced_vfs_url = entry_data['vfs_url']
+                    #
+
+                    _return = entry_data['size']
+                #
+            #
 
-            if ("vfs_url" in kwargs): self.local.db_instance.vfs_url = Binary.utf8(kwargs['vfs_url'])
-            if ("vfs_type" in kwargs): self.local.db_instance.vfs_type = kwargs['vfs_type']
-            if ("role_id" in kwargs): self.local.db_instance.role_id = Binary.utf8(kwargs['role_id'])
-            if ("owner_type" in kwargs): self.local.db_instance.owner_type = kwargs['owner_type']
-            if ("owner_id" in kwargs): self.local.db_instance.owner_id = kwargs['owner_id']
-            if ("owner_ip" in kwargs): self.local.db_instance.owner_ip = kwargs['owner_ip']
-            if ("mimeclass" in kwargs): self.local.db_instance.mimeclass = kwargs['mimeclass']
-            if ("mimetype" in kwargs): self.local.db_instance.mimetype = kwargs['mimetype']
-            if ("size" in kwargs): self.local.db_instance.size = kwargs['size']
-            if ("locked" in kwargs): self.local.db_instance.locked = kwargs['locked']
-            if ("guest_permission" in kwargs): self.local.db_instance.guest_permission = kwargs['guest_permission']
-            if ("user_permission" in kwargs): self.local.db_instance.user_permission = kwargs['user_permission']
+            if (unreferenced_vfs_url is not None): Entry.delete_vfs_url(unreferenced_vfs_url)
         #
+
+        return _return
     #
 
-    def set_vfs_object(self, vfs_object):
+    @Instrumentation.wrap("delete")
+    def delete(self):
         """
-Sets an VFS object for this file center entry.
-
-:param vfs_object: VFS object to be referenced by this file center entry
+Deletes this entry and all entries below it from the database.
 
-:since: v0.1.00
+:return: (dict) Number of database entries and bytes removed
+:since:  v0.1.00
         """
 
-        if (not isinstance(vfs_object, Abstract)): raise ValueException("VFS object given is invalid")
-        if (self.get_vfs_url() is not None): raise ValueException("Setting a VFS object is not supported if an VFS URL is already defined")
+        vfs_url_hashes = { }
 
-        self.set_data_attributes(title = vfs_object.get_name(),
-                                 vfs_url = vfs_object.get_url(),
-                                 size = vfs_object.get_size()
-                                )
+        with self, TransactionContext():
+            if (Entry._is_tree_totals_enabled() and self.is_counted_in_totals):
+                self._update_tree_totals(*self._get_tree_totals(), factor = -1)
+            #
 
-        self.vfs_object = vfs_object
-    #
+            _return = (self._delete_sub_entries(vfs_url_hashes)
+                       if (self.is_vfs_type(Entry.VFS_TYPE_DIRECTORY)) else
+                       { "entries": 0, "size": 0 }
+                      )
 
-    @classmethod
-    def load_role_id(cls, _id):
-        """
-Load Entry instance by its role ID.
+            entry_data = self.get_data_attributes("vfs_type", "vfs_url_hash", "owner_id", "size")
+            db_resource_metadata_instance = self.local.db_instance.rel_resource_metadata
 
-:param cls: Expected encapsulating database instance class
-:param _id: Role ID
+            if (self.is_counted_in_totals and entry_data['vfs_type'] == Entry.VFS_TYPE_ITEM):
+                Entry._update_owner_usage(self.local.connection, entry_data['owner_id'], -1 * entry_data['size'], -1)
 
-:return: (object) Entry instance on success
-:since:  v0.1.00
-        """
+                if (entry_data['vfs_url_hash'] is not None):
+                    vfs_url_hashes[entry_data['vfs_url_hash']] = 1 + vfs_url_hashes.get(entry_data['vfs_url_hash'], 0)
+                #
+            #
 
-        if (_id is None): raise NothingMatchedException("Role ID is invalid")
+            OwnerRootDirectoryCache.get_instance().invalidate_entry_id(self.get_id())
+
+            # Processing jobs only exist for entries queued, in progress or
+            # failed.
+            if (self.local.db_instance.processing_state in ( Entry.PROCESSING_STATE_FAILED,
+                                                             Entry.PROCESSING_STATE_PROCESSING,
+                                                             Entry.PROCESSING_STATE_QUEUED
+                                                           )
+               ):
+                db_table = _DbFileCenterProcessingJob.__table__
+                self.local.connection.execute(db_table.delete().where(db_table.c.id_entry == self.get_id()))
+            #
 
-        with Connection.get_instance():
-            db_instance = DataLinker.get_db_class_query(cls).filter(_DbFileCenterEntry.role_id == _id).first()
+            DataLinker.delete(self)
+            if (db_resource_metadata_instance is not None): self.local.connection.delete(db_resource_metadata_instance)
 
-            if (db_instance is None): raise NothingMatchedException("Role ID '{0}' is invalid".format(_id))
-            DataLinker._ensure_db_class(cls, db_instance)
+            unreferenced_vfs_urls = Entry._release_stored_objects(self.local.connection, vfs_url_hashes)
 
-            return Entry(db_instance)
+            _return['entries'] += 1
+            if (entry_data['vfs_type'] == Entry.VFS_TYPE_ITEM): _return['size'] += entry_data['size']
         #
+
+        if (len(unreferenced_vfs_urls) > 0): self.close()
+        for vfs_url in unreferenced_vfs_urls: Entry.delete_vfs_url(vfs_url)
+
+        return _return
     #
 
-    @classmethod
-    def load_or_create_owner_root_directory(cls, owner_id):
+    def _delete_sub_entries(self, vfs_url_hashes):
         """
-Load Entry instance of the root directory or create a new one for the given
-owner ID.
+Deletes all entries below this one level by level with set-based database
+statements instead of loading and deleting each entry separately. The IDs
+are collected level by level first and deleted deepest level first, so
+parent rows are never deleted before the rows referencing them.
 
-:param cls: Expected encapsulating database instance class
-:param owner_id: Owner ID
+:param vfs_url_hashes: Dictionary of VFS URL hashes of deleted items to
+                       update with the number of references removed
 
-:return: (object) Entry instance on success
-:since:  v0.1.00
+:return: (dict) Number of database entries and bytes removed
+:since:  v0.2.00
         """
 
-        try: _return = cls.load_owner_root_directory(owner_id)
-        except NothingMatchedException:
-            if (not Settings.get("pas_file_center_owner_root_directory_create_on_demand", True)): raise OperationNotSupportedException()
+        _return = { "entries": 0, "size": 0 }
+        owner_usage = { }
 
-            _return = Entry()
+        entry_ids_levels = [ ]
+        entry_ids = self._get_sub_entry_ids_for_deletion([ self.get_id() ], _return, owner_usage, vfs_url_hashes)
 
-            _return.set_as_main_entry()
+        while (len(entry_ids) > 0):
+            entry_ids_levels.append(entry_ids)
+            entry_ids = self._get_sub_entry_ids_for_deletion(entry_ids, _return, owner_usage, vfs_url_hashes)
+        #
 
-            _return.set_data_attributes(title = "/",
-                                        vfs_type = Entry.VFS_TYPE_DIRECTORY,
-                                        role_id = "owner_root",
-                                        owner_type = "u",
-                                        owner_id = owner_id,
-                                        mimeclass = "directory",
-                                        mimetype = "text/directory",
-                                        guest_permission = "r",
-                                        user_permission = "r"
-                                       )
+        for entry_ids in reversed(entry_ids_levels): Entry._delete_db_rows(self.local.connection, entry_ids)
+
+        for owner_id in owner_usage:
+            Entry._update_owner_usage(self.local.connection,
+                                      owner_id,
+                                      -1 * owner_usage[owner_id][0],
+                                      -1 * owner_usage[owner_id][1]
+                                     )
+        #
+
+        return _return
+    #
+
+    def _detach_stored_object(self):
+        """
+Detaches this entry from its shared stored file before it is opened for
+writing. A stored file still referenced by other entries is copied. Stored
+files only referenced by this entry and without a content digest are
+written as they are.
+
+:return: (str) VFS URL of the stored file to be written
+:since:  v0.2.00
+        """
+
+        with self:
+            entry_data = self.get_data_attributes("vfs_url", "vfs_url_hash", "content_digest")
+            _return = entry_data['vfs_url']
+
+            is_detaching = (_return is not None and _return.startswith("x-file-store:"))
+
+            if (is_detaching and entry_data['content_digest'] is None):
+                # Stored files neither shared nor deduplicated are written without a transaction
+                reference_count = (self.local.connection.query(_DbFileCenterStoredObject.reference_count)
+                                   .filter(_DbFileCenterStoredObject.vfs_url_hash == entry_data['vfs_url_hash'])
+                                   .scalar()
+                                  )
+
+                is_detaching = (reference_count is not None and reference_count > 1)
+            #
+
+            if (is_detaching):
+                with TransactionContext():
+                    db_stored_object = self.local.connection.query(_DbFileCenterStoredObject).get(entry_data['vfs_url_hash'])
+
+                    if (db_stored_object is not None):
+                        if (db_stored_object.reference_count > 1):
+                            _return = Entry._copy_vfs_url(_return)
+                            db_stored_object.reference_count -= 1
+
+                            self.set_data_attributes(vfs_url = _return)
+                        else: self.local.connection.delete(db_stored_object)
+                    #
+
+                    if (entry_data['content_digest'] is not None): self.set_data_attributes(content_digest = None)
+                #
+            #
+        #
+
+        return _return
+    #
+
+    def discard_content_hash(self):
+        """
+Discards the content hash calculated while writing. The stored file is not
+deduplicated on close afterwards unless written again from its start.
+
+:since: v0.2.00
+        """
+
+        self.content_hash = None
+        self.content_hash_size = 0
+    #
+
+    def enqueue_processing(self, stages = None):
+        """
+Queues post-ingest processing of this entry, e.g. after its stored file has
+been replaced. The job is added in the current transaction.
+
+:param stages: List of processing stage names; None for the configured ones
+
+:since: v0.2.00
+        """
+
+        with self, TransactionContext():
+            if (self.local.db_instance.vfs_type != Entry.VFS_TYPE_ITEM): raise OperationNotSupportedException("Only items can be processed")
+            self._add_processing_job(stages)
+        #
+    #
+
+    def _ensure_vfs_object_instance(self, readonly = False):
+        """
+Checks or creates a new instance for the stored file.
+
+:param readonly: Open stored file in readonly mode
+
+:since: v0.1.00
+        """
+
+        position = None
+
+        if (self.vfs_object is not None
+            and (not readonly)
+            and (not self.is_vfs_object_writable)
+            and self.vfs_object.is_valid()
+           ):
+            # Reopen the stored file for writing at the current position
+            position = self.vfs_object.tell()
+            self.close()
+        #
+
+        if (self.vfs_object is None or (not self.vfs_object.is_valid())):
+            self._open_vfs_object(readonly)
+            if (position is not None): self.vfs_object.seek(position)
+        #
+    #
+
+    @Instrumentation.wrap("flush")
+    def flush(self):
+        """
+python.org: Flush the write buffers of the stream if applicable.
+
+:since: v0.1.03
+        """
+
+        if (self.vfs_object is not None and (not self.is_vfs_object_pooled) and self.vfs_object.is_valid()):
+            if (self.vfs_object.is_supported("flush")): self.vfs_object.flush()
+
+            if (Entry._is_size_write_behind_enabled()): self._synchronize_size()
+            else:
+                entry_data = self.get_data_attributes("size")
+                vfs_size = self.vfs_object.get_size()
+
+                if (entry_data['size'] != vfs_size):
+                    with self: self.set_data_attributes(size = vfs_size)
+                #
+            #
+        #
+    #
+
+    get_content_digest = DataLinker._wrap_getter("content_digest")
+    """
+Returns the SHA-256 content digest of the stored file if deduplicated.
+
+:return: (str) Hex encoded content digest; None if undefined
+:since:  v0.2.00
+    """
+
+    def _get_content_list_db_query(self, vfs_type, *args):
+        """
+Returns the SQLAlchemy database query for file center entries of the given
+VFS type below this one ordered by the default sort definition extended by
+the entry ID. The VFS type is fixed for each query so that the order is
+supported by the index of the DataLinker table.
+
+:param vfs_type: VFS type of the entries to list
+:param args: SQLAlchemy columns to query instead of database instances
+
+:return: (object) SQLAlchemy database query
+:since:  v0.2.00
+        """
+
+        db_query = (self.local.connection.query(*args).select_from(_DbFileCenterEntry)
+                    if (len(args) > 0) else
+                    DataLinker.get_db_class_query(self.__class__)
+                   )
+
+        return Entry._apply_content_list_db_query(db_query, self.get_id(), vfs_type)
+    #
+
+    def get_content_list_cursor(self):
+        """
+Returns the keyset pagination cursor of this entry. Entries listed after it
+are returned by "iter_content_list()" of the parent directory if given.
+
+:return: (list) Cursor values
+:since:  v0.2.00
+        """
+
+        with self:
+            entry_data = self.get_data_attributes("position", "vfs_type", "title", "time_sortable", "id")
+
+            return [ entry_data['position'],
+                     entry_data['vfs_type'],
+                     ("" if (entry_data['title'] is None) else entry_data['title']),
+                     (0 if (entry_data['time_sortable'] is None) else entry_data['time_sortable']),
+                     entry_data['id']
+                   ]
+        #
+    #
+
+    def _get_default_sort_definition(self, context = None):
+        """
+Returns the default sort definition list.
+
+:param context: Sort definition context
+
+:return: (object) Sort definition
+:since:  v0.1.00
+        """
+
+        if (self.log_handler is not None): self.log_handler.debug("#echo(__FILEPATH__)# -{0!r}._get_default_sort_definition({1})- (#echo(__LINE__)#)", self, context, context = "pas_datalinker")
+
+        return (DataLinker._get_default_sort_definition(self, context)
+                if (context == "DataLinker") else
+                SortDefinition(Entry._get_default_sort_list())
+               )
+    #
+
+    def get_file_range(self, offset = 0, length = None):
+        """
+Returns the file descriptor, offset and length to send the given range of
+the stored file with "os.sendfile()". The file descriptor is only valid
+until this entry is closed.
+
+:param offset: Range start offset
+:param length: Range length; None to read to the end of the file
+
+:return: (tuple) File descriptor, offset and length
+:since:  v0.2.00
+        """
+
+        ( offset, length ) = self._get_vfs_object_range(offset, length)
+
+        file_object = self._get_vfs_file_object()
+        if (file_object is None or (not hasattr(file_object, "fileno"))): raise OperationNotSupportedException("File descriptor not available for the stored file")
+
+        return ( file_object.fileno(), offset, length )
+    #
+
+    get_processing_state = DataLinker._wrap_getter("processing_state")
+    """
+Returns the post-ingest processing state.
+
+:return: (str) Processing state; None if not queued
+:since:  v0.2.00
+    """
+
+    def _get_sub_entry_ids_for_deletion(self, parent_ids, stats, owner_usage, vfs_url_hashes):
+        """
+Returns the IDs of all file center entries directly below the given parent
+IDs. DataLinker entries of other types are deleted using their own
+implementation.
+
+:param parent_ids: List of parent IDs
+:param stats: Dictionary of deleted database entries and bytes to update
+:param owner_usage: Dictionary of deleted bytes and items per owner ID to
+                    update
+:param vfs_url_hashes: Dictionary of VFS URL hashes of deleted items to
+                       update with the number of references removed
+
+:return: (list) File center entry IDs
+:since:  v0.2.00
+        """
+
+        _return = [ ]
+
+        batch_size = Entry._get_batch_size()
+        db_data_linker_table = _DbDataLinker.__table__
+        db_file_center_entry_table = _DbFileCenterEntry.__table__
+
+        for offset in range(0, len(parent_ids), batch_size):
+            db_query = (self.local.connection.query(db_data_linker_table.c.id,
+                                                    db_file_center_entry_table.c.id,
+                                                    db_file_center_entry_table.c.vfs_type,
+                                                    db_file_center_entry_table.c.vfs_url_hash,
+                                                    db_file_center_entry_table.c.owner_id,
+                                                    db_file_center_entry_table.c.size
+                                                   )
+                        .select_from(db_data_linker_table)
+                        .outerjoin(db_file_center_entry_table,
+                                   db_data_linker_table.c.id == db_file_center_entry_table.c.id
+                                  )
+                        .filter(db_data_linker_table.c.id_parent.in_(parent_ids[offset:offset + batch_size]))
+                       )
+
+            for ( data_linker_id, entry_id, vfs_type, vfs_url_hash, owner_id, size ) in db_query:
+                if (entry_id is None):
+                    db_instance = self.local.connection.query(_DbDataLinker).get(data_linker_id)
+
+                    if (db_instance is not None):
+                        NamedLoader.get_class(db_instance.db_instance_class)(db_instance).delete()
+                        stats['entries'] += 1
+                    #
+                else:
+                    _return.append(entry_id)
+
+                    stats['entries'] += 1
+
+                    if (vfs_type == Entry.VFS_TYPE_ITEM):
+                        stats['size'] += size
+
+                        if (owner_id is not None):
+                            if (owner_id not in owner_usage): owner_usage[owner_id] = [ 0, 0 ]
+
+                            owner_usage[owner_id][0] += size
+                            owner_usage[owner_id][1] += 1
+                        #
+
+                        if (vfs_url_hash is not None): vfs_url_hashes[vfs_url_hash] = 1 + vfs_url_hashes.get(vfs_url_hash, 0)
+                    #
+                #
+            #
+        #
+
+        return _return
+    #
+
+    def _get_tree_totals(self):
+        """
+Returns the size and number of items this entry adds to the tree totals of
+its parent directories.
+
+:return: (tuple) Size and number of items
+:since:  v0.2.00
+        """
+
+        entry_data = self.get_data_attributes("vfs_type", "size", "tree_size", "tree_items")
+
+        # Server defaults are not applied to new entries before they are flushed
+        return (( (entry_data['tree_size'] or 0), (entry_data['tree_items'] or 0) )
+                if (entry_data['vfs_type'] == Entry.VFS_TYPE_DIRECTORY) else
+                ( (entry_data['size'] or 0), 1 )
+               )
+    #
+
+    get_tree_items = DataLinker._wrap_getter("tree_items")
+    """
+Returns the number of items below this directory.
+
+:return: (int) Number of items
+:since:  v0.2.00
+    """
+
+    get_tree_size = DataLinker._wrap_getter("tree_size")
+    """
+Returns the size of all items below this directory.
+
+:return: (int) Size in bytes
+:since:  v0.2.00
+    """
+
+    def _get_vfs_file_object(self):
+        """
+Returns the underlying Python file object of the read-only VFS object if
+supported.
+
+:return: (object) Python file object; None if not supported
+:since:  v0.2.00
+        """
+
+        self._ensure_vfs_object_instance(True)
+
+        return (self.vfs_object.get_implementing_instance()
+                if (self.vfs_object.is_supported("implementing_instance")) else
+                None
+               )
+    #
+
+    def get_vfs_object(self, readonly = False):
+        """
+Returns the VFS object of this file center entry. A stored file shared with
+other entries is detached before it is opened for writing.
+
+:param readonly: Open stored file in readonly mode
+
+:return: VFS object referenced by this file center entry
+:since:  v0.1.00
+        """
+
+        self._ensure_vfs_object_instance(readonly)
+        return self.vfs_object
+    #
+
+    get_vfs_type = DataLinker._wrap_getter("vfs_type")
+    """
+Returns the VFS type of this instance.
+
+:return: (int) File center entry VFS type
+:since:  v0.1.00
+    """
+
+    get_vfs_url = DataLinker._wrap_getter("vfs_url")
+    """
+Returns the VFS URL of this instance.
+
+:return: (str) File center entry VFS URL; None if undefined
+:since:  v0.1.00
+    """
+
+    def _iter_content_list(self, db_columns, instance_callback, cursor, limit, chunk_size):
+        """
+Returns a generator yielding instances created for the file center entries
+below this one in the default sort order. Entries are fetched in chunks with
+keyset pagination instead of offsets, so memory usage does not depend on the
+number of entries. Directories and items are fetched separately and merged
+by position and VFS type.
+
+:param db_columns: SQLAlchemy columns to query instead of database instances
+:param instance_callback: Callback to create an instance for a database
+                          instance or row
+:param cursor: Cursor of the last entry already listed
+:param limit: Maximum number of entries to return
+:param chunk_size: Number of entries fetched with one query
+
+:return: (object) Generator yielding instances
+:since:  v0.2.00
+        """
+
+        if (chunk_size is None): chunk_size = Entry._get_batch_size()
+
+        instances_data = heapq.merge(*[ self._iter_content_list_vfs_type(vfs_type,
+                                                                         db_columns,
+                                                                         instance_callback,
+                                                                         cursor,
+                                                                         limit,
+                                                                         chunk_size
+                                                                        )
+                                        for vfs_type in ( Entry.VFS_TYPE_DIRECTORY, Entry.VFS_TYPE_ITEM )
+                                      ],
+                                     key = itemgetter(0)
+                                    )
+
+        for ( _, instance ) in islice(instances_data, limit): yield instance
+    #
+
+    def _iter_content_list_vfs_type(self, vfs_type, db_columns, instance_callback, cursor, limit, chunk_size):
+        """
+Returns a generator yielding the merge key and the instance created for the
+file center entries of the given VFS type below this one in the default sort
+order.
+
+:param vfs_type: VFS type of the entries to list
+:param db_columns: SQLAlchemy columns to query instead of database instances
+:param instance_callback: Callback to create an instance for a database
+                          instance or row
+:param cursor: Cursor of the last entry already listed
+:param limit: Maximum number of entries to return
+:param chunk_size: Number of entries fetched with one query
+
+:return: (object) Generator yielding tuples of merge key and instance
+:since:  v0.2.00
+        """
+
+        while (limit is None or limit > 0):
+            db_limit = (chunk_size if (limit is None) else min(chunk_size, limit))
+
+            with self:
+                db_query = self._get_content_list_db_query(vfs_type, *db_columns)
+                if (cursor is not None): db_query = db_query.filter(Entry._get_content_list_cursor_condition(cursor, vfs_type))
+
+                instances_data = [ ( ( db_data.position, vfs_type ), instance_callback(db_data) )
+                                   for db_data in db_query.limit(db_limit).all()
+                                 ]
+            #
+
+            for instance_data in instances_data: yield instance_data
+
+            if (len(instances_data) < db_limit): break
+
+            cursor = instances_data[-1][1].get_content_list_cursor()
+            if (limit is not None): limit -= len(instances_data)
+        #
+    #
+
+    @Instrumentation.wrap("iter_content_list", is_iterator = True)
+    def iter_content_list(self, cursor = None, limit = None, chunk_size = None):
+        """
+Returns a generator yielding the file center entries below this one in the
+default sort order. Entries are fetched in chunks with keyset pagination
+instead of offsets, so memory usage does not depend on the number of
+entries.
+
+:param cursor: Cursor returned by "get_content_list_cursor()" of the last
+               entry already listed
+:param limit: Maximum number of entries to return
+:param chunk_size: Number of entries fetched with one query
+
+:return: (object) Generator yielding Entry instances
+:since:  v0.2.00
+        """
+
+        return self._iter_content_list([ ], Entry, cursor, limit, chunk_size)
+    #
+
+    @Instrumentation.wrap("iter_content_views", is_iterator = True)
+    def iter_content_views(self, cursor = None, limit = None, chunk_size = None):
+        """
+Returns a generator yielding read-only views of the file center entries
+below this one in the default sort order. Views are created directly from
+the selected columns without instantiating database instances.
+
+:param cursor: Cursor returned by "get_content_list_cursor()" of the last
+               entry already listed
+:param limit: Maximum number of entries to return
+:param chunk_size: Number of entries fetched with one query
+
+:return: (object) Generator yielding EntryView instances
+:since:  v0.2.00
+        """
+
+        return self._iter_content_list(EntryView.get_db_columns(), EntryView, cursor, limit, chunk_size)
+    #
+
+    def _get_vfs_object_range(self, offset, length):
+        """
+Returns the given range validated against the size of the stored file.
+
+:param offset: Range start offset
+:param length: Range length; None to read to the end of the file
+
+:return: (tuple) Offset and length
+:since:  v0.2.00
+        """
+
+        self._ensure_vfs_object_instance(True)
+        vfs_size = self.vfs_object.get_size()
+
+        if (offset < 0 or offset > vfs_size): raise ValueException("Range offset given is invalid")
+        if (length is not None and length < 0): raise ValueException("Range length given is invalid")
+
+        return ( offset, (vfs_size - offset if (length is None) else min(length, vfs_size - offset)) )
+    #
+
+    @Instrumentation.wrap("iter_range", Instrumentation.BYTES_READ, is_iterator = True)
+    def iter_range(self, offset = 0, length = None, chunk_size = 65536):
+        """
+Returns a generator yielding the given range of the stored file in chunks.
+Chunks are read into one reused buffer and returned as memoryview slices
+of it, so each chunk is only valid until the next one is requested.
+
+:param offset: Range start offset
+:param length: Range length; None to read to the end of the file
+:param chunk_size: Maximum chunk size
+
+:return: (object) Generator yielding memoryview instances
+:since:  v0.2.00
+        """
+
+        ( offset, length ) = self._get_vfs_object_range(offset, length)
+
+        buffer_view = memoryview(bytearray(min(chunk_size, length)))
+        self.vfs_object.seek(offset)
+
+        while (length > 0):
+            size = self.readinto(buffer_view[:min(length, len(buffer_view))])
+            if (size < 1): break
+
+            yield buffer_view[:size]
+            length -= size
+        #
+    #
+
+    @Instrumentation.wrap("iter_range_mmap", Instrumentation.BYTES_READ, is_iterator = True)
+    def iter_range_mmap(self, offset = 0, length = None, chunk_size = 1048576):
+        """
+Returns a generator yielding the given range of a stored file of the local
+file store in chunks backed by a read-only memory map. Chunks should not be
+referenced after the generator has been closed.
+
+:param offset: Range start offset
+:param length: Range length; None to read to the end of the file
+:param chunk_size: Maximum chunk size
+
+:return: (object) Generator yielding memoryview instances
+:since:  v0.2.00
+        """
+
+        with self: vfs_url = self.get_vfs_url()
+        if (vfs_url is None or (not vfs_url.startswith("x-file-store:"))): raise OperationNotSupportedException("Memory mapped reads are only supported for the file store")
+
+        ( file_descriptor, offset, length ) = self.get_file_range(offset, length)
+
+        if (length > 0):
+            mmap_offset = offset - (offset % mmap.ALLOCATIONGRANULARITY)
+            mmap_instance = mmap.mmap(file_descriptor, length + offset - mmap_offset, access = mmap.ACCESS_READ, offset = mmap_offset)
+
+            mmap_view = memoryview(mmap_instance)
+
+            try:
+                for position in range(offset - mmap_offset, len(mmap_view), chunk_size):
+                    yield mmap_view[position:position + chunk_size]
+                #
+            finally:
+                # Chunks still referenced prevent closing the memory map.
+                # It is unmapped by the garbage collector afterwards.
+                try:
+                    mmap_view.release()
+                    mmap_instance.close()
+                except BufferError: pass
+            #
+        #
+    #
+
+    def _insert(self):
+        """
+Insert the instance into the database.
+
+:since: v0.1.00
+        """
+
+        # pylint: disable=maybe-no-member
+
+        DataLinker._insert(self)
+
+        is_acl_missing = (len(self.local.db_instance.rel_acl) == 0)
+        is_data_missing = self.is_data_attribute_none("owner_type")
+        is_directory_mimeclass = (self.local.db_instance.mimeclass == "directory")
+        is_permission_missing = self.is_data_attribute_none("guest_permission", "user_permission")
+
+        parent_object = (self._load_parent_for_insert()
+                         if (is_acl_missing or is_data_missing or is_directory_mimeclass or is_permission_missing) else
+                         None
+                        )
+
+        if (is_data_missing and isinstance(parent_object, DataLinker)):
+            parent_data = parent_object.get_data_attributes("id_site")
+            if (self.local.db_instance.id_site is None and parent_data['id_site'] is not None): self.local.db_instance.id_site = parent_data['id_site']
+        #
+
+        if (is_directory_mimeclass and isinstance(parent_object, Entry)): self.local.db_instance.mimetype = parent_object.get_mimetype()
+
+        if (isinstance(parent_object, OwnableInstance)):
+            if (is_acl_missing): self._copy_acl_entries_from_instance(parent_object)
+            if (is_permission_missing): self._copy_default_permission_settings_from_instance(parent_object)
+        #
+
+        if (self.insert_batch is None):
+            if (Entry._is_tree_totals_enabled()): self._update_tree_totals(*self._get_tree_totals())
+
+            if (self.local.db_instance.vfs_type == Entry.VFS_TYPE_ITEM):
+                Entry._update_owner_usage(self.local.connection,
+                                          self.local.db_instance.owner_id,
+                                          self.local.db_instance.size,
+                                          1
+                                         )
+            #
+        else:
+            if (Entry._is_tree_totals_enabled()):
+                ( size, items ) = self._get_tree_totals()
+                parent_tree_totals = self.insert_batch['tree_totals'].setdefault(self.local.db_instance.id_parent, [ 0, 0 ])
+
+                parent_tree_totals[0] += size
+                parent_tree_totals[1] += items
+            #
+
+            if (self.local.db_instance.vfs_type == Entry.VFS_TYPE_ITEM):
+                owner_usage = self.insert_batch['owner_usage'].setdefault(self.local.db_instance.owner_id, [ 0, 0 ])
+
+                owner_usage[0] += (self.local.db_instance.size or 0)
+                owner_usage[1] += 1
+            #
+        #
+
+        if (self.is_processing_queued_on_insert
+            and self.local.db_instance.vfs_type == Entry.VFS_TYPE_ITEM
+            and Entry._is_processing_enabled()
+           ): self._add_processing_job(is_new = True)
+
+        self.is_counted_in_totals = True
+    #
+
+    def is_vfs_type(self, vfs_type):
+        """
+Returns true if this entry is of the given VFS type.
+
+:return: (bool) True if this entry is of the given VFS type
+:since:  v0.1.00
+        """
+
+        return (self.get_vfs_type() == vfs_type)
+    #
+
+    def _load_owner_quota_size_limit(self):
+        """
+Looks up the quota and the storage used by the owner once for the VFS
+object opened and calculates the maximum size of the stored file. Writes
+are checked against this local balance afterwards.
+
+:since: v0.2.00
+        """
+
+        with self:
+            entry_data = self.get_data_attributes("owner_id", "size")
+
+            quota = (None if (entry_data['owner_id'] is None) else Entry._get_owner_quota(entry_data['owner_id']))
+
+            if (quota is None): self.owner_quota_size_limit = None
+            else:
+                owner_usage = Entry.get_owner_usage(entry_data['owner_id'])
+
+                self.owner_quota_size_limit = (quota
+                                               - owner_usage['size']
+                                               + (entry_data['size'] if (self.is_counted_in_totals) else 0)
+                                              )
+            #
+
+            self.is_owner_quota_loaded = True
+        #
+    #
+
+    def _load_parent_for_insert(self):
+        """
+Returns the parent instance to inherit data, ACL entries and default
+permissions from. Parents of entries inserted with "save_many()" are only
+loaded once.
+
+:return: (object) Parent instance; None if not defined
+:since:  v0.2.00
+        """
+
+        if (self.insert_batch is None): _return = self.load_parent()
+        else:
+            parent_id = self.local.db_instance.id_parent
+
+            if (parent_id in self.insert_batch['parents']): _return = self.insert_batch['parents'][parent_id]
+            else:
+                _return = self.load_parent()
+                self.insert_batch['parents'][parent_id] = _return
+            #
+        #
+
+        return _return
+    #
+
+    @Instrumentation.wrap("move_subtree")
+    def move_subtree(self, parent, progress_callback = None):
+        """
+Moves this entry and all entries below it to the given parent directory.
+Tree totals are moved with the entry. If the main entry changes it is
+updated level by level with set-based statements for all entries below.
+
+:param parent: Parent directory Entry instance
+:param progress_callback: Callback called with the number of entries
+                          updated after each batch
+
+:since: v0.2.00
+        """
+
+        if (not isinstance(parent, Entry) or (not parent.is_vfs_type(Entry.VFS_TYPE_DIRECTORY))):
+            raise ValueException("Parent given is not a directory entry")
+        #
+
+        with self, TransactionContext():
+            entry_id = self.get_id()
+
+            if (entry_id in Entry._get_parent_ids(self.local.connection, parent.get_id())):
+                raise ValueException("Entry can not be moved below itself")
+            #
+
+            old_id_main = self.get_data_attributes("id_main")['id_main']
+
+            parent.add_entry(self)
+
+            id_main = self.get_data_attributes("id_main")['id_main']
+
+            if (id_main != old_id_main):
+                batch_size = Entry._get_batch_size()
+                db_table = _DbDataLinker.__table__
+                entry_ids = [ entry_id ]
+                stats = { "entries": 1 }
+
+                while (len(entry_ids) > 0):
+                    sub_entry_ids = [ ]
+
+                    for offset in range(0, len(entry_ids), batch_size):
+                        db_query = (self.local.connection.query(db_table.c.id)
+                                    .filter(db_table.c.id_parent.in_(entry_ids[offset:offset + batch_size]))
+                                   )
+
+                        sub_entry_ids_batch = [ sub_entry_id for ( sub_entry_id, ) in db_query ]
+
+                        if (len(sub_entry_ids_batch) > 0):
+                            self.local.connection.execute(db_table.update()
+                                                          .where(db_table.c.id.in_(sub_entry_ids_batch))
+                                                          .values(id_main = id_main)
+                                                         )
+
+                            sub_entry_ids += sub_entry_ids_batch
+                            stats['entries'] += len(sub_entry_ids_batch)
+
+                            if (progress_callback is not None): progress_callback(stats.copy())
+                        #
+                    #
+
+                    entry_ids = sub_entry_ids
+                #
+            #
+        #
+    #
+
+    @Instrumentation.wrap("vfs_open")
+    def _open_vfs_object(self, readonly):
+        """
+Opens the stored file or acquires it from the VFS handle pool. A stored
+file shared with other entries is only detached if opened for writing.
+
+:param readonly: Open stored file in readonly mode
+
+:since: v0.2.00
+        """
+
+        with self:
+            vfs_url = self.get_vfs_url()
+            if (vfs_url is None): raise ValueException("VFS URL not defined")
+
+            if (readonly and VfsHandlePool.is_enabled()):
+                self.vfs_object = VfsHandlePool.get_instance().acquire(vfs_url)
+                self.is_vfs_object_pooled = True
+            else:
+                if (not readonly): vfs_url = self._detach_stored_object()
+                self.vfs_object = Implementation.load_vfs_url(vfs_url, readonly)
+            #
+
+            self.is_vfs_object_writable = (not readonly)
+
+            self.is_owner_quota_loaded = False
+        #
+    #
+
+    @Instrumentation.wrap("readinto", Instrumentation.BYTES_READ)
+    def readinto(self, _buffer):
+        """
+python.org: Read bytes into a pre-allocated, writable bytes-like object b,
+and return the number of bytes read.
+
+:param _buffer: Writable bytes-like object
+
+:return: (int) Number of bytes read
+:since:  v0.2.00
+        """
+
+        file_object = self._get_vfs_file_object()
+        if (file_object is not None and hasattr(file_object, "readinto")): return file_object.readinto(_buffer)
+
+        data = self.vfs_object.read(len(_buffer))
+        _buffer[:len(data)] = data
+
+        return len(data)
+    #
+
+    def remove_entry(self, child):
+        """
+Removes the given child from this instance and updates the tree totals of
+the parent directories.
+
+:param child: DataLinker instance
+
+:since: v0.2.00
+        """
+
+        if (Entry._is_tree_totals_enabled() and isinstance(child, Entry) and child.is_counted_in_totals):
+            with child: child._update_tree_totals(*child._get_tree_totals(), factor = -1)
+        #
+
+        DataLinker.remove_entry(self, child)
+    #
+
+    @Instrumentation.wrap("save")
+    def save(self):
+        """
+Saves changes of the database task instance.
+
+:since: v0.1.00
+        """
+
+        with self:
+            with self.local.connection.no_autoflush:
+                if (self.local.db_instance.vfs_type is None or self.local.db_instance.vfs_type == 0):
+                    is_vfs_object_opened = (self.vfs_object is not None)
+
+                    self._ensure_vfs_object_instance(True)
+
+                    try:
+                        if (self.vfs_object is None):
+                            if (self.local.db_instance.mimeclass == "directory"): self.local.db_instance.vfs_type = Entry.VFS_TYPE_DIRECTORY
+                        else: self.local.db_instance.vfs_type = (Entry.VFS_TYPE_DIRECTORY if (self.vfs_object.is_directory()) else Entry.VFS_TYPE_ITEM)
+                    finally:
+                        if (not is_vfs_object_opened): self.close()
+                    #
+                #
+
+                DataLinker.save(self)
+            #
+
+            # Content written before the entry has been inserted is
+            # deduplicated after the entry and its stored file are complete.
+            if (self.content_hash is not None
+                and self.vfs_object is None
+                and self.is_counted_in_totals
+                and Entry._is_deduplication_enabled()
+               ): self.deduplicate()
+        #
+    #
+
+    def set_data_attributes(self, **kwargs):
+        """
+Sets values given as keyword arguments to this method.
+
+:since: v0.1.00
+        """
+
+        with self, self.local.connection.no_autoflush:
+            DataLinker.set_data_attributes(self, **kwargs)
+
+            if ("role_id" in kwargs or "owner_type" in kwargs or "owner_id" in kwargs):
+                OwnerRootDirectoryCache.get_instance().invalidate_entry_id(self.get_id())
+            #
+
+            if ("vfs_url" in kwargs):
+                self.local.db_instance.vfs_url = Binary.utf8(kwargs['vfs_url'])
+                self.local.db_instance.vfs_url_hash = Entry.get_vfs_url_hash(kwargs['vfs_url'])
+            #
+
+            if ("vfs_type" in kwargs): self.local.db_instance.vfs_type = kwargs['vfs_type']
+            if ("role_id" in kwargs): self.local.db_instance.role_id = Binary.utf8(kwargs['role_id'])
+            if ("owner_type" in kwargs): self.local.db_instance.owner_type = kwargs['owner_type']
+            if ("owner_id" in kwargs):
+                if (self.is_counted_in_totals
+                    and self.local.db_instance.vfs_type == Entry.VFS_TYPE_ITEM
+                    and kwargs['owner_id'] != self.local.db_instance.owner_id
+                   ):
+                    Entry._update_owner_usage(self.local.connection,
+                                              self.local.db_instance.owner_id,
+                                              -1 * self.local.db_instance.size,
+                                              -1
+                                             )
+
+                    Entry._update_owner_usage(self.local.connection, kwargs['owner_id'], self.local.db_instance.size, 1)
+                #
+
+                self.local.db_instance.owner_id = kwargs['owner_id']
+                self.is_owner_quota_loaded = False
+            #
+
+            if ("owner_ip" in kwargs): self.local.db_instance.owner_ip = kwargs['owner_ip']
+            if ("mimeclass" in kwargs): self.local.db_instance.mimeclass = kwargs['mimeclass']
+            if ("mimetype" in kwargs): self.local.db_instance.mimetype = kwargs['mimetype']
+            if ("content_digest" in kwargs): self.local.db_instance.content_digest = kwargs['content_digest']
+            if ("processing_state" in kwargs): self.local.db_instance.processing_state = kwargs['processing_state']
+
+            if ("size" in kwargs):
+                if (self.is_counted_in_totals
+                    and self.local.db_instance.vfs_type == Entry.VFS_TYPE_ITEM
+                    and kwargs['size'] != self.local.db_instance.size
+                   ):
+                    size_delta = kwargs['size'] - self.local.db_instance.size
+
+                    if (Entry._is_tree_totals_enabled()): self._update_tree_totals(size_delta, 0)
+                    Entry._update_owner_usage(self.local.connection, self.local.db_instance.owner_id, size_delta, 0)
+                #
+
+                self.local.db_instance.size = kwargs['size']
+            #
+
+            if ("locked" in kwargs): self.local.db_instance.locked = kwargs['locked']
+            if ("guest_permission" in kwargs): self.local.db_instance.guest_permission = kwargs['guest_permission']
+            if ("user_permission" in kwargs): self.local.db_instance.user_permission = kwargs['user_permission']
+        #
+    #
+
+    def set_vfs_object(self, vfs_object):
+        """
+Sets an VFS object for this file center entry.
+
+:param vfs_object: VFS object to be referenced by this file center entry
+
+:since: v0.1.00
+        """
+
+        if (not isinstance(vfs_object, Abstract)): raise ValueException("VFS object given is invalid")
+        if (self.get_vfs_url() is not None): raise ValueException("Setting a VFS object is not supported if an VFS URL is already defined")
+
+        self.set_data_attributes(title = vfs_object.get_name(),
+                                 vfs_url = vfs_object.get_url(),
+                                 size = vfs_object.get_size()
+                                )
+
+        self.is_vfs_object_writable = True
+        self.vfs_object = vfs_object
+    #
+
+    @Instrumentation.wrap("size_sync")
+    def _synchronize_size(self, is_forced = False):
+        """
+Writes the size of the stored file to the database if it has changed. If
+not forced the size is only written after the configured number of bytes
+changed or seconds passed. Nothing is written if the stored file has been
+deleted in the meantime, e.g. by an aborted upload session.
+
+:param is_forced: True to write any size change
+
+:since: v0.2.00
+        """
+
+        try: vfs_size = self.vfs_object.get_size()
+        except (IOException, OSError): return
+
+        with self:
+            if (self.vfs_size_synchronized is None):
+                self.vfs_size_synchronized = self.get_data_attributes("size")['size']
+                self.vfs_size_time_synchronized = time()
+            #
+
+            if (vfs_size != self.vfs_size_synchronized
+                and (is_forced
+                     or abs(vfs_size - self.vfs_size_synchronized) >= int(Settings.get("pas_file_center_size_write_behind_bytes", 16777216))
+                     or time() - self.vfs_size_time_synchronized >= float(Settings.get("pas_file_center_size_write_behind_seconds", 5))
+                    )
+               ):
+                self.set_data_attributes(size = vfs_size)
+
+                self.vfs_size_synchronized = vfs_size
+                self.vfs_size_time_synchronized = time()
+            #
+        #
+    #
+
+    def _update_content_hash(self, position, data, size):
+        """
+Adds the data written to the content hash as long as the stored file is
+written sequentially from its start.
+
+:param position: Position the data has been written to
+:param data: Bytes-like object written
+:param size: Number of bytes written
+
+:since: v0.2.00
+        """
+
+        if (position == 0):
+            self.content_hash = sha256()
+            self.content_hash_size = 0
+        elif (position != self.content_hash_size): self.content_hash = None
+
+        if (self.content_hash is not None and size is not None):
+            self.content_hash.update(memoryview(data)[:size])
+            self.content_hash_size += size
+        #
+    #
+
+    def _update_tree_totals(self, size, items, factor = 1):
+        """
+Adds the given size and number of items to the tree totals of all parent
+directories of this entry.
+
+:param size: Size in bytes
+:param items: Number of items
+:param factor: Factor applied to the size and number of items given
+
+:since: v0.2.00
+        """
+
+        Entry._update_parent_tree_totals(self.local.connection,
+                                         self.get_data_attributes("id_parent")['id_parent'],
+                                         size * factor,
+                                         items * factor
+                                        )
+    #
+
+    @Instrumentation.wrap("write", Instrumentation.BYTES_WRITTEN)
+    def write(self, data):
+        """
+python.org: Write the given bytes-like object, b, to the underlying raw
+stream, and return the number of bytes written.
+
+:param data: Bytes-like object
+
+:return: (int) Number of bytes written
+:since:  v0.2.00
+        """
+
+        self._ensure_vfs_object_instance()
+        if (not self.is_owner_quota_loaded): self._load_owner_quota_size_limit()
+
+        if (self.owner_quota_size_limit is not None):
+            vfs_size_written = self.vfs_object.tell() + len(data)
+
+            if (vfs_size_written > self.owner_quota_size_limit and vfs_size_written > self.vfs_object.get_size()):
+                with self: owner_id = self.get_data_attributes("owner_id")['owner_id']
+                raise QuotaExceededException("Quota of owner ID '{0}' exceeded".format(owner_id))
+            #
+        #
+
+        position = (self.vfs_object.tell() if (Entry._is_deduplication_enabled()) else None)
+
+        _return = self.vfs_object.write(data)
+        if (position is not None): self._update_content_hash(position, data, _return)
+
+        return _return
+    #
+
+    @staticmethod
+    def _add_stored_object_references(connection, stored_object_references):
+        """
+Adds references to the given stored files shared with copied entries.
+Stored files not shared before are registered with the reference of the
+original entry.
+
+:param connection: Database connection
+:param stored_object_references: Dictionary of VFS URL hashes and the
+                                 stored file data including the number of
+                                 references added
+
+:since: v0.2.00
+        """
+
+        batch_size = Entry._get_batch_size()
+        db_table = _DbFileCenterStoredObject.__table__
+        vfs_url_hash_list = list(stored_object_references)
+
+        db_update = (db_table.update()
+                     .where(db_table.c.vfs_url_hash == bindparam("_vfs_url_hash"))
+                     .values(reference_count = db_table.c.reference_count + bindparam("_references"))
+                    )
+
+        for offset in range(0, len(vfs_url_hash_list), batch_size):
+            vfs_url_hashes_batch = vfs_url_hash_list[offset:offset + batch_size]
+
+            vfs_url_hashes_registered = { vfs_url_hash
+                                          for ( vfs_url_hash, ) in connection.query(db_table.c.vfs_url_hash)
+                                                                   .filter(db_table.c.vfs_url_hash.in_(vfs_url_hashes_batch))
+                                        }
+
+            db_insert_values = [ ]
+            db_update_values = [ ]
+
+            for vfs_url_hash in vfs_url_hashes_batch:
+                stored_object_data = stored_object_references[vfs_url_hash]
+
+                if (vfs_url_hash in vfs_url_hashes_registered):
+                    db_update_values.append({ "_vfs_url_hash": vfs_url_hash, "_references": stored_object_data['references'] })
+                else:
+                    db_insert_values.append({ "vfs_url_hash": vfs_url_hash,
+                                              "vfs_url": stored_object_data['vfs_url'],
+                                              "content_digest": stored_object_data['content_digest'],
+                                              "size": stored_object_data['size'],
+                                              "reference_count": 1 + stored_object_data['references']
+                                            })
+                #
+            #
+
+            if (len(db_insert_values) > 0): connection.execute(db_table.insert(), db_insert_values)
+            if (len(db_update_values) > 0): connection.execute(db_update, db_update_values)
+        #
+    #
+
+    @staticmethod
+    def _apply_content_list_db_query(db_query, parent_id, vfs_type):
+        """
+Applies the conditions and the order of content lists to the given
+SQLAlchemy database query.
+
+:param db_query: SQLAlchemy database query
+:param parent_id: Parent entry ID
+:param vfs_type: VFS type of the entries to list
+
+:return: (object) SQLAlchemy database query
+:since:  v0.2.00
+        """
+
+        return (db_query.filter(_DbFileCenterEntry.id_parent == parent_id,
+                                _DbFileCenterEntry.vfs_type == vfs_type
+                               )
+                .order_by(*[ ( db_column.desc() if (is_descending) else db_column.asc() )
+                             for ( db_column, is_descending ) in Entry._get_content_list_db_sort_columns()
+                             if (db_column is not _DbFileCenterEntry.vfs_type)
+                           ])
+               )
+    #
+
+    @staticmethod
+    def check_owner_quota(owner_id, size):
+        """
+Checks if the given number of bytes can be added to the storage used by the
+given owner ID without exceeding its quota.
+
+:param owner_id: Owner ID
+:param size: Number of bytes to be added
+
+:since: v0.2.00
+        """
+
+        quota = Entry._get_owner_quota(owner_id)
+
+        if (quota is not None and size > 0):
+            owner_usage = Entry.get_owner_usage(owner_id)
+
+            if (owner_usage['size'] + size > quota):
+                raise QuotaExceededException("Quota of owner ID '{0}' exceeded".format(owner_id))
+            #
+        #
+    #
+
+    @staticmethod
+    def _copy_vfs_url(vfs_url):
+        """
+Copies the stored file of the given VFS URL to a new stored file.
+
+:param vfs_url: VFS URL
+
+:return: (str) VFS URL of the new stored file
+:since:  v0.2.00
+        """
+
+        source_vfs_object = Implementation.load_vfs_url(vfs_url, True)
+
+        try:
+            target_vfs_object = Implementation.new_vfs_url(Implementation.TYPE_FILE, "x-file-store://")
+
+            try:
+                data = source_vfs_object.read(65536)
+
+                while (len(data) > 0):
+                    target_vfs_object.write(data)
+                    data = source_vfs_object.read(65536)
+                #
+
+                _return = target_vfs_object.get_url()
+            finally: target_vfs_object.close()
+        finally: source_vfs_object.close()
+
+        return _return
+    #
+
+    @staticmethod
+    def _copy_related_db_rows(connection, db_relationship, entry_ids):
+        """
+Copies all rows referenced by the given SQLAlchemy relationship for the
+given file center entry IDs to the new entry IDs.
+
+:param connection: Database connection
+:param db_relationship: SQLAlchemy relationship attribute
+:param entry_ids: Dictionary of new entry IDs by file center entry ID
+
+:since: v0.2.00
+        """
+
+        for ( local_column, remote_column ) in db_relationship.property.local_remote_pairs:
+            if (local_column.primary_key):
+                db_table = remote_column.table
+                db_values_list = [ ]
+
+                for db_row in connection.execute(db_table.select().where(remote_column.in_(list(entry_ids)))):
+                    db_values = dict(db_row)
+
+                    for db_column in db_table.primary_key.columns:
+                        if (db_column.name != remote_column.name): db_values[db_column.name] = uuid().hex
+                    #
+
+                    db_values[remote_column.name] = entry_ids[db_row[remote_column.name]]
+                    db_values_list.append(db_values)
+                #
+
+                if (len(db_values_list) > 0): connection.execute(db_table.insert(), db_values_list)
+            #
+        #
+    #
+
+    @staticmethod
+    def _delete_db_rows(connection, entry_ids):
+        """
+Deletes the database rows of the given file center entry IDs including ACL
+entries and resource metadata in batches.
+
+:param connection: Database connection
+:param entry_ids: List of file center entry IDs
+
+:since: v0.2.00
+        """
+
+        batch_size = Entry._get_batch_size()
+        owner_root_directory_cache = OwnerRootDirectoryCache.get_instance()
+
+        for offset in range(0, len(entry_ids), batch_size):
+            entry_ids_batch = entry_ids[offset:offset + batch_size]
+            for entry_id in entry_ids_batch: owner_root_directory_cache.invalidate_entry_id(entry_id)
+
+            Entry._delete_related_db_rows(connection, _DbFileCenterEntry.rel_acl, entry_ids_batch)
+            Entry._delete_related_db_rows(connection, _DbFileCenterEntry.rel_resource_metadata, entry_ids_batch)
+
+            db_table = _DbFileCenterProcessingJob.__table__
+            connection.execute(db_table.delete().where(db_table.c.id_entry.in_(entry_ids_batch)))
+
+            for db_table in ( _DbFileCenterEntry.__table__, _DbDataLinker.__table__ ):
+                connection.execute(db_table.delete().where(db_table.c.id.in_(entry_ids_batch)))
+            #
+        #
+    #
+
+    @staticmethod
+    def _delete_related_db_rows(connection, db_relationship, entry_ids):
+        """
+Deletes all rows referenced by the given SQLAlchemy relationship for the
+given file center entry IDs.
+
+:param connection: Database connection
+:param db_relationship: SQLAlchemy relationship attribute
+:param entry_ids: List of file center entry IDs
+
+:since: v0.2.00
+        """
+
+        for ( local_column, remote_column ) in db_relationship.property.local_remote_pairs:
+            local_values = (entry_ids
+                            if (local_column.primary_key) else
+                            connection.query(local_column).filter(local_column.table.c.id.in_(entry_ids)).subquery()
+                           )
+
+            connection.execute(remote_column.table.delete().where(remote_column.in_(local_values)))
+        #
+    #
+
+    @staticmethod
+    def delete_vfs_url(vfs_url):
+        """
+Deletes the stored file of the given VFS URL if supported by the VFS
+implementation.
+
+:param vfs_url: VFS URL
+
+:return: (bool) True if deleted
+:since:  v0.2.00
+        """
+
+        _return = False
+
+        if (vfs_url is not None):
+            vfs_object = Implementation.load_vfs_url(vfs_url)
+
+            try:
+                if (vfs_object.is_valid() and vfs_object.is_supported("delete")):
+                    vfs_object.delete()
+                    _return = True
+                #
+            finally: vfs_object.close()
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_batch_size():
+        """
+Returns the number of rows processed with one set-based database statement.
+
+:return: (int) Batch size
+:since:  v0.2.00
+        """
+
+        return int(Settings.get("pas_file_center_batch_size", 500))
+    #
+
+    @staticmethod
+    def _get_content_list_cursor_condition(cursor, vfs_type):
+        """
+Returns the SQLAlchemy condition matching all entries of the given VFS type
+listed after the given cursor.
+
+:param cursor: Cursor returned by "get_content_list_cursor()"
+:param vfs_type: VFS type of the entries to list
+
+:return: (object) SQLAlchemy condition
+:since:  v0.2.00
+        """
+
+        db_sort_columns = Entry._get_content_list_db_sort_columns()
+        if (len(cursor) != len(db_sort_columns)): raise ValueException("Content list cursor given is invalid")
+
+        _return = None
+
+        for ( ( db_column, is_descending ), value ) in reversed(list(zip(db_sort_columns, cursor))):
+            if (db_column is _DbFileCenterEntry.vfs_type):
+                # The VFS type is fixed for each query and decides the order if different
+                if (vfs_type != value): _return = (true() if (vfs_type > value) else false())
+            else:
+                db_condition = (db_column < value if (is_descending) else db_column > value)
+                _return = (db_condition if (_return is None) else or_(db_condition, and_(db_column == value, _return)))
+            #
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_content_list_db_sort_columns():
+        """
+Returns the SQLAlchemy columns of the default sort definition extended by
+the entry ID to provide a stable order for keyset pagination.
+
+:return: (list) Tuples of SQLAlchemy column and true if sorted descending
+:since:  v0.2.00
+        """
+
+        _return = [ ( getattr(_DbFileCenterEntry, key), (direction == SortDefinition.DESCENDING) )
+                    for ( key, direction ) in Entry._get_default_sort_list()
+                  ]
+
+        _return.append(( _DbDataLinker.id, False ))
+
+        return _return
+    #
+
+    @staticmethod
+    def get_deduplication_stats():
+        """
+Returns the number of stored files shared by deduplicated entries and the
+number of bytes saved by not storing the same content again.
+
+:return: (dict) Number of stored files, references and bytes saved
+:since:  v0.2.00
+        """
+
+        connection = Connection.get_instance()
+
+        with connection:
+            db_row = (connection.query(func.count(_DbFileCenterStoredObject.vfs_url_hash),
+                                       func.sum(_DbFileCenterStoredObject.reference_count),
+                                       func.sum((_DbFileCenterStoredObject.reference_count - 1) * _DbFileCenterStoredObject.size)
+                                      )
+                      .first()
+                     )
+        #
+
+        return { "stored_objects": db_row[0],
+                 "references": (0 if (db_row[1] is None) else int(db_row[1])),
+                 "size_saved": (0 if (db_row[2] is None) else int(db_row[2]))
+               }
+    #
+
+    @staticmethod
+    def _get_default_sort_list():
+        """
+Returns the list of keys and directions of the default sort definition. It
+is shared by the sort definition and the keyset pagination of content lists
+so both use the same order.
+
+:return: (list) Tuples of sort key and direction
+:since:  v0.2.00
+        """
+
+        return [ ( "position", SortDefinition.ASCENDING ),
+                 ( "vfs_type", SortDefinition.ASCENDING ),
+                 ( "sort_title", SortDefinition.ASCENDING ),
+                 ( "sort_time", SortDefinition.DESCENDING )
+               ]
+    #
+
+    @staticmethod
+    def _get_owner_quota(owner_id):
+        """
+Returns the quota of the given owner ID.
+
+:param owner_id: Owner ID
+
+:return: (int) Quota in bytes; None if unlimited
+:since:  v0.2.00
+        """
+
+        connection = Connection.get_instance()
+
+        with connection:
+            _return = (connection.query(_DbFileCenterOwnerUsage.quota)
+                       .filter(_DbFileCenterOwnerUsage.owner_id == owner_id)
+                       .scalar()
+                      )
+        #
+
+        if (_return is None): _return = Settings.get("pas_file_center_owner_quota")
+        return (None if (_return is None or _return < 0) else int(_return))
+    #
+
+    @staticmethod
+    def get_owner_usage(owner_id):
+        """
+Returns the storage used by the given owner ID.
+
+:param owner_id: Owner ID
+
+:return: (dict) Size in bytes and number of items
+:since:  v0.2.00
+        """
+
+        connection = Connection.get_instance()
+
+        with connection:
+            db_row = (connection.query(_DbFileCenterOwnerUsage.size, _DbFileCenterOwnerUsage.items)
+                      .filter(_DbFileCenterOwnerUsage.owner_id == owner_id)
+                      .first()
+                     )
+        #
+
+        return ({ "size": 0, "items": 0 }
+                if (db_row is None) else
+                { "size": db_row[0], "items": db_row[1] }
+               )
+    #
+
+    @staticmethod
+    def _get_parent_ids(connection, parent_id):
+        """
+Returns the given parent ID and the IDs of all its parents.
+
+:param connection: Database connection
+:param parent_id: Parent ID to start with
+
+:return: (list) Parent IDs
+:since:  v0.2.00
+        """
+
+        _return = [ ]
+
+        while (parent_id is not None and parent_id not in _return):
+            _return.append(parent_id)
+            parent_id = connection.query(_DbDataLinker.id_parent).filter(_DbDataLinker.id == parent_id).scalar()
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def get_vfs_url_hash(url):
+        """
+Returns the fixed-width digest of the given VFS URL used for exact lookups.
+
+:param url: VFS URL
+
+:return: (str) Hex encoded SHA-256 digest; None if the VFS URL is undefined
+:since:  v0.2.00
+        """
+
+        return (None if (url is None) else sha256(Binary.utf8_bytes(url)).hexdigest())
+    #
+
+    @staticmethod
+    def _is_deduplication_enabled():
+        """
+Returns true if entries with the same content should share one stored file.
+
+:return: (bool) True if enabled
+:since:  v0.2.00
+        """
+
+        return Settings.get("pas_file_center_deduplication_enabled", False)
+    #
+
+    @staticmethod
+    def _is_processing_enabled():
+        """
+Returns true if post-ingest processing should be queued for new stored
+files.
+
+:return: (bool) True if enabled
+:since:  v0.2.00
+        """
+
+        return Settings.get("pas_file_center_processing_enabled", False)
+    #
+
+    @staticmethod
+    def _is_size_write_behind_enabled():
+        """
+Returns true if size changes detected by "flush()" should be written to the
+database only at "checkpoint()", "close()" or after the configured
+thresholds.
+
+:return: (bool) True if enabled
+:since:  v0.2.00
+        """
+
+        return Settings.get("pas_file_center_size_write_behind_enabled", False)
+    #
+
+    @staticmethod
+    def _is_tree_totals_enabled():
+        """
+Returns true if the size and number of items below directories should be
+maintained.
+
+:return: (bool) True if enabled
+:since:  v0.2.00
+        """
+
+        return Settings.get("pas_file_center_tree_totals_enabled", False)
+    #
+
+    @classmethod
+    def iter_load_ids(cls, ids):
+        """
+Loads Entry instances for the given iterable of IDs in batches.
+
+:param cls: Expected encapsulating database instance class
+:param ids: Iterable of IDs
+
+:return: (object) Generator yielding ID and Entry instance tuples; IDs not
+         matched are omitted
+:since:  v0.2.00
+        """
+
+        return cls._iter_load_db_column_values(_DbFileCenterEntry.id, ids)
+    #
+
+    @classmethod
+    def iter_load_role_ids(cls, ids):
+        """
+Loads Entry instances for the given iterable of role IDs in batches.
+
+:param cls: Expected encapsulating database instance class
+:param ids: Iterable of role IDs
+
+:return: (object) Generator yielding role ID and Entry instance tuples; role
+         IDs not matched are omitted
+:since:  v0.2.00
+        """
+
+        return cls._iter_load_db_column_values(_DbFileCenterEntry.role_id, ids)
+    #
+
+    @classmethod
+    def iter_load_vfs_urls(cls, urls):
+        """
+Loads Entry instances for the given iterable of VFS URLs in batches. The
+entry with the lowest ID is returned for stored files shared by several
+entries.
+
+:param cls: Expected encapsulating database instance class
+:param urls: Iterable of VFS URLs
+
+:return: (object) Generator yielding VFS URL and Entry instance tuples; VFS
+         URLs not matched are omitted
+:since:  v0.2.00
+        """
+
+        return cls._iter_load_db_column_values(_DbFileCenterEntry.vfs_url_hash, urls, Entry.get_vfs_url_hash)
+    #
+
+    @classmethod
+    def _iter_load_db_column_values(cls, db_column, values, db_value_callback = None):
+        """
+Loads Entry instances matching the given values of a database column with
+one "IN" query per batch. Only one batch of values and instances is held in
+memory at a time.
+
+:param cls: Expected encapsulating database instance class
+:param db_column: SQLAlchemy column to filter
+:param values: Iterable of values
+:param db_value_callback: Callback to calculate the column value for a value
+
+:return: (object) Generator yielding value and Entry instance tuples
+:since:  v0.2.00
+        """
+
+        batch_size = Entry._get_batch_size()
+        values_iterator = iter(values)
+
+        while True:
+            values_batch = set(islice(values_iterator, batch_size))
+            if (len(values_batch) < 1): break
+
+            values_batch.discard(None)
+
+            db_values_batch = (dict(( db_value_callback(value), value ) for value in values_batch)
+                               if (db_value_callback is not None) else
+                               dict(( value, value ) for value in values_batch)
+                              )
+
+            entries_batch = [ ]
+
+            if (len(db_values_batch) > 0):
+                with Connection.get_instance():
+                    db_query = (DataLinker.get_db_class_query(cls)
+                                .filter(db_column.in_(list(db_values_batch)))
+                                .order_by(_DbFileCenterEntry.id.asc())
+                               )
+
+                    for db_instance in db_query:
+                        value = db_values_batch.pop(getattr(db_instance, db_column.key), None)
+
+                        if (value is not None):
+                            DataLinker._ensure_db_class(cls, db_instance)
+                            entries_batch.append(( value, Entry(db_instance) ))
+                        #
+                    #
+                #
+            #
+
+            for entry_data in entries_batch: yield entry_data
+        #
+    #
+
+    @classmethod
+    @Instrumentation.wrap("load_ids")
+    def load_ids(cls, ids):
+        """
+Load Entry instances for the given IDs.
+
+:param cls: Expected encapsulating database instance class
+:param ids: Iterable of IDs
+
+:return: (dict) Entry instances by ID; IDs not matched are omitted
+:since:  v0.2.00
+        """
+
+        return dict(cls.iter_load_ids(ids))
+    #
+
+    @classmethod
+    @Instrumentation.wrap("load_role_id")
+    def load_role_id(cls, _id):
+        """
+Load Entry instance by its role ID.
 
-            _return.set_writable_for_user(owner_id)
+:param cls: Expected encapsulating database instance class
+:param _id: Role ID
+
+:return: (object) Entry instance on success
+:since:  v0.1.00
+        """
+
+        if (_id is None): raise NothingMatchedException("Role ID is invalid")
+
+        with Connection.get_instance():
+            db_instance = DataLinker.get_db_class_query(cls).filter(_DbFileCenterEntry.role_id == _id).first()
+
+            if (db_instance is None): raise NothingMatchedException("Role ID '{0}' is invalid".format(_id))
+            DataLinker._ensure_db_class(cls, db_instance)
+
+            return Entry(db_instance)
+        #
+    #
+
+    @classmethod
+    @Instrumentation.wrap("load_role_ids")
+    def load_role_ids(cls, ids):
+        """
+Load Entry instances for the given role IDs. Only one instance is returned
+for each role ID.
+
+:param cls: Expected encapsulating database instance class
+:param ids: Iterable of role IDs
+
+:return: (dict) Entry instances by role ID; role IDs not matched are omitted
+:since:  v0.2.00
+        """
+
+        return dict(cls.iter_load_role_ids(ids))
+    #
+
+    @classmethod
+    @Instrumentation.wrap("load_or_create_owner_root_directory")
+    def load_or_create_owner_root_directory(cls, owner_id):
+        """
+Load Entry instance of the root directory or create a new one for the given
+owner ID.
+
+:param cls: Expected encapsulating database instance class
+:param owner_id: Owner ID
+
+:return: (object) Entry instance on success
+:since:  v0.1.00
+        """
 
-            _return.save()
+        owner_root_directory_cache = OwnerRootDirectoryCache.get_instance()
+
+        with owner_root_directory_cache.get_owner_lock(owner_id):
+            try: _return = cls.load_owner_root_directory(owner_id)
+            except NothingMatchedException:
+                if (not Settings.get("pas_file_center_owner_root_directory_create_on_demand", True)): raise OperationNotSupportedException()
+
+                _return = Entry()
+
+                _return.set_as_main_entry()
+
+                _return.set_data_attributes(title = "/",
+                                            vfs_type = Entry.VFS_TYPE_DIRECTORY,
+                                            role_id = "owner_root",
+                                            owner_type = "u",
+                                            owner_id = owner_id,
+                                            mimeclass = "directory",
+                                            mimetype = "text/directory",
+                                            guest_permission = "r",
+                                            user_permission = "r"
+                                           )
+
+                _return.set_writable_for_user(owner_id)
+
+                _return.save()
+
+                owner_root_directory_cache.set(owner_id, _return.get_id())
+            #
         #
 
         return _return
     #
 
     @classmethod
+    @Instrumentation.wrap("load_owner_root_directory")
     def load_owner_root_directory(cls, owner_id):
         """
 Load Entry instance of the root directory for the given owner ID.
@@ -468,27 +2490,51 @@ Load Entry instance of the root directory for the given owner ID.
 
         if (owner_id is None): raise NothingMatchedException("Owner ID is invalid")
 
+        owner_root_directory_cache = OwnerRootDirectoryCache.get_instance()
+        entry_id = owner_root_directory_cache.get(owner_id)
+
         with Connection.get_instance():
-            db_instance = (DataLinker.get_db_class_query(cls)
-                           .filter(_DbFileCenterEntry.vfs_type == Entry.VFS_TYPE_DIRECTORY,
-                                   _DbFileCenterEntry.role_id == "owner_root",
-                                   _DbFileCenterEntry.owner_type == "u",
-                                   _DbFileCenterEntry.owner_id == owner_id
-                                  )
-                           .first()
+            db_instance = (None
+                           if (entry_id is None) else
+                           DataLinker.get_db_class_query(cls).filter(_DbFileCenterEntry.id == entry_id).first()
                           )
 
-            if (db_instance is None): raise NothingMatchedException("Owner ID '{0}' is invalid".format(owner_id))
-            DataLinker._ensure_db_class(cls, db_instance)
+            if (db_instance is not None
+                and (db_instance.vfs_type != Entry.VFS_TYPE_DIRECTORY
+                     or db_instance.role_id != "owner_root"
+                     or db_instance.owner_type != "u"
+                     or db_instance.owner_id != owner_id
+                    )
+               ): db_instance = None
+
+            if (db_instance is None):
+                if (entry_id is not None): owner_root_directory_cache.invalidate(owner_id)
+
+                db_instance = (DataLinker.get_db_class_query(cls)
+                               .filter(_DbFileCenterEntry.vfs_type == Entry.VFS_TYPE_DIRECTORY,
+                                       _DbFileCenterEntry.role_id == "owner_root",
+                                       _DbFileCenterEntry.owner_type == "u",
+                                       _DbFileCenterEntry.owner_id == owner_id
+                                      )
+                               .first()
+                              )
+
+                if (db_instance is None): raise NothingMatchedException("Owner ID '{0}' is invalid".format(owner_id))
+                DataLinker._ensure_db_class(cls, db_instance)
+
+                owner_root_directory_cache.set(owner_id, db_instance.id)
+            #
 
             return Entry(db_instance)
         #
     #
 
     @classmethod
+    @Instrumentation.wrap("load_vfs_url")
     def load_vfs_url(cls, url):
         """
-Load Entry instance by its VFS URL.
+Load Entry instance by its VFS URL. Stored files may be shared by several
+entries; the one with the lowest ID is returned in this case.
 
 :param cls: Expected encapsulating database instance class
 :param url: VFS URL
@@ -500,7 +2546,11 @@ Load Entry instance by its VFS URL.
         if (url is None): raise NothingMatchedException("VFS URL is invalid")
 
         with Connection.get_instance():
-            db_instance = DataLinker.get_db_class_query(cls).filter(_DbFileCenterEntry.vfs_url == url).first()
+            db_instance = (DataLinker.get_db_class_query(cls)
+                           .filter(_DbFileCenterEntry.vfs_url_hash == Entry.get_vfs_url_hash(url))
+                           .order_by(_DbFileCenterEntry.id.asc())
+                           .first()
+                          )
 
             if (db_instance is None): raise NothingMatchedException("VFS URL '{0}' is invalid".format(url))
             DataLinker._ensure_db_class(cls, db_instance)
@@ -509,7 +2559,24 @@ Load Entry instance by its VFS URL.
         #
     #
 
+    @classmethod
+    @Instrumentation.wrap("load_vfs_urls")
+    def load_vfs_urls(cls, urls):
+        """
+Load Entry instances for the given VFS URLs.
+
+:param cls: Expected encapsulating database instance class
+:param urls: Iterable of VFS URLs
+
+:return: (dict) Entry instances by VFS URL; VFS URLs not matched are omitted
+:since:  v0.2.00
+        """
+
+        return dict(cls.iter_load_vfs_urls(urls))
+    #
+
     @staticmethod
+    @Instrumentation.wrap("new_stored_file")
     def new_stored_file():
         """
 Creates a new Entry instance for a file backed by an StoredFile instance.
@@ -525,4 +2592,311 @@ Creates a new Entry instance for a file backed by an StoredFile instance.
 
         return _return
     #
+
+    @staticmethod
+    def rebuild_owner_usage():
+        """
+Recalculates the storage used by all owners.
+
+:return: (int) Number of owners updated
+:since:  v0.2.00
+        """
+
+        connection = Connection.get_instance()
+        db_table = _DbFileCenterOwnerUsage.__table__
+
+        with connection, TransactionContext():
+            connection.execute(db_table.update().values(size = 0, items = 0))
+
+            db_query = (connection.query(_DbFileCenterEntry.owner_id,
+                                         func.sum(_DbFileCenterEntry.size),
+                                         func.count(_DbFileCenterEntry.id)
+                                        )
+                        .filter(_DbFileCenterEntry.vfs_type == Entry.VFS_TYPE_ITEM,
+                                _DbFileCenterEntry.owner_id != None
+                               )
+                        .group_by(_DbFileCenterEntry.owner_id)
+                       )
+
+            _return = 0
+
+            for ( owner_id, size, items ) in db_query.all():
+                Entry._update_owner_usage(connection, owner_id, int(size), items)
+                _return += 1
+            #
+
+            return _return
+        #
+    #
+
+    @staticmethod
+    def rebuild_tree_totals():
+        """
+Recalculates the size and number of items below all directories. Each tree
+of entries sharing the same main entry is read once and updated in batches.
+
+:return: (int) Number of directories updated
+:since:  v0.2.00
+        """
+
+        _return = 0
+
+        batch_size = Entry._get_batch_size()
+        connection = Connection.get_instance()
+        db_data_linker_table = _DbDataLinker.__table__
+        db_file_center_entry_table = _DbFileCenterEntry.__table__
+
+        db_update = (db_file_center_entry_table.update()
+                     .where(db_file_center_entry_table.c.id == bindparam("_id"))
+                     .values(tree_size = bindparam("_tree_size"), tree_items = bindparam("_tree_items"))
+                    )
+
+        with connection:
+            main_ids = [ main_id for ( main_id, ) in connection.query(db_data_linker_table.c.id_main).distinct() ]
+        #
+
+        for main_id in main_ids:
+            with connection, TransactionContext():
+                db_query = (connection.query(db_data_linker_table.c.id,
+                                             db_data_linker_table.c.id_parent,
+                                             db_file_center_entry_table.c.vfs_type,
+                                             db_file_center_entry_table.c.size
+                                            )
+                            .select_from(db_data_linker_table)
+                            .join(db_file_center_entry_table,
+                                  db_data_linker_table.c.id == db_file_center_entry_table.c.id
+                                 )
+                            .filter(db_data_linker_table.c.id_main == main_id)
+                           )
+
+                entries = { }
+                tree_totals = { }
+
+                for ( entry_id, parent_id, vfs_type, size ) in db_query:
+                    entries[entry_id] = ( parent_id, vfs_type, size )
+                    if (vfs_type == Entry.VFS_TYPE_DIRECTORY): tree_totals[entry_id] = [ 0, 0 ]
+                #
+
+                for entry_id in entries:
+                    ( parent_id, vfs_type, size ) = entries[entry_id]
+                    if (vfs_type != Entry.VFS_TYPE_ITEM): continue
+
+                    parent_ids = [ ]
+
+                    while (parent_id in entries and parent_id not in parent_ids):
+                        parent_ids.append(parent_id)
+
+                        if (parent_id in tree_totals):
+                            tree_totals[parent_id][0] += size
+                            tree_totals[parent_id][1] += 1
+                        #
+
+                        parent_id = entries[parent_id][0]
+                    #
+                #
+
+                db_update_parameters = [ { "_id": entry_id,
+                                           "_tree_size": tree_totals[entry_id][0],
+                                           "_tree_items": tree_totals[entry_id][1]
+                                         }
+                                         for entry_id in tree_totals
+                                       ]
+
+                for offset in range(0, len(db_update_parameters), batch_size):
+                    connection.execute(db_update, db_update_parameters[offset:offset + batch_size])
+                #
+
+                _return += len(db_update_parameters)
+            #
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def _release_stored_objects(connection, vfs_url_hashes):
+        """
+Removes the given number of references to deduplicated stored files.
+Stored files no longer referenced are removed from the database.
+
+:param connection: Database connection
+:param vfs_url_hashes: Dictionary of VFS URL hashes and the number of
+                       references removed
+
+:return: (list) VFS URLs of stored files no longer referenced
+:since:  v0.2.00
+        """
+
+        _return = [ ]
+
+        batch_size = Entry._get_batch_size()
+        db_table = _DbFileCenterStoredObject.__table__
+        vfs_url_hash_list = list(vfs_url_hashes)
+
+        db_update = (db_table.update()
+                     .where(db_table.c.vfs_url_hash == bindparam("_vfs_url_hash"))
+                     .values(reference_count = db_table.c.reference_count - bindparam("_references"))
+                    )
+
+        for offset in range(0, len(vfs_url_hash_list), batch_size):
+            db_rows = (connection.query(db_table.c.vfs_url_hash, db_table.c.vfs_url, db_table.c.reference_count)
+                       .filter(db_table.c.vfs_url_hash.in_(vfs_url_hash_list[offset:offset + batch_size]))
+                       .all()
+                      )
+
+            unreferenced_vfs_url_hashes = [ ]
+            db_update_values = [ ]
+
+            for ( vfs_url_hash, vfs_url, reference_count ) in db_rows:
+                if (reference_count > vfs_url_hashes[vfs_url_hash]):
+                    db_update_values.append({ "_vfs_url_hash": vfs_url_hash, "_references": vfs_url_hashes[vfs_url_hash] })
+                else:
+                    unreferenced_vfs_url_hashes.append(vfs_url_hash)
+                    _return.append(vfs_url)
+                #
+            #
+
+            if (len(unreferenced_vfs_url_hashes) > 0):
+                connection.execute(db_table.delete().where(db_table.c.vfs_url_hash.in_(unreferenced_vfs_url_hashes)))
+            #
+
+            if (len(db_update_values) > 0): connection.execute(db_update, db_update_values)
+        #
+
+        return _return
+    #
+
+    @classmethod
+    @Instrumentation.wrap("save_many")
+    def save_many(cls, entries, parent = None):
+        """
+Saves the given entries in one transaction. The parent of new entries is
+only loaded once per parent to inherit its data, ACL entries and default
+permissions. Tree totals and the storage used are updated once per parent
+and owner.
+
+:param cls: Expected encapsulating database instance class
+:param entries: Iterable of Entry instances
+:param parent: Parent Entry instance new entries are added to; entries are
+               saved below their defined parent if not given
+
+:since: v0.2.00
+        """
+
+        insert_batch = { "owner_usage": { }, "parents": { }, "tree_totals": { } }
+        if (parent is not None): insert_batch['parents'][parent.get_id()] = parent
+
+        connection = Connection.get_instance()
+
+        with connection, TransactionContext():
+            for entry in entries:
+                if (not isinstance(entry, cls)): raise ValueException("Entry instance given is invalid")
+
+                entry.insert_batch = insert_batch
+
+                try:
+                    if (parent is None): entry.save()
+                    else: parent.add_entry(entry)
+                finally: entry.insert_batch = None
+            #
+
+            for parent_id in insert_batch['tree_totals']:
+                Entry._update_parent_tree_totals(connection, parent_id, *insert_batch['tree_totals'][parent_id])
+            #
+
+            for owner_id in insert_batch['owner_usage']:
+                Entry._update_owner_usage(connection, owner_id, *insert_batch['owner_usage'][owner_id])
+            #
+        #
+    #
+
+    @staticmethod
+    def set_owner_quota(owner_id, quota):
+        """
+Sets the quota of the given owner ID.
+
+:param owner_id: Owner ID
+:param quota: Quota in bytes; None to use the default quota
+
+:since: v0.2.00
+        """
+
+        connection = Connection.get_instance()
+        db_table = _DbFileCenterOwnerUsage.__table__
+
+        with connection, TransactionContext():
+            Entry._update_owner_usage(connection, owner_id, 0, 0, True)
+            connection.execute(db_table.update().where(db_table.c.owner_id == owner_id).values(quota = quota))
+        #
+    #
+
+    @staticmethod
+    def _update_owner_usage(connection, owner_id, size, items, is_creation_forced = False):
+        """
+Adds the given size and number of items to the storage used by the given
+owner ID.
+
+:param connection: Database connection
+:param owner_id: Owner ID
+:param size: Size in bytes
+:param items: Number of items
+:param is_creation_forced: True to create the owner usage row even if
+                           nothing is added
+
+:since: v0.2.00
+        """
+
+        if (owner_id is not None and (is_creation_forced or size != 0 or items != 0)):
+            db_table = _DbFileCenterOwnerUsage.__table__
+
+            db_update = (db_table.update()
+                         .where(db_table.c.owner_id == owner_id)
+                         .values(size = _DbFileCenterOwnerUsage.size + size,
+                                 items = _DbFileCenterOwnerUsage.items + items
+                                )
+                        )
+
+            db_result = connection.execute(db_update)
+
+            if (db_result.rowcount < 1):
+                try:
+                    with connection.begin_nested(): connection.execute(db_table.insert().values(owner_id = owner_id, size = size, items = items))
+                except IntegrityError:
+                    # The owner usage row has been inserted concurrently
+                    connection.execute(db_update)
+                #
+            #
+        #
+    #
+
+    @staticmethod
+    def _update_parent_tree_totals(connection, parent_id, size, items):
+        """
+Adds the given size and number of items to the tree totals of the given
+parent directory and all its parents.
+
+:param connection: Database connection
+:param parent_id: Parent ID
+:param size: Size in bytes
+:param items: Number of items
+
+:since: v0.2.00
+        """
+
+        if (size != 0 or items != 0):
+            parent_ids = Entry._get_parent_ids(connection, parent_id)
+
+            if (len(parent_ids) > 0):
+                db_table = _DbFileCenterEntry.__table__
+
+                connection.execute(db_table.update()
+                                   .where(db_table.c.id.in_(parent_ids))
+                                   .where(db_table.c.vfs_type == Entry.VFS_TYPE_DIRECTORY)
+                                   .values(tree_size = db_table.c.tree_size + size,
+                                           tree_items = db_table.c.tree_items + items
+                                          )
+                                  )
+            #
+        #
+    #
 #
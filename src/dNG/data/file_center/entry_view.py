@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from dNG.database.instances.data_linker import DataLinker as _DbDataLinker
+from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+from dNG.database.nothing_matched_exception import NothingMatchedException
+from dNG.module.named_loader import NamedLoader
+
+class EntryView(object):
+    """
+"EntryView" is a compact, read-only view of the common columns of a file
+center entry. It is created from database rows directly and does not hold a
+database instance, lock or VFS object.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    __slots__ = ( "id",
+                  "title",
+                  "position",
+                  "time_sortable",
+                  "vfs_type",
+                  "mimetype",
+                  "size",
+                  "owner_type",
+                  "owner_id",
+                  "guest_permission",
+                  "user_permission",
+                  "locked"
+                )
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, db_row):
+        """
+Constructor __init__(EntryView)
+
+:param db_row: Database row of the columns returned by "get_db_columns()"
+
+:since: v0.2.00
+        """
+
+        ( self.id,
+          self.title,
+          self.position,
+          self.time_sortable,
+          self.vfs_type,
+          self.mimetype,
+          self.size,
+          self.owner_type,
+          self.owner_id,
+          self.guest_permission,
+          self.user_permission,
+          self.locked
+        ) = db_row
+    #
+
+    def __repr__(self):
+        """
+python.org: Called by the repr() built-in function to compute the "official"
+string representation of an object.
+
+:return: (str) String representation
+:since:  v0.2.00
+        """
+
+        return "<{0} id={1!r} title={2!r}>".format(self.__class__.__name__, self.id, self.title)
+    #
+
+    def get_content_list_cursor(self):
+        """
+Returns the keyset pagination cursor of this entry view.
+
+:return: (list) Cursor values
+:since:  v0.2.00
+        """
+
+        return [ self.position,
+                 self.vfs_type,
+                 ("" if (self.title is None) else self.title),
+                 (0 if (self.time_sortable is None) else self.time_sortable),
+                 self.id
+               ]
+    #
+
+    def get_data_attributes(self, *args):
+        """
+Returns the requested attributes.
+
+:return: (dict) Values for the requested attributes
+:since:  v0.2.00
+        """
+
+        return dict(( key, getattr(self, key) ) for key in args)
+    #
+
+    def get_id(self):
+        """
+Returns the ID of the entry.
+
+:return: (str) Entry ID
+:since:  v0.2.00
+        """
+
+        return self.id
+    #
+
+    def get_vfs_type(self):
+        """
+Returns the VFS type of the entry.
+
+:return: (int) File center entry VFS type
+:since:  v0.2.00
+        """
+
+        return self.vfs_type
+    #
+
+    def is_vfs_type(self, vfs_type):
+        """
+Returns true if the entry is of the given VFS type.
+
+:return: (bool) True if the entry is of the given VFS type
+:since:  v0.2.00
+        """
+
+        return (self.vfs_type == vfs_type)
+    #
+
+    def load_entry(self):
+        """
+Loads the full Entry instance of this view, e.g. to modify it.
+
+:return: (object) Entry instance
+:since:  v0.2.00
+        """
+
+        entry_class = NamedLoader.get_class("dNG.data.file_center.Entry")
+        entries = entry_class.load_ids([ self.id ])
+
+        if (self.id not in entries): raise NothingMatchedException("Entry ID '{0}' is invalid".format(self.id))
+        return entries[self.id]
+    #
+
+    @staticmethod
+    def get_db_columns():
+        """
+Returns the SQLAlchemy columns selected to create an entry view.
+
+:return: (list) SQLAlchemy columns
+:since:  v0.2.00
+        """
+
+        return [ _DbFileCenterEntry.id,
+                 _DbDataLinker.title,
+                 _DbDataLinker.position,
+                 _DbDataLinker.time_sortable,
+                 _DbFileCenterEntry.vfs_type,
+                 _DbFileCenterEntry.mimetype,
+                 _DbFileCenterEntry.size,
+                 _DbFileCenterEntry.owner_type,
+                 _DbFileCenterEntry.owner_id,
+                 _DbFileCenterEntry.guest_permission,
+                 _DbFileCenterEntry.user_permission,
+                 _DbFileCenterEntry.locked
+               ]
+    #
+#
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+import json
+import os
+
+from dNG.data.settings import Settings
+
+class Environment(object):
+    """
+"Environment" configures the settings and the database used by the command
+line tools of this package if they are run outside of a PAS application.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    SETTINGS_FILE_NAMES = ( "pas_core.json", "pas_database.json", "pas_file_center.json" )
+    """
+Settings files read from "[path_data]/settings" if no settings file is given
+    """
+
+    @staticmethod
+    def add_arguments(argument_parser):
+        """
+Adds the command line arguments used to configure the environment.
+
+:param argument_parser: ArgumentParser instance
+
+:since: v0.2.00
+        """
+
+        argument_parser.add_argument("--path-data", dest = "path_data")
+        argument_parser.add_argument("--settings-file", dest = "settings_files", action = "append")
+        argument_parser.add_argument("--setting", dest = "settings", action = "append", default = [ ], metavar = "KEY=VALUE")
+    #
+
+    @staticmethod
+    def setup(path_data = None, settings_files = None, settings = None, is_local = False):
+        """
+Reads the settings files, applies the settings given and loads the database
+classes of this package.
+
+:param path_data: PAS data path; None to use the "path_data" setting
+:param settings_files: List of settings file paths; None to read the
+                       default settings files below "[path_data]/settings"
+:param settings: List of "KEY=VALUE" strings. Values are decoded as JSON if
+                 possible.
+:param is_local: True to use an SQLite database and the file store below
+                 the data path and to create missing database tables
+
+:since: v0.2.00
+        """
+
+        if (path_data is not None): Settings.set("path_data", path_data)
+        path_data = Settings.get("path_data")
+
+        if (is_local):
+            Settings.set("pas_database_url", "sqlite:///{0}".format(os.path.join(path_data, "file_center.sqlite")))
+        #
+
+        if (settings_files is None):
+            if (path_data is not None):
+                for file_name in Environment.SETTINGS_FILE_NAMES:
+                    Settings.read_file(os.path.join(path_data, "settings", file_name))
+                #
+            #
+        else:
+            for settings_file_path in settings_files: Settings.read_file(settings_file_path, True)
+        #
+
+        for setting in ([ ] if (settings is None) else settings):
+            ( key, value ) = setting.split("=", 1)
+
+            try: value = json.loads(value)
+            except ValueError: pass
+
+            Settings.set(key, value)
+        #
+
+        from dNG.plugins.database import pas_file_center
+
+        pas_file_center.load_all(None)
+
+        if (is_local):
+            from dNG.database.connection import Connection
+            from dNG.database.instances.abstract import Abstract
+
+            connection = Connection.get_instance()
+            with connection: Abstract.metadata.create_all(connection.get_bind())
+        #
+    #
+
+    @staticmethod
+    def setup_arguments(parsed_args):
+        """
+Configures the environment based on the parsed command line arguments
+added by "add_arguments()".
+
+:param parsed_args: Parsed command line arguments
+
+:since: v0.2.00
+        """
+
+        Environment.setup(parsed_args.path_data, parsed_args.settings_files, parsed_args.settings)
+    #
+#
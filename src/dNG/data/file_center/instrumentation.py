@@ -0,0 +1,456 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from functools import wraps
+from threading import Lock, local
+from time import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from dNG.data.settings import Settings
+from dNG.plugins.hook import Hook
+
+class Instrumentation(object):
+    """
+"Instrumentation" records counts, latency histograms, database queries
+issued and bytes read or written for the operations of file center entries.
+Each operation recorded is published with the hook
+"dNG.pas.file_center.Entry.onOperation" and included in snapshots returned
+by "get_snapshot()". Instrumented methods only check a class attribute if
+disabled.
+
+The setting "pas_file_center_instrumentation_enabled" is only read once by
+the first instrumented call. Changes of the setting afterwards are ignored;
+use "set_enabled()" to enable or disable recording at runtime.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    BYTES_READ = "read"
+    """
+The integer returned or the size of each chunk yielded counts as bytes read
+    """
+    BYTES_WRITTEN = "written"
+    """
+The integer returned counts as bytes written
+    """
+    LATENCY_BUCKETS = ( 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10 )
+    """
+Upper bounds of the latency histogram buckets in seconds
+    """
+
+    _instance = None
+    """
+Instrumentation singleton instance
+    """
+    _instance_lock = Lock()
+    """
+Thread safety lock for the singleton instance and the enabled state
+    """
+    is_enabled = None
+    """
+True if operations are recorded; None until read from the settings once.
+Only changed by "set_enabled()" afterwards.
+    """
+
+    def __init__(self):
+        """
+Constructor __init__(Instrumentation)
+
+:since: v0.2.00
+        """
+
+        self.local = local()
+        """
+Thread-local stack of the operation records currently active
+        """
+        self.lock = Lock()
+        """
+Thread safety lock for the operation statistics
+        """
+        self.operations = { }
+        """
+Statistics by operation name
+        """
+        self.time_started = time()
+        """
+UNIX timestamp of the first operation included in the statistics
+        """
+    #
+
+    def _add_record(self, operation, seconds, record, is_successful):
+        """
+Adds the given operation record to the statistics and publishes it.
+
+:param operation: Operation name
+:param seconds: Number of seconds spent
+:param record: Operation record containing queries, bytes read and bytes
+               written
+:param is_successful: False if the operation raised an exception
+
+:since: v0.2.00
+        """
+
+        bucket_position = len(Instrumentation.LATENCY_BUCKETS)
+
+        for position, bucket_seconds in enumerate(Instrumentation.LATENCY_BUCKETS):
+            if (seconds <= bucket_seconds):
+                bucket_position = position
+                break
+            #
+        #
+
+        with self.lock:
+            stats = self.operations.get(operation)
+
+            if (stats is None):
+                stats = { "count": 0,
+                          "errors": 0,
+                          "seconds": 0.0,
+                          "max_seconds": 0.0,
+                          "queries": 0,
+                          "bytes_read": 0,
+                          "bytes_written": 0,
+                          "histogram": [ 0 ] * (1 + len(Instrumentation.LATENCY_BUCKETS))
+                        }
+
+                self.operations[operation] = stats
+            #
+
+            stats['count'] += 1
+            if (not is_successful): stats['errors'] += 1
+            stats['seconds'] += seconds
+            if (seconds > stats['max_seconds']): stats['max_seconds'] = seconds
+            stats['queries'] += record[0]
+            stats['bytes_read'] += record[1]
+            stats['bytes_written'] += record[2]
+            stats['histogram'][bucket_position] += 1
+        #
+
+        Hook.call("dNG.pas.file_center.Entry.onOperation",
+                  operation = operation,
+                  seconds = seconds,
+                  queries = record[0],
+                  bytes_read = record[1],
+                  bytes_written = record[2],
+                  is_successful = is_successful
+                 )
+    #
+
+    def call(self, operation, bytes_counted, callback, args, kwargs):
+        """
+Calls the given callback and records it as the given operation.
+
+:param operation: Operation name
+:param bytes_counted: "BYTES_READ", "BYTES_WRITTEN" or None
+:param callback: Python callback
+:param args: Positional arguments
+:param kwargs: Keyword arguments
+
+:return: (mixed) Callback return value
+:since:  v0.2.00
+        """
+
+        is_successful = False
+        record = [ 0, 0, 0 ]
+
+        self._push_record(record)
+        time_started = time()
+
+        try:
+            _return = callback(*args, **kwargs)
+
+            if (bytes_counted is not None and isinstance(_return, int)):
+                record[(1 if (bytes_counted == Instrumentation.BYTES_READ) else 2)] += _return
+            #
+
+            is_successful = True
+        finally:
+            seconds = time() - time_started
+            self._pop_record()
+
+            self._add_record(operation, seconds, record, is_successful)
+        #
+
+        return _return
+    #
+
+    def clear(self):
+        """
+Resets all statistics.
+
+:since: v0.2.00
+        """
+
+        with self.lock:
+            self.operations = { }
+            self.time_started = time()
+        #
+    #
+
+    def get_snapshot(self, is_reset = False):
+        """
+Returns a copy of the statistics recorded.
+
+:param is_reset: True to reset the statistics afterwards
+
+:return: (dict) Statistics containing "time_started", "time_snapshot" and
+         "operations" by name
+:since:  v0.2.00
+        """
+
+        with self.lock:
+            operations = { }
+
+            for operation in self.operations:
+                stats = self.operations[operation].copy()
+                histogram = stats.pop("histogram")
+
+                stats['mean_seconds'] = stats['seconds'] / stats['count']
+
+                stats['histogram'] = [ { "le_seconds": bucket_seconds, "count": histogram[position] }
+                                       for position, bucket_seconds in enumerate(Instrumentation.LATENCY_BUCKETS)
+                                     ]
+
+                stats['histogram'].append({ "le_seconds": None, "count": histogram[-1] })
+
+                operations[operation] = stats
+            #
+
+            _return = { "time_started": self.time_started, "time_snapshot": time(), "operations": operations }
+
+            if (is_reset):
+                self.operations = { }
+                self.time_started = _return['time_snapshot']
+            #
+        #
+
+        return _return
+    #
+
+    def iter_measured(self, operation, bytes_counted, iterator):
+        """
+Returns a generator yielding the values of the given iterator and records
+the time spent in it as the given operation once it is exhausted or closed.
+
+:param operation: Operation name
+:param bytes_counted: "BYTES_READ" or None
+:param iterator: Iterator to measure
+
+:return: (object) Generator
+:since:  v0.2.00
+        """
+
+        is_successful = False
+        record = [ 0, 0, 0 ]
+        seconds = 0.0
+
+        try:
+            while True:
+                self._push_record(record)
+                time_started = time()
+
+                try: value = next(iterator)
+                except StopIteration: break
+                finally:
+                    seconds += time() - time_started
+                    self._pop_record()
+                #
+
+                if (bytes_counted == Instrumentation.BYTES_READ): record[1] += len(value)
+
+                yield value
+            #
+
+            is_successful = True
+        except GeneratorExit:
+            is_successful = True
+            raise
+        finally: self._add_record(operation, seconds, record, is_successful)
+    #
+
+    def _on_cursor_execute(self, *args):
+        """
+Called for the SQLAlchemy event "before_cursor_execute" to count the query
+for all operations active in the current thread.
+
+:since: v0.2.00
+        """
+
+        records = getattr(self.local, "records", None)
+
+        if (records is not None):
+            for record in records: record[0] += 1
+        #
+    #
+
+    def _pop_record(self):
+        """
+Removes the last operation record from the thread-local stack.
+
+:since: v0.2.00
+        """
+
+        self.local.records.pop()
+    #
+
+    def _push_record(self, record):
+        """
+Adds the given operation record to the thread-local stack.
+
+:param record: Operation record
+
+:since: v0.2.00
+        """
+
+        records = getattr(self.local, "records", None)
+
+        if (records is None):
+            records = [ ]
+            self.local.records = records
+        #
+
+        records.append(record)
+    #
+
+    @staticmethod
+    def get_instance():
+        """
+Get the Instrumentation singleton.
+
+:return: (object) Object on success
+:since:  v0.2.00
+        """
+
+        if (Instrumentation._instance is None):
+            with Instrumentation._instance_lock:
+                # Thread safety
+                if (Instrumentation._instance is None): Instrumentation._instance = Instrumentation()
+            #
+        #
+
+        return Instrumentation._instance
+    #
+
+    @staticmethod
+    def _load_enabled_setting():
+        """
+Sets the enabled state based on the setting
+"pas_file_center_instrumentation_enabled".
+
+:return: (bool) True if enabled
+:since:  v0.2.00
+        """
+
+        Instrumentation.set_enabled(Settings.get("pas_file_center_instrumentation_enabled", False))
+        return Instrumentation.is_enabled
+    #
+
+    @staticmethod
+    def set_enabled(is_enabled):
+        """
+Enables or disables recording operations. The SQLAlchemy event listener
+counting queries is only registered while enabled. This is the only way to
+change the enabled state after the setting has been read.
+
+:param is_enabled: True to enable recording
+
+:since: v0.2.00
+        """
+
+        is_enabled = bool(is_enabled)
+        instance = Instrumentation.get_instance()
+
+        with Instrumentation._instance_lock:
+            if (is_enabled != bool(Instrumentation.is_enabled)):
+                if (is_enabled): event.listen(Engine, "before_cursor_execute", instance._on_cursor_execute)
+                elif (Instrumentation.is_enabled is not None): event.remove(Engine, "before_cursor_execute", instance._on_cursor_execute)
+            #
+
+            Instrumentation.is_enabled = is_enabled
+        #
+    #
+
+    @staticmethod
+    def wrap(operation, bytes_counted = None, is_iterator = False):
+        """
+Returns a decorator recording calls of the method decorated as the given
+operation.
+
+:param operation: Operation name
+:param bytes_counted: "BYTES_READ", "BYTES_WRITTEN" or None
+:param is_iterator: True if the method returns an iterator measured until
+                    it is exhausted or closed
+
+:return: (object) Decorator
+:since:  v0.2.00
+        """
+
+        def decorator(callback):
+            """
+Decorator for the method given.
+            """
+
+            @wraps(callback)
+            def proxymethod(*args, **kwargs):
+                """
+Proxy method recording the call if enabled.
+                """
+
+                is_enabled = Instrumentation.is_enabled
+                if (is_enabled is None): is_enabled = Instrumentation._load_enabled_setting()
+
+                if (not is_enabled): return callback(*args, **kwargs)
+
+                instance = Instrumentation.get_instance()
+
+                return (instance.iter_measured(operation, bytes_counted, iter(callback(*args, **kwargs)))
+                        if (is_iterator) else
+                        instance.call(operation, bytes_counted, callback, args, kwargs)
+                       )
+            #
+
+            return proxymethod
+        #
+
+        return decorator
+    #
+#
@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from time import sleep, time
+
+from dNG.data.settings import Settings
+from dNG.database.connection import Connection
+from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+from dNG.database.instances.file_center_upload_session import FileCenterUploadSession as _DbFileCenterUploadSession
+from dNG.database.transaction_context import TransactionContext
+from dNG.vfs.implementation import Implementation
+
+from .entry import Entry
+
+class IntegrityVerifier(object):
+    """
+"IntegrityVerifier" compares the recorded size and VFS type of all file
+center entries with their stored files. Entries are read in ID ordered
+batches and the stored files are checked on a thread pool. Mismatches are
+reported and optionally repaired. Entries with an open upload session or a
+stored file updated within the grace period are skipped as they may still
+be written to.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    ISSUE_CHECKSUM_MISMATCH = "checksum_mismatch"
+    """
+Stored file content does not match the recorded content digest
+    """
+    ISSUE_MISSING = "missing"
+    """
+Stored file is missing or can not be opened
+    """
+    ISSUE_SIZE_MISMATCH = "size_mismatch"
+    """
+Stored file size does not match the recorded size
+    """
+    ISSUE_VFS_TYPE_MISMATCH = "vfs_type_mismatch"
+    """
+Stored file type does not match the recorded VFS type
+    """
+
+    def __init__(self, is_repair = False, is_checksum_verified = False, workers = None, max_entries_per_second = None, grace_period = None):
+        """
+Constructor __init__(IntegrityVerifier)
+
+:param is_repair: True to repair size and VFS type mismatches
+:param is_checksum_verified: True to verify content digests recorded for
+                             deduplicated entries
+:param workers: Number of threads checking stored files
+:param max_entries_per_second: Maximum number of entries checked per
+                               second; None for no limit
+:param grace_period: Number of seconds a size mismatch of a stored file
+                     updated within is ignored
+
+:since: v0.2.00
+        """
+
+        self.batch_size = Entry._get_batch_size()
+        """
+Number of entries read at once
+        """
+        self.grace_period = (float(Settings.get("pas_file_center_verifier_grace_period", 3600))
+                             if (grace_period is None) else
+                             grace_period
+                            )
+        """
+Number of seconds a size mismatch of a stored file updated within is
+ignored
+        """
+        self.is_checksum_verified = is_checksum_verified
+        """
+True to verify content digests
+        """
+        self.is_repair = is_repair
+        """
+True to repair size and VFS type mismatches
+        """
+        self.issue_callback = None
+        """
+Callback called for each issue found
+        """
+        self.max_entries_per_second = (Settings.get("pas_file_center_verifier_max_entries_per_second")
+                                       if (max_entries_per_second is None) else
+                                       max_entries_per_second
+                                      )
+        """
+Maximum number of entries checked per second
+        """
+        self.progress_callback = None
+        """
+Callback called with the current statistics after each batch
+        """
+        self.stats = { }
+        """
+Statistics of the current run
+        """
+        self.workers = (int(Settings.get("pas_file_center_verifier_workers", 4)) if (workers is None) else workers)
+        """
+Number of threads checking stored files
+        """
+    #
+
+    def _check_entry(self, entry_data):
+        """
+Checks the stored file of the given entry. Called by the thread pool.
+
+:param entry_data: Tuple of entry ID, VFS URL, VFS type, size, content
+                   digest, parent ID and owner ID
+
+:return: (list) Issues found; None if skipped
+:since:  v0.2.00
+        """
+
+        _return = [ ]
+
+        ( entry_id, vfs_url, vfs_type, size, content_digest ) = entry_data[:5]
+
+        try:
+            vfs_object = Implementation.load_vfs_url(vfs_url, True)
+        except Exception: vfs_object = None
+
+        if (vfs_object is None or (not vfs_object.is_valid())):
+            _return.append({ "id": entry_id, "type": IntegrityVerifier.ISSUE_MISSING, "expected": vfs_url, "actual": None })
+        else:
+            try:
+                actual_vfs_type = (Entry.VFS_TYPE_DIRECTORY if (vfs_object.is_directory()) else Entry.VFS_TYPE_ITEM)
+
+                if (actual_vfs_type != vfs_type):
+                    _return.append({ "id": entry_id, "type": IntegrityVerifier.ISSUE_VFS_TYPE_MISMATCH, "expected": vfs_type, "actual": actual_vfs_type })
+                #
+
+                if (actual_vfs_type == Entry.VFS_TYPE_ITEM):
+                    actual_size = vfs_object.get_size()
+
+                    if (actual_size != size):
+                        # Size updates of stored files written to are
+                        # written behind.
+                        if (vfs_object.get_time_updated() > time() - self.grace_period): return None
+
+                        _return.append({ "id": entry_id, "type": IntegrityVerifier.ISSUE_SIZE_MISMATCH, "expected": size, "actual": actual_size })
+                    #
+
+                    if (self.is_checksum_verified and content_digest is not None):
+                        content_hash = sha256()
+                        data = vfs_object.read(65536)
+
+                        while (len(data) > 0):
+                            content_hash.update(data)
+                            data = vfs_object.read(65536)
+                        #
+
+                        if (content_hash.hexdigest() != content_digest):
+                            _return.append({ "id": entry_id,
+                                             "type": IntegrityVerifier.ISSUE_CHECKSUM_MISMATCH,
+                                             "expected": content_digest,
+                                             "actual": content_hash.hexdigest()
+                                           })
+                        #
+                    #
+                #
+            finally: vfs_object.close()
+        #
+
+        return _return
+    #
+
+    def get_stats(self):
+        """
+Returns the statistics of the current run.
+
+:return: (dict) Number of entries checked, issues found by type,
+         entries skipped and entries repaired
+:since:  v0.2.00
+        """
+
+        _return = self.stats.copy()
+        _return['seconds'] = time() - _return.pop("time_started", time())
+
+        return _return
+    #
+
+    def _get_upload_session_entry_ids(self, entry_ids):
+        """
+Returns the IDs of the given entries with an open upload session.
+
+:param entry_ids: List of entry IDs
+
+:return: (set) Entry IDs
+:since:  v0.2.00
+        """
+
+        connection = Connection.get_instance()
+
+        with connection:
+            return { entry_id
+                     for ( entry_id, ) in (connection.query(_DbFileCenterUploadSession.id_entry)
+                                           .filter(_DbFileCenterUploadSession.id_entry.in_(entry_ids))
+                                          )
+                   }
+        #
+    #
+
+    def _repair(self, issues, entries):
+        """
+Repairs size and VFS type mismatches of one batch. Each entry is only
+updated if its recorded value is still the one checked. The difference is
+applied to the storage used by its owner and to the tree totals of its
+parent directories.
+
+:param issues: List of issues found
+:param entries: Dictionary of entry IDs and their VFS type, size, parent
+                ID and owner ID checked
+
+:since: v0.2.00
+        """
+
+        issues = [ issue for issue in issues
+                   if (issue['type'] in ( IntegrityVerifier.ISSUE_SIZE_MISMATCH, IntegrityVerifier.ISSUE_VFS_TYPE_MISMATCH ))
+                 ]
+
+        if (len(issues) > 0):
+            connection = Connection.get_instance()
+            db_table = _DbFileCenterEntry.__table__
+
+            owner_usage = { }
+            tree_totals = { }
+
+            with connection, TransactionContext():
+                for issue in issues:
+                    entry_data = entries[issue['id']]
+
+                    if (issue['type'] == IntegrityVerifier.ISSUE_VFS_TYPE_MISMATCH):
+                        db_result = connection.execute(db_table.update()
+                                                       .where(db_table.c.id == issue['id'])
+                                                       .where(db_table.c.vfs_type == issue['expected'])
+                                                       .values(vfs_type = issue['actual'])
+                                                      )
+
+                        if (db_result.rowcount < 1): continue
+
+                        entry_data['vfs_type'] = issue['actual']
+
+                        # Only items are counted in the storage used and in
+                        # the tree totals.
+                        factor = (1 if (issue['actual'] == Entry.VFS_TYPE_ITEM) else -1)
+                        size_delta = factor * entry_data['size']
+                        items_delta = factor
+                    else:
+                        db_result = connection.execute(db_table.update()
+                                                       .where(db_table.c.id == issue['id'])
+                                                       .where(db_table.c.size == issue['expected'])
+                                                       .values(size = issue['actual'])
+                                                      )
+
+                        if (db_result.rowcount < 1): continue
+
+                        entry_data['size'] = issue['actual']
+
+                        size_delta = issue['actual'] - issue['expected']
+                        items_delta = 0
+                    #
+
+                    self.stats['repaired'] += 1
+
+                    if (entry_data['owner_id'] is not None):
+                        if (entry_data['owner_id'] not in owner_usage): owner_usage[entry_data['owner_id']] = [ 0, 0 ]
+
+                        owner_usage[entry_data['owner_id']][0] += size_delta
+                        owner_usage[entry_data['owner_id']][1] += items_delta
+                    #
+
+                    if (entry_data['parent_id'] is not None):
+                        if (entry_data['parent_id'] not in tree_totals): tree_totals[entry_data['parent_id']] = [ 0, 0 ]
+
+                        tree_totals[entry_data['parent_id']][0] += size_delta
+                        tree_totals[entry_data['parent_id']][1] += items_delta
+                    #
+                #
+
+                for owner_id in owner_usage:
+                    Entry._update_owner_usage(connection, owner_id, *owner_usage[owner_id])
+                #
+
+                if (Entry._is_tree_totals_enabled()):
+                    for parent_id in tree_totals:
+                        Entry._update_parent_tree_totals(connection, parent_id, *tree_totals[parent_id])
+                    #
+                #
+            #
+        #
+    #
+
+    def run(self):
+        """
+Checks all file center entries with a VFS URL.
+
+:return: (dict) Statistics of the run
+:since:  v0.2.00
+        """
+
+        self.stats = { "entries": 0,
+                       IntegrityVerifier.ISSUE_CHECKSUM_MISMATCH: 0,
+                       IntegrityVerifier.ISSUE_MISSING: 0,
+                       IntegrityVerifier.ISSUE_SIZE_MISMATCH: 0,
+                       IntegrityVerifier.ISSUE_VFS_TYPE_MISMATCH: 0,
+                       "skipped": 0,
+                       "repaired": 0,
+                       "time_started": time()
+                     }
+
+        connection = Connection.get_instance()
+        last_id = None
+
+        with ThreadPoolExecutor(max_workers = self.workers) as executor:
+            while True:
+                with connection:
+                    db_query = (connection.query(_DbFileCenterEntry.id,
+                                                 _DbFileCenterEntry.vfs_url,
+                                                 _DbFileCenterEntry.vfs_type,
+                                                 _DbFileCenterEntry.size,
+                                                 _DbFileCenterEntry.content_digest,
+                                                 _DbFileCenterEntry.id_parent,
+                                                 _DbFileCenterEntry.owner_id
+                                                )
+                                .filter(_DbFileCenterEntry.vfs_url != None)
+                               )
+
+                    if (last_id is not None): db_query = db_query.filter(_DbFileCenterEntry.id > last_id)
+
+                    db_rows = db_query.order_by(_DbFileCenterEntry.id.asc()).limit(self.batch_size).all()
+                #
+
+                if (len(db_rows) < 1): break
+
+                last_id = db_rows[-1][0]
+                issues = [ ]
+
+                upload_session_entry_ids = self._get_upload_session_entry_ids([ db_row[0] for db_row in db_rows ])
+                db_rows_checked = [ db_row for db_row in db_rows if (db_row[0] not in upload_session_entry_ids) ]
+
+                self.stats['skipped'] += len(db_rows) - len(db_rows_checked)
+
+                for entry_issues in executor.map(self._check_entry, db_rows_checked):
+                    if (entry_issues is None): self.stats['skipped'] += 1
+                    else: issues += entry_issues
+                #
+
+                for issue in issues:
+                    self.stats[issue['type']] += 1
+                    if (self.issue_callback is not None): self.issue_callback(issue)
+                #
+
+                if (self.is_repair):
+                    self._repair(issues,
+                                 { db_row[0]: { "vfs_type": db_row[2], "size": db_row[3], "parent_id": db_row[5], "owner_id": db_row[6] }
+                                   for db_row in db_rows_checked
+                                 }
+                                )
+                #
+
+                self.stats['entries'] += len(db_rows)
+                if (self.progress_callback is not None): self.progress_callback(self.get_stats())
+
+                self._throttle()
+            #
+        #
+
+        return self.get_stats()
+    #
+
+    def set_issue_callback(self, callback):
+        """
+Sets a callback called with each issue found.
+
+:param callback: Python callback
+
+:since: v0.2.00
+        """
+
+        self.issue_callback = callback
+    #
+
+    def set_progress_callback(self, callback):
+        """
+Sets a callback called with the current statistics after each batch.
+
+:param callback: Python callback
+
+:since: v0.2.00
+        """
+
+        self.progress_callback = callback
+    #
+
+    def _throttle(self):
+        """
+Sleeps until the number of entries checked is within the configured rate.
+
+:since: v0.2.00
+        """
+
+        if (self.max_entries_per_second):
+            delay = (self.stats['entries'] / float(self.max_entries_per_second)) - (time() - self.stats['time_started'])
+            if (delay > 0): sleep(delay)
+        #
+    #
+#
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+
+from dNG.data.settings import Settings
+
+class OwnerRootDirectoryCache(object):
+    """
+"OwnerRootDirectoryCache" is a process-local LRU cache mapping owner IDs to
+the entry ID of their root directory.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    _instance = None
+    """
+OwnerRootDirectoryCache singleton instance
+    """
+    _instance_lock = Lock()
+    """
+Thread safety lock for the singleton instance
+    """
+
+    def __init__(self):
+        """
+Constructor __init__(OwnerRootDirectoryCache)
+
+:since: v0.2.00
+        """
+
+        self.entries = OrderedDict()
+        """
+Cached entry IDs in least recently used order
+        """
+        self.entry_owner_ids = { }
+        """
+Owner IDs of cached entry IDs
+        """
+        self.evictions = 0
+        """
+Number of owner IDs evicted because of the size limit
+        """
+        self.hits = 0
+        """
+Number of cache hits
+        """
+        self.lock = Lock()
+        """
+Thread safety lock
+        """
+        self.max_size = int(Settings.get("pas_file_center_owner_root_directory_cache_size", 1024))
+        """
+Maximum number of cached owner IDs
+        """
+        self.misses = 0
+        """
+Number of cache misses
+        """
+        self.owner_locks = { }
+        """
+Locks and number of waiting callers per owner ID
+        """
+    #
+
+    def clear(self):
+        """
+Removes all cached owner IDs.
+
+:since: v0.2.00
+        """
+
+        with self.lock:
+            self.entries.clear()
+            self.entry_owner_ids.clear()
+        #
+    #
+
+    def get(self, owner_id):
+        """
+Returns the cached root directory entry ID for the given owner ID.
+
+:param owner_id: Owner ID
+
+:return: (str) Entry ID; None if not cached
+:since:  v0.2.00
+        """
+
+        with self.lock:
+            _return = self.entries.get(owner_id)
+
+            if (_return is None): self.misses += 1
+            else:
+                self.entries[owner_id] = self.entries.pop(owner_id)
+                self.hits += 1
+            #
+
+            return _return
+        #
+    #
+
+    @contextmanager
+    def get_owner_lock(self, owner_id):
+        """
+Returns a context manager serializing concurrent callers working on the root
+directory of the same owner ID.
+
+:param owner_id: Owner ID
+
+:since: v0.2.00
+        """
+
+        with self.lock:
+            if (owner_id not in self.owner_locks): self.owner_locks[owner_id] = [ Lock(), 0 ]
+
+            owner_lock_data = self.owner_locks[owner_id]
+            owner_lock_data[1] += 1
+        #
+
+        try:
+            with owner_lock_data[0]: yield
+        finally:
+            with self.lock:
+                owner_lock_data[1] -= 1
+                if (owner_lock_data[1] < 1): del(self.owner_locks[owner_id])
+            #
+        #
+    #
+
+    def get_stats(self):
+        """
+Returns the cache statistics.
+
+:return: (dict) Cache statistics
+:since:  v0.2.00
+        """
+
+        with self.lock:
+            return { "size": len(self.entries),
+                     "max_size": self.max_size,
+                     "hits": self.hits,
+                     "evictions": self.evictions,
+                     "misses": self.misses
+                   }
+        #
+    #
+
+    def invalidate(self, owner_id):
+        """
+Removes the cached root directory entry ID of the given owner ID.
+
+:param owner_id: Owner ID
+
+:since: v0.2.00
+        """
+
+        with self.lock:
+            entry_id = self.entries.pop(owner_id, None)
+            if (entry_id is not None): self.entry_owner_ids.pop(entry_id, None)
+        #
+    #
+
+    def invalidate_entry_id(self, entry_id):
+        """
+Removes the cached owner ID referencing the given root directory entry ID.
+
+:param entry_id: Entry ID
+
+:since: v0.2.00
+        """
+
+        with self.lock:
+            owner_id = self.entry_owner_ids.pop(entry_id, None)
+            if (owner_id is not None): self.entries.pop(owner_id, None)
+        #
+    #
+
+    def set(self, owner_id, entry_id):
+        """
+Caches the root directory entry ID for the given owner ID.
+
+:param owner_id: Owner ID
+:param entry_id: Entry ID
+
+:since: v0.2.00
+        """
+
+        if (self.max_size > 0):
+            with self.lock:
+                previous_entry_id = self.entries.pop(owner_id, None)
+                if (previous_entry_id is not None): self.entry_owner_ids.pop(previous_entry_id, None)
+
+                self.entries[owner_id] = entry_id
+                self.entry_owner_ids[entry_id] = owner_id
+
+                while (len(self.entries) > self.max_size):
+                    ( _, evicted_entry_id ) = self.entries.popitem(False)
+                    self.entry_owner_ids.pop(evicted_entry_id, None)
+
+                    self.evictions += 1
+                #
+            #
+        #
+    #
+
+    @staticmethod
+    def get_instance():
+        """
+Get the OwnerRootDirectoryCache singleton.
+
+:return: (object) Object on success
+:since:  v0.2.00
+        """
+
+        if (OwnerRootDirectoryCache._instance is None):
+            with OwnerRootDirectoryCache._instance_lock:
+                if (OwnerRootDirectoryCache._instance is None): OwnerRootDirectoryCache._instance = OwnerRootDirectoryCache()
+            #
+        #
+
+        return OwnerRootDirectoryCache._instance
+    #
+#
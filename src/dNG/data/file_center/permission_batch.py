@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from sqlalchemy.sql.expression import and_
+
+from dNG.data.ownable_lockable_read_mixin import OwnableLockableReadMixin
+from dNG.database.connection import Connection
+from dNG.database.instances.data_linker import DataLinker as _DbDataLinker
+from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+
+from .entry import Entry
+from .entry_view import EntryView
+
+class PermissionBatch(object):
+    """
+"PermissionBatch" evaluates the effective permissions of one user for many
+file center entries at once. ACL entries are resolved with one query per
+batch instead of one evaluation per entry. Results are cached by the
+instance, so it should only live as long as the request using it.
+
+The rules are the ones of "OwnableLockableReadMixin": Administrators and
+owners may write. Other users are granted the highest permission of the
+guest permission, the user permission for registered users and the ACL
+entries matching them. Locked entries are read-only for everyone.
+
+Inherited ACL entries and default permissions are copied to new entries
+limited by their maximum inherited permissions. The stored values are
+therefore already the inherited ones.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    PERMISSION_NONE = ""
+    """
+No permission granted
+    """
+
+    _PERMISSION_LEVELS = { "": 0, OwnableLockableReadMixin.READABLE: 1, OwnableLockableReadMixin.WRITABLE: 2 }
+    """
+Permission levels used to select the highest permission granted
+    """
+
+    def __init__(self, user_profile = None, group_ids = None):
+        """
+Constructor __init__(PermissionBatch)
+
+:param user_profile: User profile; None for guests
+:param group_ids: List of group IDs the user is a member of
+
+:since: v0.2.00
+        """
+
+        user_id = (None if (user_profile is None) else user_profile.get_id())
+
+        self.acl_owner_ids = ([ ] if (user_id is None) else [ user_id ])
+        """
+IDs matching ACL entries of the user
+        """
+        self.is_administrator = (user_profile is not None and user_profile.is_type("ad"))
+        """
+True if the user is an administrator
+        """
+        self.permissions = { }
+        """
+Cached permissions by entry ID
+        """
+        self.user_id = user_id
+        """
+User ID; None for guests
+        """
+
+        if (user_id is not None and group_ids is not None): self.acl_owner_ids += list(group_ids)
+    #
+
+    def clear(self):
+        """
+Clears all cached permissions.
+
+:since: v0.2.00
+        """
+
+        self.permissions.clear()
+    #
+
+    def _get_acl_permissions(self, connection, entry_ids):
+        """
+Returns the highest permission granted by ACL entries of the user for the
+given entry IDs.
+
+:param connection: Database connection
+:param entry_ids: List of entry IDs
+
+:return: (dict) ACL permission by entry ID; entry IDs without a matching
+         ACL entry are omitted
+:since:  v0.2.00
+        """
+
+        _return = { }
+
+        if (len(self.acl_owner_ids) > 0 and len(entry_ids) > 0):
+            ( db_acl_class, db_acl_owned_column ) = PermissionBatch._get_db_acl_data()
+            batch_size = Entry._get_batch_size()
+
+            for offset in range(0, len(entry_ids), batch_size):
+                db_query = (connection.query(db_acl_owned_column, db_acl_class.owner_permission)
+                            .filter(db_acl_owned_column.in_(entry_ids[offset:offset + batch_size]),
+                                    db_acl_class.owner_id.in_(self.acl_owner_ids)
+                                   )
+                           )
+
+                for ( entry_id, permission ) in db_query:
+                    _return[entry_id] = PermissionBatch._get_highest_permission(_return.get(entry_id), permission)
+                #
+            #
+        #
+
+        return _return
+    #
+
+    def _get_permission(self, entry_data, acl_permission):
+        """
+Returns the effective permission of the user for the given entry data.
+
+:param entry_data: Entry data dictionary
+:param acl_permission: Highest ACL permission; None if no ACL entry matched
+
+:return: (str) Effective permission
+:since:  v0.2.00
+        """
+
+        if (self.is_administrator
+            or (self.user_id is not None
+                and entry_data['owner_type'] == "u"
+                and entry_data['owner_id'] == self.user_id
+               )
+           ): _return = OwnableLockableReadMixin.WRITABLE
+        else:
+            _return = entry_data['guest_permission']
+
+            if (self.user_id is not None): _return = PermissionBatch._get_highest_permission(_return, entry_data['user_permission'])
+            _return = PermissionBatch._get_highest_permission(_return, acl_permission)
+        #
+
+        if (_return is None): _return = PermissionBatch.PERMISSION_NONE
+
+        if (entry_data['locked'] and _return == OwnableLockableReadMixin.WRITABLE):
+            _return = OwnableLockableReadMixin.READABLE
+        #
+
+        return _return
+    #
+
+    def get_permissions(self, entries):
+        """
+Returns the effective permissions of the user for the given entries.
+
+:param entries: Iterable of Entry instances, EntryView instances or entry
+                IDs
+
+:return: (dict) Effective permission by entry ID; entry IDs not matched are
+         omitted
+:since:  v0.2.00
+        """
+
+        _return = { }
+
+        entry_data_list = [ ]
+        entry_ids = [ ]
+
+        for entry in entries:
+            if (isinstance(entry, ( Entry, EntryView ))):
+                entry_id = entry.get_id()
+
+                if (entry_id in self.permissions): _return[entry_id] = self.permissions[entry_id]
+                else:
+                    entry_data_list.append(entry.get_data_attributes("id",
+                                                                     "owner_type",
+                                                                     "owner_id",
+                                                                     "guest_permission",
+                                                                     "user_permission",
+                                                                     "locked"
+                                                                    ))
+                #
+            elif (entry in self.permissions): _return[entry] = self.permissions[entry]
+            else: entry_ids.append(entry)
+        #
+
+        connection = Connection.get_instance()
+
+        with connection:
+            batch_size = Entry._get_batch_size()
+            db_columns = PermissionBatch._get_db_columns()
+
+            for offset in range(0, len(entry_ids), batch_size):
+                db_query = connection.query(*db_columns).filter(_DbFileCenterEntry.id.in_(entry_ids[offset:offset + batch_size]))
+                entry_data_list += [ PermissionBatch._get_entry_data(db_row) for db_row in db_query ]
+            #
+
+            acl_permissions = self._get_acl_permissions(connection, self._get_ids_requiring_acl(entry_data_list))
+        #
+
+        for entry_data in entry_data_list:
+            permission = self._get_permission(entry_data, acl_permissions.get(entry_data['id']))
+
+            self.permissions[entry_data['id']] = permission
+            _return[entry_data['id']] = permission
+        #
+
+        return _return
+    #
+
+    def _get_ids_requiring_acl(self, entry_data_list):
+        """
+Returns the IDs of entries the user does not own.
+
+:param entry_data_list: List of entry data dictionaries
+
+:return: (list) Entry IDs
+:since:  v0.2.00
+        """
+
+        return ([ ]
+                if (self.is_administrator or len(self.acl_owner_ids) < 1) else
+                [ entry_data['id']
+                  for entry_data in entry_data_list
+                  if (entry_data['owner_type'] != "u" or entry_data['owner_id'] != self.user_id)
+                ]
+               )
+    #
+
+    def get_sub_entry_permissions(self, parent):
+        """
+Returns the effective permissions of the user for all entries directly
+below the given parent with one database query.
+
+:param parent: Parent Entry instance
+
+:return: (dict) Effective permission by entry ID
+:since:  v0.2.00
+        """
+
+        _return = { }
+
+        entry_data_list = { }
+        acl_permissions = { }
+
+        connection = Connection.get_instance()
+
+        with connection:
+            db_columns = PermissionBatch._get_db_columns()
+
+            if (self.is_administrator or len(self.acl_owner_ids) < 1):
+                db_query = (connection.query(*db_columns)
+                            .select_from(_DbDataLinker)
+                            .join(_DbFileCenterEntry, _DbDataLinker.id == _DbFileCenterEntry.id)
+                           )
+            else:
+                ( db_acl_class, db_acl_owned_column ) = PermissionBatch._get_db_acl_data()
+
+                db_query = (connection.query(*(db_columns + [ db_acl_class.owner_permission ]))
+                            .select_from(_DbDataLinker)
+                            .join(_DbFileCenterEntry, _DbDataLinker.id == _DbFileCenterEntry.id)
+                            .outerjoin(db_acl_class,
+                                       and_(db_acl_owned_column == _DbFileCenterEntry.id,
+                                            db_acl_class.owner_id.in_(self.acl_owner_ids)
+                                           )
+                                      )
+                           )
+            #
+
+            for db_row in db_query.filter(_DbDataLinker.id_parent == parent.get_id()):
+                entry_data = PermissionBatch._get_entry_data(db_row)
+                entry_data_list[entry_data['id']] = entry_data
+
+                if (len(db_row) > len(db_columns) and db_row[-1] is not None):
+                    acl_permissions[entry_data['id']] = PermissionBatch._get_highest_permission(acl_permissions.get(entry_data['id']), db_row[-1])
+                #
+            #
+        #
+
+        for entry_id in entry_data_list:
+            permission = self._get_permission(entry_data_list[entry_id], acl_permissions.get(entry_id))
+
+            self.permissions[entry_id] = permission
+            _return[entry_id] = permission
+        #
+
+        return _return
+    #
+
+    def is_readable(self, entry):
+        """
+Returns true if the given entry is readable for the user.
+
+:param entry: Entry instance, EntryView instance or entry ID
+
+:return: (bool) True if readable
+:since:  v0.2.00
+        """
+
+        return self._is_permission_granted(entry, OwnableLockableReadMixin.READABLE)
+    #
+
+    def _is_permission_granted(self, entry, permission):
+        """
+Returns true if the given permission is granted for the given entry.
+
+:param entry: Entry instance, EntryView instance or entry ID
+:param permission: Permission to check
+
+:return: (bool) True if granted
+:since:  v0.2.00
+        """
+
+        entry_id = (entry.get_id() if (isinstance(entry, ( Entry, EntryView ))) else entry)
+        permissions = self.get_permissions([ entry ])
+
+        return (entry_id in permissions
+                and PermissionBatch._PERMISSION_LEVELS.get(permissions[entry_id], 0) >= PermissionBatch._PERMISSION_LEVELS[permission]
+               )
+    #
+
+    def is_writable(self, entry):
+        """
+Returns true if the given entry is writable for the user.
+
+:param entry: Entry instance, EntryView instance or entry ID
+
+:return: (bool) True if writable
+:since:  v0.2.00
+        """
+
+        return self._is_permission_granted(entry, OwnableLockableReadMixin.WRITABLE)
+    #
+
+    @staticmethod
+    def _get_db_acl_data():
+        """
+Returns the SQLAlchemy ACL entry class and the column referencing the
+entry owning it.
+
+:return: (tuple) SQLAlchemy class and column
+:since:  v0.2.00
+        """
+
+        db_relationship_property = _DbFileCenterEntry.rel_acl.property
+        ( _, db_acl_owned_column ) = db_relationship_property.local_remote_pairs[0]
+
+        return ( db_relationship_property.mapper.class_, db_acl_owned_column )
+    #
+
+    @staticmethod
+    def _get_db_columns():
+        """
+Returns the SQLAlchemy columns selected to evaluate permissions.
+
+:return: (list) SQLAlchemy columns
+:since:  v0.2.00
+        """
+
+        return [ _DbFileCenterEntry.id,
+                 _DbFileCenterEntry.owner_type,
+                 _DbFileCenterEntry.owner_id,
+                 _DbFileCenterEntry.guest_permission,
+                 _DbFileCenterEntry.user_permission,
+                 _DbFileCenterEntry.locked
+               ]
+    #
+
+    @staticmethod
+    def _get_entry_data(db_row):
+        """
+Returns the entry data dictionary for the given database row.
+
+:param db_row: Database row of the columns returned by "_get_db_columns()"
+
+:return: (dict) Entry data
+:since:  v0.2.00
+        """
+
+        return { "id": db_row[0],
+                 "owner_type": db_row[1],
+                 "owner_id": db_row[2],
+                 "guest_permission": db_row[3],
+                 "user_permission": db_row[4],
+                 "locked": db_row[5]
+               }
+    #
+
+    @staticmethod
+    def _get_highest_permission(permission, other_permission):
+        """
+Returns the higher one of the given permissions.
+
+:param permission: Permission; None if not defined
+:param other_permission: Permission; None if not defined
+
+:return: (str) Higher permission; None if both are not defined
+:since:  v0.2.00
+        """
+
+        return (other_permission
+                if (permission is None
+                    or PermissionBatch._PERMISSION_LEVELS.get(other_permission, 0) > PermissionBatch._PERMISSION_LEVELS.get(permission, 0)
+                   ) else
+                permission
+               )
+    #
+#
@@ -0,0 +1,561 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from hashlib import sha256
+from threading import Lock
+from time import sleep, time
+import codecs
+import mimetypes
+
+from sqlalchemy.sql.expression import or_, select
+
+from dNG.data.settings import Settings
+from dNG.database.connection import Connection
+from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+from dNG.database.instances.file_center_processing_job import FileCenterProcessingJob as _DbFileCenterProcessingJob
+from dNG.database.transaction_context import TransactionContext
+from dNG.runtime.value_exception import ValueException
+
+from .entry import Entry
+
+class ProcessingQueue(object):
+    """
+"ProcessingQueue" runs the post-ingest processing queued in the database
+for new stored files. Jobs are claimed with a lease, processed by a bounded
+thread pool and retried with an exponential backoff. Each job runs a list of
+named processing stages. Stages are registered with "register_stage()";
+"checksum" and "mimetype" are built in.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    _MIME_SIGNATURES = ( ( 0, b"\x89PNG\r\n\x1a\n", "image/png" ),
+                         ( 0, b"\xff\xd8\xff", "image/jpeg" ),
+                         ( 0, b"GIF87a", "image/gif" ),
+                         ( 0, b"GIF89a", "image/gif" ),
+                         ( 0, b"%PDF-", "application/pdf" ),
+                         ( 0, b"PK\x03\x04", "application/zip" ),
+                         ( 0, b"\x1f\x8b", "application/gzip" ),
+                         ( 0, b"BZh", "application/x-bzip2" ),
+                         ( 0, b"\xfd7zXZ\x00", "application/x-xz" ),
+                         ( 0, b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed" ),
+                         ( 0, b"OggS", "audio/ogg" ),
+                         ( 0, b"fLaC", "audio/flac" ),
+                         ( 0, b"ID3", "audio/mpeg" ),
+                         ( 4, b"ftyp", "video/mp4" ),
+                         ( 8, b"WEBP", "image/webp" ),
+                         ( 8, b"WAVE", "audio/x-wav" ),
+                         ( 8, b"AVI ", "video/x-msvideo" ),
+                         ( 257, b"ustar", "application/x-tar" ),
+                         ( 0, b"<?xml", "application/xml" )
+                       )
+    """
+Offsets, leading bytes and MIME types recognized
+    """
+
+    _stages = { }
+    """
+Processing stage callbacks registered by name
+    """
+    _stages_lock = Lock()
+    """
+Thread safety lock for the processing stages registered
+    """
+
+    def __init__(self, workers = None, max_attempts = None):
+        """
+Constructor __init__(ProcessingQueue)
+
+:param workers: Number of threads processing jobs
+:param max_attempts: Number of attempts before a job fails permanently
+
+:since: v0.2.00
+        """
+
+        self.lease_time = int(Settings.get("pas_file_center_processing_lease_time", 3600))
+        """
+Number of seconds after which a claimed job is claimable again
+        """
+        self.max_attempts = (int(Settings.get("pas_file_center_processing_max_attempts", 3)) if (max_attempts is None) else max_attempts)
+        """
+Number of attempts before a job fails permanently
+        """
+        self.progress_callback = None
+        """
+Callback called with the current statistics after each job
+        """
+        self.retry_delay = int(Settings.get("pas_file_center_processing_retry_delay", 60))
+        """
+Number of seconds to wait before the first retry; doubled for each retry
+        """
+        self.stats = { }
+        """
+Statistics of the current run
+        """
+        self.workers = (int(Settings.get("pas_file_center_processing_workers", 4)) if (workers is None) else workers)
+        """
+Number of threads processing jobs
+        """
+    #
+
+    def _claim_jobs(self, limit):
+        """
+Claims up to the given number of jobs due.
+
+:param limit: Maximum number of jobs to claim
+
+:return: (list) Jobs claimed
+:since:  v0.2.00
+        """
+
+        _return = [ ]
+
+        connection = Connection.get_instance()
+        timestamp = int(time())
+
+        with connection, TransactionContext():
+            db_claimable_condition = or_(_DbFileCenterProcessingJob.time_claimed == None,
+                                         _DbFileCenterProcessingJob.time_claimed < timestamp - self.lease_time
+                                        )
+
+            db_rows = (connection.query(_DbFileCenterProcessingJob.id_entry,
+                                        _DbFileCenterProcessingJob.revision,
+                                        _DbFileCenterProcessingJob.stages,
+                                        _DbFileCenterProcessingJob.attempts
+                                       )
+                       .filter(_DbFileCenterProcessingJob.time_scheduled <= timestamp, db_claimable_condition)
+                       .order_by(_DbFileCenterProcessingJob.time_scheduled.asc())
+                       .limit(limit)
+                       .all()
+                      )
+
+            for db_row in db_rows:
+                # Claims are only successful if the job has not been claimed
+                # or queued again in the meantime.
+                rowcount = (connection.query(_DbFileCenterProcessingJob)
+                            .filter(_DbFileCenterProcessingJob.id_entry == db_row[0],
+                                    _DbFileCenterProcessingJob.revision == db_row[1],
+                                    db_claimable_condition
+                                   )
+                            .update({ _DbFileCenterProcessingJob.time_claimed: timestamp }, synchronize_session = False)
+                           )
+
+                if (rowcount > 0):
+                    _return.append({ "id_entry": db_row[0], "revision": db_row[1], "stages": db_row[2], "attempts": db_row[3] })
+                #
+            #
+        #
+
+        return _return
+    #
+
+    def _complete_job(self, job, entry):
+        """
+Deletes the given job and marks the entry as processed.
+
+:param job: Job claimed
+:param entry: Entry instance
+
+:return: (str) Processing state
+:since:  v0.2.00
+        """
+
+        with entry, TransactionContext():
+            rowcount = (entry.local.connection.query(_DbFileCenterProcessingJob)
+                        .filter(_DbFileCenterProcessingJob.id_entry == job['id_entry'],
+                                _DbFileCenterProcessingJob.revision == job['revision']
+                               )
+                        .delete(synchronize_session = False)
+                       )
+
+            # The entry has been queued again if the job revision changed.
+            if (rowcount > 0):
+                entry.set_data_attributes(processing_state = Entry.PROCESSING_STATE_DONE)
+                entry.save()
+            #
+        #
+
+        return Entry.PROCESSING_STATE_DONE
+    #
+
+    def _fail_job(self, job, entry, stages, handled_exception):
+        """
+Schedules a retry of the given job for the stages not completed or marks it
+as failed permanently.
+
+:param job: Job claimed
+:param entry: Entry instance
+:param stages: List of processing stage names not completed
+:param handled_exception: Exception raised by the failed stage
+
+:return: (str) Processing state
+:since:  v0.2.00
+        """
+
+        attempts = 1 + job['attempts']
+        _return = (Entry.PROCESSING_STATE_FAILED if (attempts >= self.max_attempts) else Entry.PROCESSING_STATE_QUEUED)
+
+        with entry, TransactionContext():
+            rowcount = (entry.local.connection.query(_DbFileCenterProcessingJob)
+                        .filter(_DbFileCenterProcessingJob.id_entry == job['id_entry'],
+                                _DbFileCenterProcessingJob.revision == job['revision']
+                               )
+                        .update({ _DbFileCenterProcessingJob.attempts: attempts,
+                                  _DbFileCenterProcessingJob.error: "{0}: {1}".format(type(handled_exception).__name__, handled_exception),
+                                  _DbFileCenterProcessingJob.stages: ",".join(stages),
+                                  _DbFileCenterProcessingJob.time_claimed: None,
+                                  _DbFileCenterProcessingJob.time_scheduled: (None
+                                                                              if (_return == Entry.PROCESSING_STATE_FAILED) else
+                                                                              int(time()) + self.retry_delay * 2 ** (attempts - 1)
+                                                                             )
+                                },
+                                synchronize_session = False
+                               )
+                       )
+
+            if (rowcount > 0):
+                entry.set_data_attributes(processing_state = _return)
+                entry.save()
+            #
+        #
+
+        return _return
+    #
+
+    def get_stats(self):
+        """
+Returns the statistics of the current run.
+
+:return: (dict) Number of jobs claimed, completed, retried, failed and
+         skipped
+:since:  v0.2.00
+        """
+
+        _return = self.stats.copy()
+        _return['seconds'] = time() - _return.pop("time_started", time())
+
+        return _return
+    #
+
+    def _process_job(self, job):
+        """
+Runs all processing stages of the given job. Called by the thread pool.
+
+:param job: Job claimed
+
+:return: (str) Processing state; None if the entry has been deleted
+:since:  v0.2.00
+        """
+
+        entries = Entry.load_ids([ job['id_entry'] ])
+
+        if (job['id_entry'] not in entries):
+            connection = Connection.get_instance()
+
+            with connection, TransactionContext():
+                (connection.query(_DbFileCenterProcessingJob)
+                 .filter(_DbFileCenterProcessingJob.id_entry == job['id_entry'],
+                         _DbFileCenterProcessingJob.revision == job['revision']
+                        )
+                 .delete(synchronize_session = False)
+                )
+            #
+
+            return None
+        #
+
+        entry = entries[job['id_entry']]
+
+        stages = (Settings.get("pas_file_center_processing_stages", [ "checksum", "mimetype" ])
+                  if (job['stages'] is None) else
+                  job['stages'].split(",")
+                 )
+
+        with entry, TransactionContext():
+            entry.set_data_attributes(processing_state = Entry.PROCESSING_STATE_PROCESSING)
+            entry.save()
+        #
+
+        position = 0
+
+        try:
+            for position, stage in enumerate(stages): ProcessingQueue._get_stage(stage)(entry)
+        except Exception as handled_exception: return self._fail_job(job, entry, stages[position:], handled_exception)
+        finally: entry.close()
+
+        return self._complete_job(job, entry)
+    #
+
+    def run(self, max_jobs = None):
+        """
+Processes all jobs due until none is left.
+
+:param max_jobs: Maximum number of jobs to process; None for no limit
+
+:return: (dict) Statistics of the run
+:since:  v0.2.00
+        """
+
+        self.stats = { "jobs": 0,
+                       Entry.PROCESSING_STATE_DONE: 0,
+                       Entry.PROCESSING_STATE_FAILED: 0,
+                       Entry.PROCESSING_STATE_QUEUED: 0,
+                       "skipped": 0,
+                       "time_started": time()
+                     }
+
+        jobs_claimed = 0
+
+        with ThreadPoolExecutor(max_workers = self.workers) as executor:
+            futures = set()
+
+            while True:
+                claim_limit = 2 * self.workers - len(futures)
+                if (max_jobs is not None): claim_limit = min(claim_limit, max_jobs - jobs_claimed)
+
+                jobs = (self._claim_jobs(claim_limit) if (claim_limit > 0) else [ ])
+                jobs_claimed += len(jobs)
+
+                for job in jobs: futures.add(executor.submit(self._process_job, job))
+
+                if (len(futures) < 1): break
+
+                ( futures_done, futures ) = wait(futures, return_when = FIRST_COMPLETED)
+
+                for future in futures_done:
+                    state = future.result()
+
+                    self.stats['jobs'] += 1
+                    self.stats[("skipped" if (state is None) else state)] += 1
+
+                    if (self.progress_callback is not None): self.progress_callback(self.get_stats())
+                #
+            #
+        #
+
+        return self.get_stats()
+    #
+
+    def set_progress_callback(self, callback):
+        """
+Sets a callback called with the current statistics after each job.
+
+:param callback: Python callback
+
+:since: v0.2.00
+        """
+
+        self.progress_callback = callback
+    #
+
+    @staticmethod
+    def _get_sniffed_mimetype(data, title):
+        """
+Returns the MIME type detected for the given leading bytes of a stored
+file. The entry title is used if the data is not recognized.
+
+:param data: Leading bytes of the stored file
+:param title: Entry title
+
+:return: (str) MIME type
+:since:  v0.2.00
+        """
+
+        for ( offset, signature, mimetype ) in ProcessingQueue._MIME_SIGNATURES:
+            if (data[offset:offset + len(signature)] == signature): return mimetype
+        #
+
+        ( _return, _ ) = mimetypes.guess_type(title or "")
+
+        if (_return is None and len(data) > 0 and b"\x00" not in data):
+            # The data may end within a multi-byte sequence.
+            try:
+                codecs.getincrementaldecoder("utf-8")().decode(data, False)
+                _return = "text/plain"
+            except UnicodeDecodeError: pass
+        #
+
+        return ("application/octet-stream" if (_return is None) else _return)
+    #
+
+    @staticmethod
+    def _get_stage(name):
+        """
+Returns the callback of the given processing stage.
+
+:param name: Processing stage name
+
+:return: (object) Python callback
+:since:  v0.2.00
+        """
+
+        with ProcessingQueue._stages_lock: _return = ProcessingQueue._stages.get(name)
+
+        if (_return is None):
+            _return = { "checksum": ProcessingQueue._process_checksum,
+                        "mimetype": ProcessingQueue._process_mimetype
+                      }.get(name)
+        #
+
+        if (_return is None): raise ValueException("Processing stage '{0}' is not registered".format(name))
+
+        return _return
+    #
+
+    @staticmethod
+    def _process_checksum(entry):
+        """
+Processing stage "checksum" recording the SHA-256 content digest. Stored
+files are deduplicated if enabled.
+
+:param entry: Entry instance
+
+:since: v0.2.00
+        """
+
+        if (entry.get_content_digest() is None):
+            if (Entry._is_deduplication_enabled()): entry.deduplicate()
+            else:
+                content_hash = sha256()
+                for data in entry.iter_range(): content_hash.update(data)
+
+                entry.close()
+
+                with entry, TransactionContext():
+                    entry.set_data_attributes(content_digest = content_hash.hexdigest())
+                    entry.save()
+                #
+            #
+        #
+    #
+
+    @staticmethod
+    def _process_mimetype(entry):
+        """
+Processing stage "mimetype" detecting the MIME type of entries saved
+without a specific one.
+
+:param entry: Entry instance
+
+:since: v0.2.00
+        """
+
+        entry_data = entry.get_data_attributes("title", "mimetype")
+
+        if (entry_data['mimetype'] in ( None, "application/octet-stream" )):
+            data = b""
+
+            for chunk in entry.iter_range(0, 512):
+                data += chunk
+                if (len(data) >= 512): break
+            #
+
+            entry.close()
+
+            mimetype = ProcessingQueue._get_sniffed_mimetype(data, entry_data['title'])
+
+            if (mimetype != entry_data['mimetype']):
+                with entry, TransactionContext():
+                    entry.set_data_attributes(mimeclass = mimetype.split("/", 1)[0], mimetype = mimetype)
+                    entry.save()
+                #
+            #
+        #
+    #
+
+    @staticmethod
+    def register_stage(name, callback):
+        """
+Registers a processing stage, e.g. for preview generation. The callback is
+called with the Entry instance and should raise an exception to retry the
+job later. Built-in stages may be replaced.
+
+:param name: Processing stage name
+:param callback: Python callback
+
+:since: v0.2.00
+        """
+
+        with ProcessingQueue._stages_lock: ProcessingQueue._stages[name] = callback
+    #
+
+    @staticmethod
+    def retry_failed():
+        """
+Queues all jobs failed permanently again.
+
+:return: (int) Number of jobs queued
+:since:  v0.2.00
+        """
+
+        connection = Connection.get_instance()
+
+        with connection, TransactionContext():
+            db_job_table = _DbFileCenterProcessingJob.__table__
+            db_entry_table = _DbFileCenterEntry.__table__
+
+            db_failed_entry_ids = select([ db_job_table.c.id_entry ]).where(db_job_table.c.time_scheduled == None)
+
+            connection.execute(db_entry_table.update()
+                               .where(db_entry_table.c.id.in_(db_failed_entry_ids))
+                               .values(processing_state = Entry.PROCESSING_STATE_QUEUED)
+                              )
+
+            return connection.execute(db_job_table.update()
+                                      .where(db_job_table.c.time_scheduled == None)
+                                      .values(attempts = 0, time_claimed = None, time_scheduled = int(time()))
+                                     ).rowcount
+        #
+    #
+
+    @staticmethod
+    def unregister_stage(name):
+        """
+Unregisters a processing stage.
+
+:param name: Processing stage name
+
+:since: v0.2.00
+        """
+
+        with ProcessingQueue._stages_lock: ProcessingQueue._stages.pop(name, None)
+    #
+#
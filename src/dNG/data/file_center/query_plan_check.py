@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+import re
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+from dNG.runtime.value_exception import ValueException
+
+from .entry import Entry
+
+class QueryPlanCheck(object):
+    """
+"QueryPlanCheck" verifies with SQLite that the queries of the owner root
+directory lookup and of directory listings are supported by indices.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    RE_FULL_SCAN = re.compile("^SCAN (TABLE )?(\\w+)(?! USING (COVERING )?INDEX)", re.I)
+    """
+RegEx matching SQLite query plan lines of full table scans
+    """
+    RE_FULL_SORT = re.compile("^USE TEMP B-TREE FOR ", re.I)
+    """
+RegEx matching SQLite query plan lines of full or partial sorts not
+supported by an index
+    """
+
+    def __init__(self, db_engine = None):
+        """
+Constructor __init__(QueryPlanCheck)
+
+:param db_engine: SQLite SQLAlchemy engine; an in-memory database is created
+                  if not given
+
+:since: v0.2.00
+        """
+
+        if (db_engine is None):
+            db_engine = create_engine("sqlite://")
+            _DbFileCenterEntry.metadata.create_all(db_engine)
+        #
+
+        if (db_engine.dialect.name != "sqlite"): raise ValueException("Query plans can only be checked with SQLite")
+
+        self.db_engine = db_engine
+        """
+SQLite SQLAlchemy engine
+        """
+        self.db_session = sessionmaker(bind = db_engine)()
+        """
+SQLAlchemy session used to build queries
+        """
+    #
+
+    def _get_query_plan(self, db_query):
+        """
+Returns the SQLite query plan for the given SQLAlchemy query.
+
+:param db_query: SQLAlchemy query
+
+:return: (list) Query plan lines
+:since:  v0.2.00
+        """
+
+        db_statement = db_query.statement.compile(dialect = self.db_engine.dialect)
+        db_parameters = tuple(db_statement.params[key] for key in db_statement.positiontup)
+
+        return [ db_row[-1] for db_row in self.db_engine.execute("EXPLAIN QUERY PLAN {0}".format(db_statement), db_parameters) ]
+    #
+
+    def get_content_list_page_query(self):
+        """
+Returns the query used to list the entries of a directory after the keyset
+pagination cursor of the last entry already listed.
+
+:return: (object) SQLAlchemy query
+:since:  v0.2.00
+        """
+
+        cursor = [ 0, Entry.VFS_TYPE_ITEM, "", 0, "0" * 32 ]
+
+        return (self.get_content_list_query()
+                .filter(Entry._get_content_list_cursor_condition(cursor, Entry.VFS_TYPE_ITEM))
+               )
+    #
+
+    def get_content_list_query(self):
+        """
+Returns the query used to list the entries of a directory with the default
+sort definition.
+
+:return: (object) SQLAlchemy query
+:since:  v0.2.00
+        """
+
+        return Entry._apply_content_list_db_query(self.db_session.query(_DbFileCenterEntry), "0" * 32, Entry.VFS_TYPE_ITEM)
+    #
+
+    def get_owner_root_directory_query(self):
+        """
+Returns the query used to look up the root directory of an owner.
+
+:return: (object) SQLAlchemy query
+:since:  v0.2.00
+        """
+
+        return (self.db_session.query(_DbFileCenterEntry)
+                .filter(_DbFileCenterEntry.vfs_type == Entry.VFS_TYPE_DIRECTORY,
+                        _DbFileCenterEntry.role_id == "owner_root",
+                        _DbFileCenterEntry.owner_type == "u",
+                        _DbFileCenterEntry.owner_id == "0" * 32
+                       )
+               )
+    #
+
+    def run(self):
+        """
+Checks the query plans of all supported access paths.
+
+:return: (dict) Query plan lines by access path name
+:since:  v0.2.00
+        """
+
+        _return = { "content_list": self._get_query_plan(self.get_content_list_query()),
+                    "content_list_page": self._get_query_plan(self.get_content_list_page_query()),
+                    "owner_root_directory": self._get_query_plan(self.get_owner_root_directory_query())
+                  }
+
+        for access_path in _return:
+            for query_plan_line in _return[access_path]:
+                if (QueryPlanCheck.RE_FULL_SCAN.match(query_plan_line) is not None
+                    or QueryPlanCheck.RE_FULL_SORT.match(query_plan_line) is not None
+                   ): raise ValueException("Query plan of '{0}' is not supported by an index: {1}".format(access_path, query_plan_line))
+            #
+        #
+
+        return _return
+    #
+#
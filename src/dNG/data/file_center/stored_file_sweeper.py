@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from time import time
+from urllib.parse import unquote, urlsplit
+import os
+import sqlite3
+
+from dNG.data.settings import Settings
+from dNG.database.connection import Connection
+from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+from dNG.database.instances.file_center_stored_object import FileCenterStoredObject as _DbFileCenterStoredObject
+from dNG.runtime.operation_not_supported_exception import OperationNotSupportedException
+from dNG.runtime.value_exception import ValueException
+from dNG.vfs.implementation import Implementation
+
+from .entry import Entry
+
+class StoredFileSweeper(object):
+    """
+"StoredFileSweeper" deletes stored files no longer referenced by any file
+center entry. All stored files and all referenced VFS URLs are streamed
+into an on-disk SQLite database first, so memory used does not grow with
+the size of the store. VFS URLs are compared in a normalized form. Stored
+files updated within the grace period are kept to protect uploads in
+progress. Nothing is deleted if no stored file is referenced or if the
+ratio of orphaned stored files exceeds the configured limit.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    def __init__(self, grace_period = None, workers = None, is_dry_run = False, max_orphan_ratio = None):
+        """
+Constructor __init__(StoredFileSweeper)
+
+:param grace_period: Number of seconds a stored file is kept after it has
+                     been updated
+:param workers: Number of threads deleting stored files
+:param is_dry_run: True to only report stored files to be deleted
+:param max_orphan_ratio: Maximum ratio of orphaned stored files to delete
+                         them; 1 to delete all orphaned stored files even
+                         if no stored file is referenced
+
+:since: v0.2.00
+        """
+
+        self.batch_size = Entry._get_batch_size()
+        """
+Number of rows processed at once
+        """
+        self.grace_period = (float(Settings.get("pas_file_center_sweeper_grace_period", 86400))
+                             if (grace_period is None) else
+                             grace_period
+                            )
+        """
+Number of seconds a stored file is kept after it has been updated
+        """
+        self.is_dry_run = is_dry_run
+        """
+True to only report stored files to be deleted
+        """
+        self.max_orphan_ratio = (float(Settings.get("pas_file_center_sweeper_max_orphan_ratio", 0.25))
+                                 if (max_orphan_ratio is None) else
+                                 max_orphan_ratio
+                                )
+        """
+Maximum ratio of orphaned stored files to delete them
+        """
+        self.progress_callback = None
+        """
+Callback called with the phase and current statistics
+        """
+        self.stats = { }
+        """
+Statistics of the current run
+        """
+        self.workers = (int(Settings.get("pas_file_center_sweeper_workers", 4)) if (workers is None) else workers)
+        """
+Number of threads deleting stored files
+        """
+    #
+
+    def _add_referenced_vfs_url_hashes(self, sweeper_db):
+        """
+Streams the hashes of the normalized VFS URLs referenced by file center
+entries and shared stored files into the sweeper database.
+
+:param sweeper_db: SQLite database connection
+
+:since: v0.2.00
+        """
+
+        connection = Connection.get_instance()
+
+        for ( db_key_column, db_url_column ) in ( ( _DbFileCenterEntry.id, _DbFileCenterEntry.vfs_url ),
+                                                 ( _DbFileCenterStoredObject.vfs_url_hash, _DbFileCenterStoredObject.vfs_url )
+                                               ):
+            last_key = None
+
+            while True:
+                with connection:
+                    db_query = connection.query(db_key_column, db_url_column).filter(db_url_column != None)
+                    if (last_key is not None): db_query = db_query.filter(db_key_column > last_key)
+
+                    db_rows = db_query.order_by(db_key_column.asc()).limit(self.batch_size).all()
+                #
+
+                if (len(db_rows) < 1): break
+
+                sweeper_db.executemany("INSERT OR IGNORE INTO referenced (vfs_url_hash) VALUES (?)",
+                                       [ ( StoredFileSweeper._get_normalized_vfs_url_hash(vfs_url), ) for ( _, vfs_url ) in db_rows ]
+                                      )
+
+                last_key = db_rows[-1][0]
+
+                self.stats['referenced'] += len(db_rows)
+                self._call_progress_callback("referenced")
+            #
+        #
+
+        sweeper_db.commit()
+    #
+
+    def _add_stored_vfs_urls(self, sweeper_db):
+        """
+Streams all stored files into the sweeper database.
+
+:param sweeper_db: SQLite database connection
+
+:since: v0.2.00
+        """
+
+        db_values_list = [ ]
+        vfs_object = Implementation.load_vfs_url("x-file-store:///", True)
+
+        try:
+            for ( vfs_url, size, time_updated ) in self._iter_stored_files(vfs_object):
+                db_values_list.append(( StoredFileSweeper._get_normalized_vfs_url_hash(vfs_url), vfs_url, size, time_updated ))
+
+                if (len(db_values_list) >= self.batch_size):
+                    self._insert_stored_vfs_urls(sweeper_db, db_values_list)
+                    db_values_list = [ ]
+                #
+            #
+
+            self._insert_stored_vfs_urls(sweeper_db, db_values_list)
+        finally: vfs_object.close()
+
+        sweeper_db.commit()
+    #
+
+    def _call_progress_callback(self, phase):
+        """
+Calls the progress callback if defined.
+
+:param phase: Phase of the run
+
+:since: v0.2.00
+        """
+
+        if (self.progress_callback is not None): self.progress_callback(phase, self.get_stats())
+    #
+
+    def _check_orphan_ratio(self, sweeper_db):
+        """
+Refuses to delete stored files if none of them is referenced or if the
+ratio of orphaned stored files exceeds the configured limit. Both indicate
+VFS URLs not matching each other instead of orphaned stored files.
+
+:param sweeper_db: SQLite database connection
+
+:since: v0.2.00
+        """
+
+        ( stored_count, ) = sweeper_db.execute("SELECT COUNT(*) FROM stored").fetchone()
+
+        ( self.stats['matched'], ) = sweeper_db.execute("""
+SELECT COUNT(*) FROM stored
+INNER JOIN referenced ON referenced.vfs_url_hash = stored.vfs_url_hash
+        """).fetchone()
+
+        ( orphaned_count, ) = sweeper_db.execute("""
+SELECT COUNT(*) FROM stored
+LEFT JOIN referenced ON referenced.vfs_url_hash = stored.vfs_url_hash
+WHERE referenced.vfs_url_hash IS NULL AND stored.time_updated < ?
+        """, ( time() - self.grace_period, )).fetchone()
+
+        if (stored_count > 0 and self.max_orphan_ratio < 1 and (not self.is_dry_run)):
+            if (self.stats['matched'] < 1):
+                raise ValueException("None of the {0:d} stored files is referenced; refusing to delete them".format(stored_count))
+            #
+
+            if (orphaned_count > stored_count * self.max_orphan_ratio):
+                raise ValueException("{0:d} of {1:d} stored files are not referenced; refusing to delete more than {2:.0%}".format(orphaned_count,
+                                                                                                                              stored_count,
+                                                                                                                              self.max_orphan_ratio
+                                                                                                                             ))
+            #
+        #
+    #
+
+    def _delete_orphaned_vfs_urls(self, sweeper_db):
+        """
+Deletes all stored files not referenced and not updated within the grace
+period in parallel.
+
+:param sweeper_db: SQLite database connection
+
+:since: v0.2.00
+        """
+
+        self._check_orphan_ratio(sweeper_db)
+
+        db_cursor = sweeper_db.execute("""
+SELECT stored.vfs_url_hash, stored.vfs_url, stored.size FROM stored
+LEFT JOIN referenced ON referenced.vfs_url_hash = stored.vfs_url_hash
+WHERE referenced.vfs_url_hash IS NULL AND stored.time_updated < ?
+ORDER BY stored.vfs_url_hash
+        """, ( time() - self.grace_period, ))
+
+        with ThreadPoolExecutor(max_workers = self.workers) as executor:
+            while True:
+                db_rows = db_cursor.fetchmany(self.batch_size)
+                if (len(db_rows) < 1): break
+
+                db_rows = self._get_unreferenced_rows(db_rows)
+
+                self.stats['orphaned'] += len(db_rows)
+                self.stats['orphaned_size'] += sum(size for ( _, _, size ) in db_rows)
+
+                if (not self.is_dry_run):
+                    self.stats['deleted'] += sum(1
+                                                 for is_deleted in executor.map(Entry.delete_vfs_url, [ vfs_url for ( _, vfs_url, _ ) in db_rows ])
+                                                 if (is_deleted)
+                                                )
+                #
+
+                self._call_progress_callback("orphaned")
+            #
+        #
+    #
+
+    def get_stats(self):
+        """
+Returns the statistics of the current run.
+
+:return: (dict) Number of stored files, references, stored files referenced,
+         orphaned stored files
+         and their size as well as the number of stored files deleted
+:since:  v0.2.00
+        """
+
+        _return = self.stats.copy()
+        _return['seconds'] = time() - _return.pop("time_started", time())
+
+        return _return
+    #
+
+    def _get_unreferenced_rows(self, db_rows):
+        """
+Checks the given orphan candidates again to exclude stored files referenced
+since the references have been streamed.
+
+:param db_rows: List of VFS URL hash, VFS URL and size tuples
+
+:return: (list) Tuples of stored files still not referenced
+:since:  v0.2.00
+        """
+
+        vfs_url_hashes = { }
+
+        for ( _, vfs_url, _ ) in db_rows:
+            # References are stored with the hash of the VFS URL as given.
+            # The URL scanned and its normalized form are both checked.
+            vfs_url_hashes[Entry.get_vfs_url_hash(vfs_url)] = vfs_url
+            vfs_url_hashes[Entry.get_vfs_url_hash(StoredFileSweeper._get_normalized_vfs_url(vfs_url))] = vfs_url
+        #
+
+        vfs_urls_referenced = set()
+
+        connection = Connection.get_instance()
+
+        with connection:
+            for db_column in ( _DbFileCenterEntry.vfs_url_hash, _DbFileCenterStoredObject.vfs_url_hash ):
+                vfs_urls_referenced.update(vfs_url_hashes[vfs_url_hash]
+                                           for ( vfs_url_hash, ) in connection.query(db_column).filter(db_column.in_(list(vfs_url_hashes)))
+                                          )
+            #
+        #
+
+        return [ db_row for db_row in db_rows if (db_row[1] not in vfs_urls_referenced) ]
+    #
+
+    def _insert_stored_vfs_urls(self, sweeper_db, db_values_list):
+        """
+Inserts the given stored files into the sweeper database.
+
+:param sweeper_db: SQLite database connection
+:param db_values_list: List of VFS URL hash, VFS URL, size and time updated
+                       tuples
+
+:since: v0.2.00
+        """
+
+        if (len(db_values_list) > 0):
+            sweeper_db.executemany("INSERT OR IGNORE INTO stored (vfs_url_hash, vfs_url, size, time_updated) VALUES (?, ?, ?, ?)", db_values_list)
+
+            self.stats['stored'] += len(db_values_list)
+            self._call_progress_callback("stored")
+        #
+    #
+
+    def _iter_stored_files(self, vfs_object):
+        """
+Returns a generator yielding all stored files below the given VFS
+directory object.
+
+:param vfs_object: VFS directory object
+
+:return: (object) Generator yielding VFS URL, size and time updated tuples
+:since:  v0.2.00
+        """
+
+        if (not vfs_object.is_supported("scan")): raise OperationNotSupportedException("Listing stored files is not supported")
+
+        for vfs_child_object in vfs_object.scan():
+            try:
+                if (vfs_child_object.is_directory()):
+                    for stored_file_data in self._iter_stored_files(vfs_child_object): yield stored_file_data
+                else: yield ( vfs_child_object.get_url(), vfs_child_object.get_size(), vfs_child_object.get_time_updated() )
+            finally: vfs_child_object.close()
+        #
+    #
+
+    def run(self):
+        """
+Runs all three phases: streaming stored files, streaming referenced VFS
+URLs and deleting the difference.
+
+:return: (dict) Statistics of the run
+:since:  v0.2.00
+        """
+
+        self.stats = { "stored": 0,
+                       "referenced": 0,
+                       "matched": 0,
+                       "orphaned": 0,
+                       "orphaned_size": 0,
+                       "deleted": 0,
+                       "time_started": time()
+                     }
+
+        with TemporaryDirectory() as temporary_directory_path:
+            sweeper_db = sqlite3.connect(os.path.join(temporary_directory_path, "sweeper.sqlite"))
+
+            try:
+                sweeper_db.execute("CREATE TABLE stored (vfs_url_hash TEXT PRIMARY KEY, vfs_url TEXT, size INTEGER, time_updated REAL)")
+                sweeper_db.execute("CREATE TABLE referenced (vfs_url_hash TEXT PRIMARY KEY)")
+
+                self._add_stored_vfs_urls(sweeper_db)
+                self._add_referenced_vfs_url_hashes(sweeper_db)
+                self._delete_orphaned_vfs_urls(sweeper_db)
+            finally: sweeper_db.close()
+        #
+
+        return self.get_stats()
+    #
+
+    def set_progress_callback(self, callback):
+        """
+Sets a callback called with the phase and the current statistics.
+
+:param callback: Python callback
+
+:since: v0.2.00
+        """
+
+        self.progress_callback = callback
+    #
+
+    @staticmethod
+    def _get_normalized_vfs_url(vfs_url):
+        """
+Returns the given VFS URL in a normalized form. The scheme is lowercased,
+percent-encoded characters are decoded and empty path segments are
+removed, so "x-file-store://a/b" and "x-file-store:///a//b" are equal.
+
+:param vfs_url: VFS URL
+
+:return: (str) Normalized VFS URL
+:since:  v0.2.00
+        """
+
+        ( scheme, netloc, path, _, _ ) = urlsplit(vfs_url)
+        path_segments = [ segment for segment in unquote("{0}/{1}".format(netloc, path)).split("/") if (segment not in ( "", "." )) ]
+
+        return "{0}:///{1}".format(scheme.lower(), "/".join(path_segments))
+    #
+
+    @staticmethod
+    def _get_normalized_vfs_url_hash(vfs_url):
+        """
+Returns the hash of the normalized form of the given VFS URL.
+
+:param vfs_url: VFS URL
+
+:return: (str) Hex encoded SHA-256 digest
+:since:  v0.2.00
+        """
+
+        return Entry.get_vfs_url_hash(StoredFileSweeper._get_normalized_vfs_url(vfs_url))
+    #
+#
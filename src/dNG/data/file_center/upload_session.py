@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from time import time
+from uuid import uuid4 as uuid
+import hashlib
+
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from dNG.data.settings import Settings
+from dNG.database.connection import Connection
+from dNG.database.instance import Instance
+from dNG.database.instances.file_center_upload_session import FileCenterUploadSession as _DbFileCenterUploadSession
+from dNG.database.nothing_matched_exception import NothingMatchedException
+from dNG.database.transaction_context import TransactionContext
+from dNG.runtime.value_exception import ValueException
+
+from .entry import Entry
+
+class UploadSession(Instance):
+    """
+"UploadSession" receives the content of a new stored file in chunks over
+several requests. The entry created for it is not linked to a parent
+directory and therefore not listed until the session is committed.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    _DB_INSTANCE_CLASS = _DbFileCenterUploadSession
+    """
+SQLAlchemy database instance class to initialize for new instances.
+    """
+
+    def __init__(self, db_instance = None):
+        """
+Constructor __init__(UploadSession)
+
+:param db_instance: Encapsulated SQLAlchemy database instance
+
+:since: v0.2.00
+        """
+
+        Instance.__init__(self, db_instance)
+
+        self.entry = None
+        """
+Pending Entry instance
+        """
+    #
+
+    def abort(self):
+        """
+Deletes the pending entry and this upload session. The stored file is
+deleted after the outermost transaction has been committed.
+
+:since: v0.2.00
+        """
+
+        with self, TransactionContext():
+            db_session = object_session(self.local.db_instance)
+
+            entry = self.get_entry()
+            vfs_url = entry.get_vfs_url()
+
+            entry.close()
+            entry.delete()
+
+            self.delete()
+
+            UploadSession._delete_vfs_url_after_commit(db_session, vfs_url)
+        #
+    #
+
+    def append_chunk(self, offset, data, checksum = None, checksum_algorithm = "sha256"):
+        """
+Writes the given chunk at the given offset. Chunks already received
+completely are ignored to support retransmissions. The number of bytes
+received is only updated if it has not been changed concurrently, so a
+chunk is never written twice.
+
+:param offset: Chunk offset
+:param data: Chunk data
+:param checksum: Hex encoded checksum of the chunk data to verify
+:param checksum_algorithm: Checksum algorithm supported by "hashlib"
+
+:return: (int) Number of bytes received
+:since:  v0.2.00
+        """
+
+        if (checksum is not None and hashlib.new(checksum_algorithm, data).hexdigest() != checksum.lower()):
+            raise ValueException("Chunk checksum mismatch")
+        #
+
+        with self, TransactionContext():
+            size_received = self.local.db_instance.size_received
+
+            if (offset > size_received): raise ValueException("Chunk offset {0:d} is beyond the {1:d} bytes received".format(offset, size_received))
+
+            if (offset + len(data) > size_received):
+                size_expected = self.local.db_instance.size_expected
+
+                if (size_expected is not None and offset + len(data) > size_expected):
+                    raise ValueException("Chunk exceeds the expected size of {0:d} bytes".format(size_expected))
+                #
+
+                db_table = _DbFileCenterUploadSession.__table__
+                timestamp = int(time())
+
+                db_result = self.local.connection.execute(db_table.update()
+                                                          .where(db_table.c.id == self.local.db_instance.id)
+                                                          .where(db_table.c.size_received == size_received)
+                                                          .values(size_received = offset + len(data), time_updated = timestamp)
+                                                         )
+
+                if (db_result.rowcount < 1): raise ValueException("Chunk at offset {0:d} has been received concurrently".format(offset))
+
+                entry = self.get_entry()
+
+                entry.get_vfs_object().seek(size_received)
+                entry.write(data[size_received - offset:])
+                entry.checkpoint()
+
+                # Chunks may be received by different instances. The content
+                # digest used for deduplication is calculated on commit.
+                entry.discard_content_hash()
+
+                set_committed_value(self.local.db_instance, "size_received", offset + len(data))
+                set_committed_value(self.local.db_instance, "time_updated", timestamp)
+            #
+
+            return self.local.db_instance.size_received
+        #
+    #
+
+    def commit(self, parent):
+        """
+Completes the upload, adds the entry to the given parent and deletes this
+upload session.
+
+:param parent: Parent directory Entry instance
+
+:return: (object) Entry instance
+:since:  v0.2.00
+        """
+
+        with self, TransactionContext():
+            session_data = self.get_data_attributes("size_expected", "size_received")
+
+            if (session_data['size_expected'] is not None and session_data['size_expected'] != session_data['size_received']):
+                raise ValueException("Upload is incomplete")
+            #
+
+            _return = self.get_entry()
+            _return.close()
+
+            parent.add_entry(_return)
+
+            if (Settings.get("pas_file_center_deduplication_enabled", False)
+                and _return.get_content_digest() is None
+               ): _return.deduplicate()
+
+            if (Settings.get("pas_file_center_processing_enabled", False)): _return.enqueue_processing()
+
+            self.delete()
+        #
+
+        return _return
+    #
+
+    get_id = Instance._wrap_getter("id")
+    """
+Returns the ID of this upload session.
+
+:return: (str) Upload session ID
+:since:  v0.2.00
+    """
+
+    def get_entry(self):
+        """
+Returns the pending Entry instance of this upload session.
+
+:return: (object) Entry instance
+:since:  v0.2.00
+        """
+
+        if (self.entry is None):
+            with self:
+                entry_id = self.local.db_instance.id_entry
+                entries = Entry.load_ids([ entry_id ])
+
+                if (entry_id not in entries): raise NothingMatchedException("Entry ID '{0}' is invalid".format(entry_id))
+                self.entry = entries[entry_id]
+            #
+        #
+
+        return self.entry
+    #
+
+    get_size_expected = Instance._wrap_getter("size_expected")
+    """
+Returns the size expected for the upload.
+
+:return: (int) Size in bytes; None if unknown
+:since:  v0.2.00
+    """
+
+    get_size_received = Instance._wrap_getter("size_received")
+    """
+Returns the number of bytes received.
+
+:return: (int) Size in bytes
+:since:  v0.2.00
+    """
+
+    @staticmethod
+    def _delete_vfs_url_after_commit(db_session, vfs_url):
+        """
+Deletes the stored file of the given VFS URL after the outermost
+transaction of the given SQLAlchemy session has been committed. Nothing is
+deleted if it is rolled back.
+
+:param db_session: SQLAlchemy session; None to delete it immediately
+:param vfs_url: VFS URL
+
+:since: v0.2.00
+        """
+
+        if (db_session is None): Entry.delete_vfs_url(vfs_url)
+        else:
+            def _on_commit(db_session):
+                """
+Called for the SQLAlchemy session event "after_commit".
+                """
+
+                event.remove(db_session, "after_rollback", _on_rollback)
+                Entry.delete_vfs_url(vfs_url)
+            #
+
+            def _on_rollback(db_session):
+                """
+Called for the SQLAlchemy session event "after_rollback".
+                """
+
+                event.remove(db_session, "after_commit", _on_commit)
+            #
+
+            event.listen(db_session, "after_commit", _on_commit, once = True)
+            event.listen(db_session, "after_rollback", _on_rollback, once = True)
+        #
+    #
+
+    @staticmethod
+    def expire(timeout = None):
+        """
+Aborts all upload sessions not updated within the given number of seconds.
+An upload session failing to be aborted does not stop the others.
+
+:param timeout: Timeout in seconds; None for the configured timeout
+
+:return: (dict) Number of upload sessions aborted and failed
+:since:  v0.2.00
+        """
+
+        if (timeout is None): timeout = int(Settings.get("pas_file_center_upload_session_timeout", 86400))
+
+        _return = { "aborted": 0, "failed": 0 }
+        connection = Connection.get_instance()
+
+        with connection:
+            db_instances = (connection.query(_DbFileCenterUploadSession)
+                            .filter(_DbFileCenterUploadSession.time_updated < int(time()) - timeout)
+                            .all()
+                           )
+        #
+
+        for db_instance in db_instances:
+            try:
+                UploadSession(db_instance).abort()
+                _return['aborted'] += 1
+            except Exception: _return['failed'] += 1
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def load_id(_id):
+        """
+Load UploadSession instance by its ID.
+
+:param _id: Upload session ID
+
+:return: (object) UploadSession instance on success
+:since:  v0.2.00
+        """
+
+        if (_id is None): raise NothingMatchedException("Upload session ID is invalid")
+
+        connection = Connection.get_instance()
+
+        with connection:
+            db_instance = connection.query(_DbFileCenterUploadSession).filter(_DbFileCenterUploadSession.id == _id).first()
+            if (db_instance is None): raise NothingMatchedException("Upload session ID '{0}' is invalid".format(_id))
+
+            return UploadSession(db_instance)
+        #
+    #
+
+    @staticmethod
+    def new(title, owner_id = None, size_expected = None, **kwargs):
+        """
+Creates a new upload session with a pending entry for a new stored file.
+
+:param title: Entry title
+:param owner_id: Owner ID
+:param size_expected: Size expected for the upload
+:param kwargs: Additional entry data attributes
+
+:return: (object) UploadSession instance
+:since:  v0.2.00
+        """
+
+        if (owner_id is not None and size_expected is not None): Entry.check_owner_quota(owner_id, size_expected)
+
+        with TransactionContext():
+            entry = Entry.new_stored_file()
+            entry.set_data_attributes(title = title, owner_id = owner_id, **kwargs)
+
+            # Post-ingest processing is queued on commit once the content is
+            # complete.
+            entry.is_processing_queued_on_insert = False
+
+            entry.save()
+
+            timestamp = int(time())
+
+            _return = UploadSession()
+
+            with _return:
+                _return.local.db_instance.id = uuid().hex
+                _return.local.db_instance.id_entry = entry.get_id()
+                _return.local.db_instance.size_expected = size_expected
+                _return.local.db_instance.size_received = 0
+                _return.local.db_instance.time_created = timestamp
+                _return.local.db_instance.time_updated = timestamp
+
+                _return.save()
+            #
+
+            _return.entry = entry
+        #
+
+        return _return
+    #
+#
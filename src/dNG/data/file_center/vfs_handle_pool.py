@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from collections import OrderedDict
+from threading import Condition, Lock
+from time import time
+
+from dNG.data.settings import Settings
+from dNG.runtime.io_exception import IOException
+from dNG.vfs.implementation import Implementation
+
+class VfsHandlePool(object):
+    """
+"VfsHandlePool" keeps read-only VFS objects open after use to hand them out
+again for the same VFS URL. A VFS object is only used by one caller at a
+time, so the read position is never shared. The number of VFS objects open
+at the same time is limited; callers wait for a VFS object to be released
+if all of them are in use.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    _instance = None
+    """
+VfsHandlePool singleton instance
+    """
+    _instance_lock = Lock()
+    """
+Thread safety lock for the singleton instance
+    """
+
+    def __init__(self):
+        """
+Constructor __init__(VfsHandlePool)
+
+:since: v0.2.00
+        """
+
+        self.acquire_timeout = float(Settings.get("pas_file_center_vfs_handle_pool_acquire_timeout", 30))
+        """
+Number of seconds to wait for a VFS object to be released if the maximum
+number of open VFS objects is reached
+        """
+        self.hits = 0
+        """
+Number of requests served with an idle VFS object
+        """
+        self.idle_timeout = float(Settings.get("pas_file_center_vfs_handle_pool_idle_timeout", 60))
+        """
+Number of seconds an idle VFS object is kept open
+        """
+        self.idle_vfs_objects = OrderedDict()
+        """
+Idle VFS objects in least recently used order
+        """
+        self.leased_vfs_objects = { }
+        """
+Number of VFS objects in use per VFS URL
+        """
+        self.lock = Lock()
+        """
+Thread safety lock
+        """
+        self.max_open = int(Settings.get("pas_file_center_vfs_handle_pool_max_open", 64))
+        """
+Maximum number of VFS objects in use or idle at the same time
+        """
+        self.misses = 0
+        """
+Number of requests served with a newly opened VFS object
+        """
+        self.open_count = 0
+        """
+Number of VFS objects in use or idle
+        """
+        self.pooled_vfs_object_ids = set()
+        """
+IDs of open VFS objects managed by the pool
+        """
+        self.released = Condition(self.lock)
+        """
+Condition notified if VFS objects have been released
+        """
+    #
+
+    def acquire(self, vfs_url):
+        """
+Returns an open read-only VFS object for the given VFS URL for exclusive
+use until it is released again.
+
+:param vfs_url: VFS URL
+
+:return: (object) VFS object
+:since:  v0.2.00
+        """
+
+        _return = None
+        is_exhausted = False
+        vfs_objects_closable = [ ]
+
+        with self.lock:
+            vfs_objects_closable += self._remove_expired_idle_vfs_objects()
+
+            for vfs_object_id in reversed(self.idle_vfs_objects):
+                if (self.idle_vfs_objects[vfs_object_id][0] == vfs_url):
+                    _return = self.idle_vfs_objects.pop(vfs_object_id)[1]
+                    break
+                #
+            #
+
+            if (_return is None):
+                self.misses += 1
+                timestamp_timeout = time() + self.acquire_timeout
+
+                while (self.open_count >= self.max_open):
+                    if (len(self.idle_vfs_objects) > 0):
+                        vfs_objects_closable.append(self._remove_idle_vfs_object(next(iter(self.idle_vfs_objects))))
+                    else:
+                        timeout = timestamp_timeout - time()
+
+                        if (timeout > 0): self.released.wait(timeout)
+                        else:
+                            is_exhausted = True
+                            break
+                        #
+                    #
+                #
+
+                if (not is_exhausted): self.open_count += 1
+            else: self.hits += 1
+
+            if (not is_exhausted): self.leased_vfs_objects[vfs_url] = 1 + self.leased_vfs_objects.get(vfs_url, 0)
+        #
+
+        for vfs_object in vfs_objects_closable: vfs_object.close()
+
+        if (is_exhausted): raise IOException("All {0:d} VFS objects of the pool are in use".format(self.max_open))
+
+        if (_return is None):
+            try: _return = Implementation.load_vfs_url(vfs_url, True)
+            except:
+                with self.lock:
+                    self._decrease_leased_vfs_objects(vfs_url)
+                    self.open_count -= 1
+
+                    self.released.notify_all()
+                #
+
+                raise
+            #
+
+            with self.lock: self.pooled_vfs_object_ids.add(id(_return))
+        #
+
+        return _return
+    #
+
+    def clear(self):
+        """
+Closes all idle VFS objects.
+
+:since: v0.2.00
+        """
+
+        with self.lock:
+            vfs_objects_closable = [ self._remove_idle_vfs_object(vfs_object_id)
+                                     for vfs_object_id in list(self.idle_vfs_objects)
+                                   ]
+
+            self.released.notify_all()
+        #
+
+        for vfs_object in vfs_objects_closable: vfs_object.close()
+    #
+
+    def _decrease_leased_vfs_objects(self, vfs_url):
+        """
+Decreases the number of VFS objects in use for the given VFS URL.
+
+:param vfs_url: VFS URL
+
+:since: v0.2.00
+        """
+
+        self.leased_vfs_objects[vfs_url] -= 1
+        if (self.leased_vfs_objects[vfs_url] < 1): del(self.leased_vfs_objects[vfs_url])
+    #
+
+    def get_stats(self):
+        """
+Returns the pool statistics.
+
+:return: (dict) Pool statistics
+:since:  v0.2.00
+        """
+
+        with self.lock:
+            return { "open": self.open_count,
+                     "idle": len(self.idle_vfs_objects),
+                     "leased": sum(self.leased_vfs_objects.values()),
+                     "max_open": self.max_open,
+                     "hits": self.hits,
+                     "misses": self.misses
+                   }
+        #
+    #
+
+    def release(self, vfs_url, vfs_object):
+        """
+Releases a VFS object acquired before. It is kept open for later requests
+if it is still valid.
+
+:param vfs_url: VFS URL
+:param vfs_object: VFS object
+
+:since: v0.2.00
+        """
+
+        vfs_objects_closable = [ ]
+
+        with self.lock:
+            self._decrease_leased_vfs_objects(vfs_url)
+
+            is_reusable = (id(vfs_object) in self.pooled_vfs_object_ids
+                           and self.idle_timeout > 0
+                           and vfs_object.is_valid()
+                          )
+
+            vfs_objects_closable += self._remove_expired_idle_vfs_objects()
+        #
+
+        if (is_reusable):
+            try: vfs_object.seek(0)
+            except Exception: is_reusable = False
+        #
+
+        with self.lock:
+            if (is_reusable): self.idle_vfs_objects[id(vfs_object)] = ( vfs_url, vfs_object, time() )
+            elif (id(vfs_object) in self.pooled_vfs_object_ids):
+                self.pooled_vfs_object_ids.discard(id(vfs_object))
+                self.open_count -= 1
+            #
+
+            self.released.notify_all()
+        #
+
+        if (not is_reusable): vfs_objects_closable.append(vfs_object)
+        for vfs_object in vfs_objects_closable: vfs_object.close()
+    #
+
+    def _remove_expired_idle_vfs_objects(self):
+        """
+Removes all VFS objects idle for longer than the configured timeout.
+
+:return: (list) VFS objects to be closed
+:since:  v0.2.00
+        """
+
+        _return = [ ]
+        timestamp_expired = time() - self.idle_timeout
+
+        while (len(self.idle_vfs_objects) > 0):
+            vfs_object_id = next(iter(self.idle_vfs_objects))
+            if (self.idle_vfs_objects[vfs_object_id][2] > timestamp_expired): break
+
+            _return.append(self._remove_idle_vfs_object(vfs_object_id))
+        #
+
+        return _return
+    #
+
+    def _remove_idle_vfs_object(self, vfs_object_id):
+        """
+Removes the given idle VFS object from the pool.
+
+:param vfs_object_id: ID of the idle VFS object
+
+:return: (object) VFS object to be closed
+:since:  v0.2.00
+        """
+
+        self.open_count -= 1
+        self.pooled_vfs_object_ids.discard(vfs_object_id)
+
+        return self.idle_vfs_objects.pop(vfs_object_id)[1]
+    #
+
+    @staticmethod
+    def get_instance():
+        """
+Get the VfsHandlePool singleton.
+
+:return: (object) Object on success
+:since:  v0.2.00
+        """
+
+        if (VfsHandlePool._instance is None):
+            with VfsHandlePool._instance_lock:
+                if (VfsHandlePool._instance is None): VfsHandlePool._instance = VfsHandlePool()
+            #
+        #
+
+        return VfsHandlePool._instance
+    #
+
+    @staticmethod
+    def is_enabled():
+        """
+Returns true if read-only VFS objects should be pooled.
+
+:return: (bool) True if enabled
+:since:  v0.2.00
+        """
+
+        return Settings.get("pas_file_center_vfs_handle_pool_enabled", False)
+    #
+#
@@ -30,7 +30,9 @@ https://www.direct-netware.de/redirect?licenses;gpl
 #echo(__FILEPATH__)#
 """
 
-from sqlalchemy.schema import Column, ForeignKey
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.schema import Column, ForeignKey, Index
+from sqlalchemy.sql.expression import func, literal_column
 from sqlalchemy.types import BIGINT, BOOLEAN, CHAR, INT, TEXT, VARCHAR
 
 from .data_linker import DataLinker
@@ -57,7 +59,7 @@ SQLAlchemy table name
     """
 Encapsulating SQLAlchemy database instance class name
     """
-    db_schema_version = 1
+    db_schema_version = 7
     """
 Database schema version
     """
@@ -69,6 +71,10 @@ file_center_entry.id
     vfs_url = Column(TEXT, index = True)
     """
 file_center_entry.vfs_url
+    """
+    vfs_url_hash = Column(CHAR(64), index = True)
+    """
+file_center_entry.vfs_url_hash
     """
     vfs_type = Column(INT, index = True, server_default = "0", nullable = False)
     """
@@ -101,6 +107,22 @@ file_center_entry.mimetype
     size = Column(BIGINT, server_default = "0", nullable = False)
     """
 file_center_entry.size
+    """
+    content_digest = Column(CHAR(64), index = True)
+    """
+file_center_entry.content_digest
+    """
+    processing_state = Column(VARCHAR(20), index = True)
+    """
+file_center_entry.processing_state
+    """
+    tree_size = Column(BIGINT, server_default = "0", nullable = False)
+    """
+file_center_entry.tree_size
+    """
+    tree_items = Column(INT, server_default = "0", nullable = False)
+    """
+file_center_entry.tree_items
     """
     locked = Column(BOOLEAN, server_default = "0", nullable = False)
     """
@@ -120,4 +142,83 @@ file_center_entry.user_permission
 sqlalchemy.org: Other options are passed to mapper() using the
 __mapper_args__ class variable.
     """
+    __table_args__ = ( Index("ix_{0}_file_center_entry_owner_root".format(DataLinker.get_table_prefix()),
+                             owner_id,
+                             role_id,
+                             owner_type,
+                             vfs_type
+                            ),
+                     )
+    """
+sqlalchemy.org: Table arguments defined for the composite index used to
+look up owner root directories.
+    """
+
+    @hybrid_property
+    def sort_time(self):
+        """
+Returns the sortable time used by the default sort definition. Undefined
+values are sorted as 0.
+
+:return: (int) Sortable time
+:since:  v0.2.00
+        """
+
+        return (0 if (self.time_sortable is None) else self.time_sortable)
+    #
+
+    @sort_time.expression
+    def sort_time(cls):
+        """
+Returns the SQLAlchemy expression of the sortable time used by the default
+sort definition.
+
+:return: (object) SQLAlchemy expression
+:since:  v0.2.00
+        """
+
+        # pylint: disable=no-self-argument
+
+        return func.coalesce(cls.time_sortable, literal_column("0"))
+    #
+
+    @hybrid_property
+    def sort_title(self):
+        """
+Returns the title used by the default sort definition. Undefined titles are
+sorted as empty ones.
+
+:return: (str) Sortable title
+:since:  v0.2.00
+        """
+
+        return ("" if (self.title is None) else self.title)
+    #
+
+    @sort_title.expression
+    def sort_title(cls):
+        """
+Returns the SQLAlchemy expression of the title used by the default sort
+definition.
+
+:return: (object) SQLAlchemy expression
+:since:  v0.2.00
+        """
+
+        # pylint: disable=no-self-argument
+
+        return func.coalesce(cls.title, literal_column("''"))
+    #
 #
+
+Index("ix_{0}_datalinker_content_list".format(DataLinker.get_table_prefix()),
+      DataLinker.__table__.c.id_parent,
+      DataLinker.__table__.c.position,
+      FileCenterEntry.sort_title,
+      FileCenterEntry.sort_time.desc(),
+      DataLinker.__table__.c.id
+     )
+"""
+Composite index used to list file center entries of a directory of one VFS
+type in the default sort order extended by the entry ID.
+"""
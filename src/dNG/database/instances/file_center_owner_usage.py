@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from sqlalchemy.schema import Column
+from sqlalchemy.types import BIGINT, INT, VARCHAR
+
+from .abstract import Abstract
+
+class FileCenterOwnerUsage(Abstract):
+    """
+"FileCenterOwnerUsage" represents the storage used by an owner.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    __tablename__ = "{0}_file_center_owner_usage".format(Abstract.get_table_prefix())
+    """
+SQLAlchemy table name
+    """
+    db_schema_version = 1
+    """
+Database schema version
+    """
+
+    owner_id = Column(VARCHAR(32), primary_key = True)
+    """
+file_center_owner_usage.owner_id
+    """
+    size = Column(BIGINT, server_default = "0", nullable = False)
+    """
+file_center_owner_usage.size
+    """
+    items = Column(INT, server_default = "0", nullable = False)
+    """
+file_center_owner_usage.items
+    """
+    quota = Column(BIGINT)
+    """
+file_center_owner_usage.quota
+    """
+#
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from sqlalchemy.schema import Column
+from sqlalchemy.types import BIGINT, INT, TEXT, VARCHAR
+
+from .abstract import Abstract
+
+class FileCenterProcessingJob(Abstract):
+    """
+"FileCenterProcessingJob" represents the post-ingest processing queued for
+a file center entry.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: file_center
+:since:      v0.2.00
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2
+    """
+
+    __tablename__ = "{0}_file_center_processing_job".format(Abstract.get_table_prefix())
+    """
+SQLAlchemy table name
+    """
+    db_schema_version = 1
+    """
+Database schema version
+    """
+
+    id_entry = Column(VARCHAR(32), primary_key = True)
+    """
+file_center_processing_job.id_entry
+    """
+    revision = Column(VARCHAR(32), nullable = False)
+    """
+file_center_processing_job.revision
+    """
+    stages = Column(TEXT)
+    """
+file_center_processing_job.stages
+    """
+    attempts = Column(INT, server_default = "0", nullable = False)
+    """
+file_center_processing_job.attempts
+    """
+    error = Column(TEXT)
+    """
+file_center_processing_job.error
+    """
+    time_queued = Column(BIGINT, nullable = False)
+    """
+file_center_processing_job.time_queued
+    """
+    time_scheduled = Column(BIGINT, index = True)
+    """
+file_center_processing_job.time_scheduled
+    """
+    time_claimed = Column(BIGINT)
+    """
+file_center_processing_job.time_claimed
+    """
+#
@@ -30,9 +30,17 @@ https://www.direct-netware.de/redirect?licenses;gpl
 #echo(__FILEPATH__)#
 """
 
-# pylint: disable=unused-argument
+# pylint: disable=import-error,no-name-in-module,unused-argument
 
+from sqlalchemy import inspect
+from sqlalchemy.exc import DatabaseError
+from sqlalchemy.schema import Column, CreateColumn, MetaData, Table
+from sqlalchemy.sql.expression import bindparam
+
+from dNG.data.settings import Settings
+from dNG.database.connection import Connection
 from dNG.database.schema import Schema
+from dNG.database.transaction_context import TransactionContext
 from dNG.module.named_loader import NamedLoader
 from dNG.plugins.hook import Hook
 
@@ -48,11 +56,203 @@ Called for "dNG.pas.Database.applySchema.after"
     """
 
     entry_class = NamedLoader.get_class("dNG.database.instances.FileCenterEntry")
+
+    entry_column_names_added = _add_missing_columns(entry_class)
+    _fill_vfs_url_hashes(entry_class)
+    _add_missing_indices(entry_class)
+
+    data_linker_class = NamedLoader.get_class("dNG.database.instances.DataLinker")
+
+    _drop_indices(data_linker_class, [ "ix_{0}_datalinker_id_parent_position".format(data_linker_class.get_table_prefix()) ])
+    _add_missing_indices(data_linker_class)
+
     Schema.apply_version(entry_class)
 
+    if ("tree_size" in entry_column_names_added or "tree_items" in entry_column_names_added):
+        NamedLoader.get_class("dNG.data.file_center.Entry").rebuild_tree_totals()
+    #
+
+    owner_usage_class = NamedLoader.get_class("dNG.database.instances.FileCenterOwnerUsage")
+    Schema.apply_version(owner_usage_class)
+
+    _fill_owner_usage(owner_usage_class)
+
+    Schema.apply_version(NamedLoader.get_class("dNG.database.instances.FileCenterUploadSession"))
+    Schema.apply_version(NamedLoader.get_class("dNG.database.instances.FileCenterStoredObject"))
+    Schema.apply_version(NamedLoader.get_class("dNG.database.instances.FileCenterProcessingJob"))
+
     return last_return
 #
 
+def _add_missing_columns(db_class):
+    """
+Adds columns defined for the given SQLAlchemy database class but missing in
+an existing table. Columns are added with their server default and "NOT
+NULL" constraint. Rows still NULL afterwards are set to the server default.
+
+:param db_class: SQLAlchemy database class
+
+:return: (list) Names of the columns added
+:since:  v0.2.00
+    """
+
+    _return = [ ]
+
+    connection = Connection.get_instance()
+    db_table = db_class.__table__
+
+    with connection:
+        db_bind = connection.get_bind()
+
+        db_column_names = [ db_column_data['name'] for db_column_data in inspect(db_bind).get_columns(db_table.name) ]
+
+        for db_column in db_table.columns:
+            if (db_column.name not in db_column_names):
+                db_bind.execute("ALTER TABLE {0} ADD COLUMN {1}".format(db_table.name,
+                                                                      CreateColumn(db_column).compile(dialect = db_bind.dialect)
+                                                                     )
+                               )
+
+                if (db_column.server_default is not None):
+                    db_bind.execute(db_table.update()
+                                    .where(db_column == None)
+                                    .values({ db_column.name: db_column.server_default.arg })
+                                   )
+                #
+
+                _return.append(db_column.name)
+            #
+        #
+    #
+
+    return _return
+#
+
+def _add_missing_indices(db_class):
+    """
+Creates indices defined for the given SQLAlchemy database class but missing
+in an existing table. Existing indices with a different uniqueness are
+recreated.
+
+:param db_class: SQLAlchemy database class
+
+:since: v0.2.00
+    """
+
+    connection = Connection.get_instance()
+    db_table = db_class.__table__
+
+    with connection:
+        db_bind = connection.get_bind()
+
+        db_indices_unique = { db_index_data['name']: bool(db_index_data['unique'])
+                              for db_index_data in inspect(db_bind).get_indexes(db_table.name)
+                            }
+
+        for db_index in db_table.indexes:
+            if (db_index.name in db_indices_unique and db_indices_unique[db_index.name] != bool(db_index.unique)):
+                db_index.drop(db_bind)
+                del(db_indices_unique[db_index.name])
+            #
+
+            if (db_index.name not in db_indices_unique):
+                try: db_index.create(db_bind)
+                except DatabaseError:
+                    # Indices of expressions are not reflected by all SQLAlchemy dialects and may exist already
+                    if (all(isinstance(db_expression, Column) for db_expression in db_index.expressions)): raise
+                #
+            #
+        #
+    #
+#
+
+def _drop_indices(db_class, db_index_names):
+    """
+Drops the given indices of an existing table if they are still present,
+e.g. if they have been replaced by other ones.
+
+:param db_class: SQLAlchemy database class
+:param db_index_names: Names of the indices to drop
+
+:since: v0.2.00
+    """
+
+    connection = Connection.get_instance()
+
+    with connection:
+        db_bind = connection.get_bind()
+
+        # Reflect the table to not modify the indices defined for the database class
+        db_table = Table(db_class.__table__.name, MetaData(), autoload_with = db_bind)
+
+        for db_index in db_table.indexes:
+            if (db_index.name in db_index_names): db_index.drop(db_bind)
+        #
+    #
+#
+
+def _fill_owner_usage(db_class):
+    """
+Calculates the storage used by all owners if no usage has been recorded
+yet.
+
+:param db_class: SQLAlchemy database class
+
+:since: v0.2.00
+    """
+
+    connection = Connection.get_instance()
+
+    with connection:
+        is_empty = (connection.query(db_class.owner_id).first() is None)
+    #
+
+    if (is_empty): NamedLoader.get_class("dNG.data.file_center.Entry").rebuild_owner_usage()
+#
+
+def _fill_vfs_url_hashes(db_class):
+    """
+Calculates the VFS URL hash for existing rows in batches (schema version 2).
+
+:param db_class: SQLAlchemy database class
+
+:since: v0.2.00
+    """
+
+    batch_size = int(Settings.get("pas_file_center_batch_size", 500))
+    entry_class = NamedLoader.get_class("dNG.data.file_center.Entry")
+
+    db_table = db_class.__table__
+
+    db_update = (db_table.update()
+                 .where(db_table.c.id == bindparam("_id"))
+                 .values(vfs_url_hash = bindparam("_vfs_url_hash"))
+                )
+
+    connection = Connection.get_instance()
+    is_filled = False
+
+    while (not is_filled):
+        with connection, TransactionContext():
+            db_rows = (connection.query(db_table.c.id, db_table.c.vfs_url)
+                       .filter(db_table.c.vfs_url_hash == None, db_table.c.vfs_url != None)
+                       .limit(batch_size)
+                       .all()
+                      )
+
+            is_filled = (len(db_rows) < batch_size)
+
+            if (len(db_rows) > 0):
+                connection.execute(db_update,
+                                   [ { "_id": _id, "_vfs_url_hash": entry_class.get_vfs_url_hash(vfs_url) }
+                                     for ( _id, vfs_url ) in db_rows
+                                   ]
+                                  )
+            #
+        #
+    #
+#
+
 def load_all(params, last_return = None):
     """
 Load and register all SQLAlchemy objects to generate database tables.
@@ -64,6 +264,10 @@ Load and register all SQLAlchemy objects to generate database tables.
     """
 
     NamedLoader.get_class("dNG.database.instances.FileCenterEntry")
+    NamedLoader.get_class("dNG.database.instances.FileCenterOwnerUsage")
+    NamedLoader.get_class("dNG.database.instances.FileCenterProcessingJob")
+    NamedLoader.get_class("dNG.database.instances.FileCenterStoredObject")
+    NamedLoader.get_class("dNG.database.instances.FileCenterUploadSession")
 
     return last_return
 #
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name
+
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("dNG.data.settings")
+pytest.importorskip("dNG.database.connection")
+
+from dNG.data.file_center.entry import Entry
+from dNG.data.file_center.environment import Environment
+from dNG.data.settings import Settings
+from dNG.runtime.io_exception import IOException
+from dNG.vfs.implementation import Implementation
+
+@pytest.fixture(scope = "session")
+def environment(tmp_path_factory):
+    """
+Configures an SQLite database and a file store below a temporary data path
+shared by all tests.
+
+:return: (str) Data path
+:since:  v0.2.00
+    """
+
+    path_data = str(tmp_path_factory.mktemp("path_data"))
+    Environment.setup(path_data, [ ], [ ], True)
+
+    return path_data
+#
+
+@pytest.fixture
+def root_directory(environment):
+    """
+Returns a new main directory entry owned by a new owner ID.
+
+:return: (object) Entry instance
+:since:  v0.2.00
+    """
+
+    _return = Entry()
+
+    _return.set_data_attributes(title = uuid4().hex,
+                                vfs_type = Entry.VFS_TYPE_DIRECTORY,
+                                mimeclass = "directory",
+                                owner_id = uuid4().hex
+                               )
+
+    _return.set_as_main_entry()
+    _return.save()
+
+    return _return
+#
+
+@pytest.fixture
+def tree_totals_enabled(environment):
+    """
+Enables maintaining tree totals for one test.
+
+:since: v0.2.00
+    """
+
+    is_enabled = Settings.get("pas_file_center_tree_totals_enabled", False)
+    Settings.set("pas_file_center_tree_totals_enabled", True)
+
+    yield
+
+    Settings.set("pas_file_center_tree_totals_enabled", is_enabled)
+#
+
+def is_stored(vfs_url):
+    """
+Returns true if the stored file of the given VFS URL exists.
+
+:param vfs_url: VFS URL
+
+:return: (bool) True if stored
+:since:  v0.2.00
+    """
+
+    try: vfs_object = Implementation.load_vfs_url(vfs_url, True)
+    except (IOException, OSError): return False
+
+    try: return vfs_object.is_valid()
+    finally: vfs_object.close()
+#
+
+def new_directory(parent, title):
+    """
+Adds a new directory entry to the given parent.
+
+:param parent: Parent entry
+:param title: Directory title
+
+:return: (object) Entry instance
+:since:  v0.2.00
+    """
+
+    _return = Entry()
+
+    _return.set_data_attributes(title = title,
+                                vfs_type = Entry.VFS_TYPE_DIRECTORY,
+                                mimeclass = "directory",
+                                owner_id = parent.get_data_attributes("owner_id")['owner_id']
+                               )
+
+    parent.add_entry(_return)
+
+    return _return
+#
+
+def new_file(parent, data, title = None):
+    """
+Adds a new stored file entry with the given data to the given parent.
+
+:param parent: Parent entry
+:param data: File data
+:param title: File title
+
+:return: (object) Entry instance
+:since:  v0.2.00
+    """
+
+    _return = Entry.new_stored_file()
+    _return.set_data_attributes(title = (uuid4().hex if (title is None) else title), owner_id = parent.get_data_attributes("owner_id")['owner_id'])
+
+    _return.write(data)
+    _return.flush()
+
+    parent.add_entry(_return)
+
+    return _return
+#
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name
+
+from io import BytesIO
+import tarfile
+
+import pytest
+
+from dNG.data.file_center.archive_export import ArchiveExport
+
+from conftest import new_directory, new_file
+
+class _GrownVfsObject(object):
+    """
+VFS object reporting a larger size than the data it returns, like a stored
+file truncated after its size has been read.
+
+:since: v0.2.00
+    """
+
+    def __init__(self, vfs_object):
+        """
+Constructor __init__(_GrownVfsObject)
+
+:param vfs_object: Wrapped VFS object
+
+:since: v0.2.00
+        """
+
+        self.vfs_object = vfs_object
+        """
+Wrapped VFS object
+        """
+    #
+
+    def __getattr__(self, name):
+        """
+python.org: Called when an attribute lookup has not found the attribute in
+the usual places.
+
+:param name: Attribute name
+
+:return: (mixed) Attribute of the wrapped VFS object
+:since:  v0.2.00
+        """
+
+        return getattr(self.vfs_object, name)
+    #
+
+    def get_size(self):
+        """
+Returns a size larger than the one of the wrapped VFS object.
+
+:return: (int) Size in bytes
+:since:  v0.2.00
+        """
+
+        return 10 + self.vfs_object.get_size()
+    #
+#
+
+@pytest.fixture
+def exported_directory(root_directory):
+    """
+Adds a file and a sub directory with a file to the root directory.
+
+:return: (object) Entry instance
+:since:  v0.2.00
+    """
+
+    new_file(root_directory, b"abc", "a.txt")
+    new_file(new_directory(root_directory, "b"), b"defg", "c.txt")
+
+    return root_directory
+#
+
+def _export_tar(entry):
+    """
+Exports the given entry as a tar archive.
+
+:param entry: Entry instance
+
+:return: (tuple) Archive export instance and opened tar archive
+:since:  v0.2.00
+    """
+
+    _return = ArchiveExport(entry)
+    data = b"".join(_return.iter_data())
+
+    return ( _return, tarfile.open(fileobj = BytesIO(data)) )
+#
+
+def test_export_tar(exported_directory):
+    ( archive_export, tar_file ) = _export_tar(exported_directory)
+    title = exported_directory.get_data_attributes("title")['title']
+
+    assert tar_file.extractfile("{0}/a.txt".format(title)).read() == b"abc"
+    assert tar_file.extractfile("{0}/b/c.txt".format(title)).read() == b"defg"
+
+    stats = archive_export.get_stats()
+    assert ( stats['files'], stats['directories'], stats['size'], stats['truncated'] ) == ( 2, 2, 7, 0 )
+#
+
+def test_export_truncated_file_counted(exported_directory, monkeypatch):
+    _load_vfs_object = ArchiveExport._load_vfs_object
+    monkeypatch.setattr(ArchiveExport, "_load_vfs_object", staticmethod(lambda vfs_url: _GrownVfsObject(_load_vfs_object(vfs_url))))
+
+    ( archive_export, tar_file ) = _export_tar(exported_directory)
+    title = exported_directory.get_data_attributes("title")['title']
+
+    assert tar_file.extractfile("{0}/a.txt".format(title)).read() == b"abc" + bytes(10)
+    assert archive_export.get_stats()['truncated'] == 2
+#
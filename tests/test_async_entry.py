@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,unused-argument
+
+import asyncio
+
+from dNG.data.file_center.async_entry import AsyncEntry
+
+from conftest import new_file
+
+def test_iter_range(root_directory):
+    entry = new_file(root_directory, b"0123456789" * 100)
+    entry.close()
+
+    async def _read():
+        async_entry = await AsyncEntry.load_id(entry.get_id())
+
+        try: return b"".join([ data async for data in async_entry.iter_range(chunk_size = 64, read_ahead = 1) ])
+        finally: await async_entry.close()
+    #
+
+    assert asyncio.run(_read()) == b"0123456789" * 100
+#
+
+def test_iter_range_closed_early(root_directory):
+    entry = new_file(root_directory, b"0123456789" * 100)
+    entry.close()
+
+    async def _read_first_chunk():
+        async_entry = await AsyncEntry.load_id(entry.get_id())
+        iterator = async_entry.iter_range(chunk_size = 64, read_ahead = 1)
+
+        _return = await iterator.__anext__()
+
+        # Let the reader fill the queue and wait for the consumer
+        await asyncio.sleep(0.25)
+        await iterator.aclose()
+
+        tasks = asyncio.all_tasks() - { asyncio.current_task() }
+        if (len(tasks) > 0): await asyncio.wait(tasks, timeout = 5)
+
+        assert all(task.done() for task in tasks)
+
+        return _return
+    #
+
+    assert asyncio.run(_read_first_chunk()) == b"0123456789" * 6 + b"0123"
+#
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name,unused-argument
+
+import json
+import os
+
+import pytest
+
+from dNG.data.file_center.bulk_ingest import BulkIngest
+from dNG.data.file_center.entry import Entry
+
+from conftest import is_stored
+
+@pytest.fixture
+def source_path(tmp_path):
+    """
+Creates a local directory tree to ingest.
+
+:return: (str) Local directory path
+:since:  v0.2.00
+    """
+
+    for path in ( "a/b", "c" ): (tmp_path / path).mkdir(parents = True)
+
+    for path in ( "x.txt", "a/y.txt", "a/b/z.bin", "c/v.txt", "c/w.txt" ):
+        (tmp_path / path).write_bytes(path.encode("utf-8") * 10)
+    #
+
+    return str(tmp_path)
+#
+
+@pytest.fixture
+def copied_vfs_urls(monkeypatch):
+    """
+Records the VFS URLs of all files copied.
+
+:return: (list) VFS URLs
+:since:  v0.2.00
+    """
+
+    _return = [ ]
+    _copy_file = BulkIngest._copy_file
+
+    def _copy_file_recorded(bulk_ingest, path):
+        file_data = _copy_file(bulk_ingest, path)
+        _return.append(file_data['vfs_url'])
+
+        return file_data
+    #
+
+    monkeypatch.setattr(BulkIngest, "_copy_file", _copy_file_recorded)
+
+    return _return
+#
+
+def _get_tree(entry):
+    """
+Returns the titles of all entries below the given one.
+
+:param entry: Entry instance
+
+:return: (list) Sorted relative paths
+:since:  v0.2.00
+    """
+
+    _return = [ ]
+
+    for sub_entry in entry.iter_content_list():
+        title = sub_entry.get_data_attributes("title")['title']
+        _return.append(title)
+
+        if (sub_entry.is_vfs_type(Entry.VFS_TYPE_DIRECTORY)):
+            _return += [ "{0}/{1}".format(title, path) for path in _get_tree(sub_entry) ]
+        #
+    #
+
+    return sorted(_return)
+#
+
+def test_ingest(root_directory, source_path):
+    stats = BulkIngest(source_path, root_directory.get_id(), workers = 2).run()
+
+    assert stats['directories'] == 3
+    assert stats['files'] == 5
+    assert _get_tree(root_directory) == [ "a", "a/b", "a/b/z.bin", "a/y.txt", "c", "c/v.txt", "c/w.txt", "x.txt" ]
+#
+
+def test_resume_without_journal_records(root_directory, source_path, tmp_path_factory, copied_vfs_urls):
+    journal_path = str(tmp_path_factory.mktemp("journal") / "bulk_ingest.journal")
+
+    BulkIngest(source_path, root_directory.get_id(), journal_path = journal_path, workers = 2).run()
+
+    # Simulate an interruption after the last batch has been committed but
+    # before its files have been written to the journal.
+    with open(journal_path, "r", encoding = "utf-8") as journal_file:
+        records = [ json.loads(line) for line in journal_file ]
+    #
+
+    with open(journal_path, "w", encoding = "utf-8") as journal_file:
+        for record in records:
+            if (record[0] == BulkIngest.JOURNAL_TYPE_DIRECTORY): journal_file.write("{0}\n".format(json.dumps(record)))
+        #
+    #
+
+    copied_vfs_urls_first_run = list(copied_vfs_urls)
+
+    stats = BulkIngest(source_path, root_directory.get_id(), journal_path = journal_path, workers = 2).run()
+
+    assert stats['files'] == 0
+    assert stats['files_skipped'] == 5
+    assert _get_tree(root_directory) == [ "a", "a/b", "a/b/z.bin", "a/y.txt", "c", "c/v.txt", "c/w.txt", "x.txt" ]
+
+    assert all(is_stored(vfs_url) for vfs_url in copied_vfs_urls_first_run)
+    assert (not any(is_stored(vfs_url) for vfs_url in copied_vfs_urls[len(copied_vfs_urls_first_run):]))
+#
+
+def test_failed_batch_deletes_copies(root_directory, source_path, copied_vfs_urls, monkeypatch):
+    def _save_many(cls, entries, parent = None): raise IOError("batch failed")
+    monkeypatch.setattr(Entry, "save_many", classmethod(_save_many))
+
+    with pytest.raises(IOError): BulkIngest(source_path, root_directory.get_id(), workers = 2).run()
+
+    assert len(copied_vfs_urls) > 0
+    assert (not any(is_stored(vfs_url) for vfs_url in copied_vfs_urls))
+#
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+
+from conftest import new_directory, new_file
+
+@pytest.fixture
+def listed_directory(root_directory):
+    """
+Adds directories and items with different positions, titles and sortable
+times to the root directory.
+
+:return: (object) Entry instance
+:since:  v0.2.00
+    """
+
+    for ( position, title, time_sortable ) in ( ( 0, "b", 1 ), ( 0, None, 1 ), ( 1, "a", 1 ), ( 0, "a", 2 ) ):
+        entry = new_directory(root_directory, title)
+        entry.set_data_attributes(position = position, time_sortable = time_sortable)
+        entry.save()
+
+        entry = new_file(root_directory, b"data", title)
+        entry.set_data_attributes(position = position, time_sortable = time_sortable)
+        entry.save()
+    #
+
+    for time_sortable in ( 3, 1, 2 ):
+        entry = new_file(root_directory, b"data", "c")
+        entry.set_data_attributes(time_sortable = time_sortable)
+        entry.save()
+    #
+
+    return root_directory
+#
+
+def _get_expected_cursors(entry):
+    """
+Returns the cursors of all entries below the given one in the order
+expected for the default sort definition.
+
+:param entry: Parent entry
+
+:return: (list) Cursor values
+:since:  v0.2.00
+    """
+
+    _return = [ sub_entry.get_content_list_cursor() for sub_entry in entry.iter_content_list() ]
+    _return.sort(key = lambda cursor: ( cursor[0], cursor[1], cursor[2], -cursor[3], cursor[4] ))
+
+    return _return
+#
+
+def test_content_list_sorted(listed_directory):
+    cursors = [ sub_entry.get_content_list_cursor() for sub_entry in listed_directory.iter_content_list(chunk_size = 2) ]
+
+    assert len(cursors) == 11
+    assert cursors == _get_expected_cursors(listed_directory)
+
+    assert [ cursor[1] for cursor in cursors[:3] ] == [ Entry.VFS_TYPE_DIRECTORY ] * 3
+    assert cursors[0][2] == ""
+    assert [ cursor[3] for cursor in cursors if cursor[2] == "c" ] == [ 3, 2, 1 ]
+#
+
+def test_content_list_keyset_pages(listed_directory):
+    expected_cursors = _get_expected_cursors(listed_directory)
+
+    cursor = None
+    cursors = [ ]
+
+    while True:
+        entry_views = list(listed_directory.iter_content_views(cursor = cursor, limit = 3, chunk_size = 2))
+        if (len(entry_views) < 1): break
+
+        assert len(entry_views) <= 3
+
+        cursors += [ entry_view.get_content_list_cursor() for entry_view in entry_views ]
+        cursor = entry_views[-1].get_content_list_cursor()
+    #
+
+    assert cursors == expected_cursors
+#
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+from dNG.database.nothing_matched_exception import NothingMatchedException
+
+from conftest import new_directory, new_file
+
+def test_delete_deepest_level_first(root_directory, monkeypatch):
+    parent = new_directory(root_directory, "a")
+    parent_ids = { }
+
+    for depth in range(3):
+        new_file(parent, b"x")
+
+        directory = new_directory(parent, "d{0:d}".format(depth))
+        parent_ids[directory.get_id()] = parent.get_id()
+
+        parent = directory
+    #
+
+    deleted_entry_ids = [ ]
+    _delete_db_rows = Entry._delete_db_rows
+
+    def _delete_db_rows_recorded(connection, entry_ids):
+        deleted_entry_ids.extend(entry_ids)
+        _delete_db_rows(connection, entry_ids)
+    #
+
+    monkeypatch.setattr(Entry, "_delete_db_rows", staticmethod(_delete_db_rows_recorded))
+
+    entry = Entry.load_id(root_directory.get_id())
+    stats = entry.delete()
+
+    assert stats['entries'] == 8
+
+    for entry_id in parent_ids:
+        if (parent_ids[entry_id] in deleted_entry_ids):
+            assert deleted_entry_ids.index(entry_id) < deleted_entry_ids.index(parent_ids[entry_id])
+        #
+    #
+
+    for entry_id in deleted_entry_ids:
+        with pytest.raises(NothingMatchedException): Entry.load_id(entry_id)
+    #
+#
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name,unused-argument
+
+from uuid import uuid4
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+from dNG.runtime.value_exception import ValueException
+
+from conftest import new_directory, new_file
+
+@pytest.fixture
+def target_root_directory(root_directory):
+    """
+Returns a second main directory entry owned by the owner of the root
+directory.
+
+:return: (object) Entry instance
+:since:  v0.2.00
+    """
+
+    _return = Entry()
+
+    _return.set_data_attributes(title = uuid4().hex,
+                                vfs_type = Entry.VFS_TYPE_DIRECTORY,
+                                mimeclass = "directory",
+                                owner_id = root_directory.get_data_attributes("owner_id")['owner_id']
+                               )
+
+    _return.set_as_main_entry()
+    _return.save()
+
+    return _return
+#
+
+def test_move_subtree(root_directory, target_root_directory, tree_totals_enabled):
+    directory = new_directory(root_directory, "a")
+    new_file(directory, b"abc")
+
+    sub_directory = new_directory(directory, "b")
+    file_entry = new_file(sub_directory, b"12345")
+
+    new_file(root_directory, b"xy")
+
+    progress_stats = [ ]
+
+    entry = Entry.load_id(directory.get_id())
+    entry.move_subtree(Entry.load_id(target_root_directory.get_id()), progress_stats.append)
+
+    target_id = target_root_directory.get_id()
+
+    for entry_id in ( directory.get_id(), sub_directory.get_id(), file_entry.get_id() ):
+        assert Entry.load_id(entry_id).get_data_attributes("id_main")['id_main'] == target_id
+    #
+
+    assert progress_stats[-1]['entries'] == 4
+
+    assert Entry.load_id(directory.get_id()).get_data_attributes("id_parent")['id_parent'] == target_id
+    assert Entry.load_id(sub_directory.get_id()).get_data_attributes("id_parent")['id_parent'] == directory.get_id()
+
+    old_parent = Entry.load_id(root_directory.get_id())
+    assert old_parent.get_tree_size() == 2
+    assert old_parent.get_tree_items() == 1
+
+    new_parent = Entry.load_id(target_id)
+    assert new_parent.get_tree_size() == 8
+    assert new_parent.get_tree_items() == 2
+
+    assert Entry.load_id(file_entry.get_id()).read() == b"12345"
+#
+
+def test_move_subtree_below_itself(root_directory):
+    directory = new_directory(root_directory, "a")
+    sub_directory = new_directory(directory, "b")
+
+    entry = Entry.load_id(directory.get_id())
+    with pytest.raises(ValueException): entry.move_subtree(Entry.load_id(sub_directory.get_id()))
+
+    assert Entry.load_id(directory.get_id()).get_data_attributes("id_parent")['id_parent'] == root_directory.get_id()
+#
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name
+
+import mmap
+import os
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+from dNG.runtime.value_exception import ValueException
+
+from conftest import new_file
+
+@pytest.fixture
+def range_file(root_directory):
+    """
+Adds a stored file larger than the memory map allocation granularity.
+
+:return: (tuple) Entry instance and the file data
+:since:  v0.2.00
+    """
+
+    data = bytes(bytearray(position % 251 for position in range(3 * mmap.ALLOCATIONGRANULARITY + 1234)))
+    entry = new_file(root_directory, data)
+    entry.close()
+
+    return ( Entry.load_id(entry.get_id()), data )
+#
+
+def _read_file_range(entry, offset, length):
+    """
+Reads the range returned by "Entry.get_file_range()" from its file
+descriptor.
+
+:param entry: Entry instance
+:param offset: Range start offset
+:param length: Range length; None to read to the end of the file
+
+:return: (bytes) Data read
+:since:  v0.2.00
+    """
+
+    ( file_descriptor, offset, length ) = entry.get_file_range(offset, length)
+    return os.pread(file_descriptor, length, offset)
+#
+
+def test_range_validation(range_file):
+    ( entry, data ) = range_file
+
+    with pytest.raises(ValueException): entry.get_file_range(len(data) + 1)
+    with pytest.raises(ValueException): entry.get_file_range(-1)
+    with pytest.raises(ValueException): entry.get_file_range(0, -1)
+    with pytest.raises(ValueException): list(entry.iter_range_mmap(len(data) + 1))
+
+    assert entry.get_file_range(len(data) - 10, 100)[1:] == ( len(data) - 10, 10 )
+    assert entry.get_file_range(len(data))[1:] == ( len(data), 0 )
+    assert list(entry.iter_range_mmap(len(data))) == [ ]
+
+    entry.close()
+#
+
+def test_readinto(range_file):
+    ( entry, data ) = range_file
+
+    buffer_view = memoryview(bytearray(1000))
+    entry.seek(len(data) - 100)
+
+    assert entry.readinto(buffer_view) == 100
+    assert buffer_view[:100] == data[-100:]
+    assert entry.readinto(buffer_view) == 0
+
+    entry.close()
+#
+
+def test_ranges_match_read(range_file):
+    ( entry, data ) = range_file
+    ranges = [ ( 0, None ), ( 1, 10 ), ( mmap.ALLOCATIONGRANULARITY + 17, 2 * mmap.ALLOCATIONGRANULARITY ), ( 5000, None ) ]
+
+    assert entry.get_vfs_url().startswith("x-file-store:")
+
+    for ( offset, length ) in ranges:
+        entry.seek(offset)
+        expected_data = (entry.read() if (length is None) else entry.read(length))
+
+        assert expected_data == data[offset:(None if (length is None) else offset + length)]
+
+        assert b"".join(bytes(chunk) for chunk in entry.iter_range_mmap(offset, length, 4096)) == expected_data
+        assert _read_file_range(entry, offset, length) == expected_data
+        assert b"".join(bytes(chunk) for chunk in entry.iter_range(offset, length, 4096)) == expected_data
+    #
+
+    entry.close()
+#
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name,unused-argument
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+from dNG.data.file_center.instrumentation import Instrumentation
+
+from conftest import new_file
+
+@pytest.fixture
+def instrumentation(environment):
+    """
+Enables recording operations for one test.
+
+:return: (object) Instrumentation instance
+:since:  v0.2.00
+    """
+
+    Instrumentation.set_enabled(True)
+
+    _return = Instrumentation.get_instance()
+    _return.clear()
+
+    yield _return
+
+    Instrumentation.set_enabled(False)
+#
+
+def test_vfs_open_recorded_once_per_open(root_directory, instrumentation):
+    entry = new_file(root_directory, b"0123456789")
+    entry.close()
+
+    entry = Entry.load_id(entry.get_id())
+    instrumentation.clear()
+
+    for _ in range(3): assert b"".join(bytes(data) for data in entry.iter_range()) == b"0123456789"
+
+    entry.close()
+
+    operations = instrumentation.get_snapshot()['operations']
+
+    assert operations['vfs_open']['count'] == 1
+    assert operations['iter_range']['count'] == 3
+    assert operations['iter_range']['bytes_read'] == 30
+#
+
+def test_disabled_at_runtime(root_directory, instrumentation):
+    Instrumentation.set_enabled(False)
+
+    new_file(root_directory, b"0123456789").close()
+
+    assert instrumentation.get_snapshot()['operations'] == { }
+#
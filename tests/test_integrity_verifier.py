@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name,unused-argument
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+from dNG.data.file_center.integrity_verifier import IntegrityVerifier
+from dNG.data.file_center.upload_session import UploadSession
+from dNG.data.settings import Settings
+from dNG.vfs.implementation import Implementation
+
+from conftest import new_directory, new_file
+
+def _append_to_stored_file(entry, data):
+    """
+Appends the given data to the stored file of the given entry without
+updating the entry.
+
+:param entry: Entry instance
+:param data: Data to append
+
+:since: v0.2.00
+    """
+
+    vfs_object = Implementation.load_vfs_url(entry.get_vfs_url())
+
+    try:
+        vfs_object.seek(vfs_object.get_size())
+        vfs_object.write(data)
+    finally: vfs_object.close()
+#
+
+def test_repair_applies_size_delta(root_directory, tree_totals_enabled):
+    owner_id = root_directory.get_data_attributes("owner_id")['owner_id']
+    directory = new_directory(root_directory, "directory")
+
+    entry = new_file(directory, b"12345")
+    entry.close()
+
+    _append_to_stored_file(entry, b"678")
+
+    integrity_verifier = IntegrityVerifier(is_repair = True, grace_period = 0)
+    issues = [ ]
+    integrity_verifier.set_issue_callback(issues.append)
+
+    stats = integrity_verifier.run()
+
+    assert { "id": entry.get_id(), "type": IntegrityVerifier.ISSUE_SIZE_MISMATCH, "expected": 5, "actual": 8 } in issues
+    assert stats['repaired'] >= 1
+
+    assert Entry.load_id(entry.get_id()).get_data_attributes("size")['size'] == 8
+    assert Entry.get_owner_usage(owner_id) == { "size": 8, "items": 1 }
+    assert Entry.load_id(directory.get_id()).get_tree_size() == 8
+    assert Entry.load_id(root_directory.get_id()).get_tree_size() == 8
+    assert Entry.load_id(root_directory.get_id()).get_tree_items() == 1
+#
+
+def test_recently_updated_stored_file_skipped(root_directory):
+    entry = new_file(root_directory, b"12345")
+    entry.close()
+
+    _append_to_stored_file(entry, b"678")
+
+    stats = IntegrityVerifier(is_repair = True, grace_period = 3600).run()
+
+    assert stats['skipped'] >= 1
+    assert Entry.load_id(entry.get_id()).get_data_attributes("size")['size'] == 5
+#
+
+def test_upload_session_entry_skipped(environment):
+    upload_session = UploadSession.new("upload", "upload_owner")
+    upload_session.append_chunk(0, b"12345")
+
+    entry = upload_session.get_entry()
+    _append_to_stored_file(entry, b"678")
+
+    issues = [ ]
+
+    integrity_verifier = IntegrityVerifier(is_repair = True, grace_period = 0)
+    integrity_verifier.set_issue_callback(issues.append)
+    integrity_verifier.run()
+
+    assert entry.get_id() not in [ issue['id'] for issue in issues ]
+    assert Entry.load_id(entry.get_id()).get_data_attributes("size")['size'] == 5
+
+    upload_session.abort()
+#
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from uuid import uuid4
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+from dNG.data.file_center.quota_exceeded_exception import QuotaExceededException
+from dNG.database.connection import Connection
+from dNG.database.transaction_context import TransactionContext
+
+from conftest import new_file
+
+def test_write_within_and_beyond_quota(root_directory):
+    owner_id = root_directory.get_data_attributes("owner_id")['owner_id']
+    Entry.set_owner_quota(owner_id, 10)
+
+    entry = new_file(root_directory, b"12345678")
+    entry.close()
+
+    assert Entry.get_owner_usage(owner_id) == { "size": 8, "items": 1 }
+
+    entry = Entry.load_id(entry.get_id())
+    entry.get_vfs_object().seek(8)
+    entry.write(b"90")
+
+    with pytest.raises(QuotaExceededException): entry.write(b"X")
+
+    entry.close()
+
+    assert Entry.get_owner_usage(owner_id)['size'] == 10
+#
+
+def test_quota_looked_up_once_per_open(root_directory, monkeypatch):
+    owner_id = root_directory.get_data_attributes("owner_id")['owner_id']
+    Entry.set_owner_quota(owner_id, 1024)
+
+    calls = [ ]
+    _get_owner_quota = Entry._get_owner_quota
+
+    def _get_owner_quota_counted(owner_id):
+        calls.append(owner_id)
+        return _get_owner_quota(owner_id)
+    #
+
+    monkeypatch.setattr(Entry, "_get_owner_quota", staticmethod(_get_owner_quota_counted))
+
+    entry = new_file(root_directory, b"")
+    for _ in range(10): entry.write(b"0123456789")
+    entry.close()
+
+    assert len(calls) == 1
+    assert Entry.get_owner_usage(owner_id)['size'] == 100
+#
+
+def test_owner_usage_created_once():
+    owner_id = uuid4().hex
+    connection = Connection.get_instance()
+
+    for _ in range(2):
+        with connection, TransactionContext(): Entry._update_owner_usage(connection, owner_id, 5, 1)
+    #
+
+    assert Entry.get_owner_usage(owner_id) == { "size": 10, "items": 2 }
+#
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,unused-argument
+
+from threading import Thread
+from uuid import uuid4
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+from dNG.data.file_center.owner_root_directory_cache import OwnerRootDirectoryCache
+from dNG.database.nothing_matched_exception import NothingMatchedException
+
+def test_cache_hit(environment):
+    owner_id = uuid4().hex
+    owner_root_directory_cache = OwnerRootDirectoryCache.get_instance()
+
+    entry_id = Entry.load_or_create_owner_root_directory(owner_id).get_id()
+    assert owner_root_directory_cache.get(owner_id) == entry_id
+
+    hits = owner_root_directory_cache.get_stats()['hits']
+
+    assert Entry.load_owner_root_directory(owner_id).get_id() == entry_id
+    assert owner_root_directory_cache.get_stats()['hits'] == hits + 1
+#
+
+def test_eviction_at_size_limit():
+    owner_root_directory_cache = OwnerRootDirectoryCache()
+    owner_root_directory_cache.max_size = 2
+
+    owner_root_directory_cache.set("a", "1")
+    owner_root_directory_cache.set("b", "2")
+
+    assert owner_root_directory_cache.get("a") == "1"
+
+    owner_root_directory_cache.set("c", "3")
+
+    assert owner_root_directory_cache.get("b") is None
+    assert owner_root_directory_cache.get("a") == "1"
+    assert owner_root_directory_cache.get("c") == "3"
+
+    owner_root_directory_cache.invalidate_entry_id("2")
+    assert owner_root_directory_cache.get("a") == "1"
+
+    stats = owner_root_directory_cache.get_stats()
+
+    assert stats['size'] == 2
+    assert stats['evictions'] == 1
+#
+
+def test_invalidated_on_owner_change(environment):
+    owner_id = uuid4().hex
+    owner_root_directory_cache = OwnerRootDirectoryCache.get_instance()
+
+    entry = Entry.load_or_create_owner_root_directory(owner_id)
+    entry_id = entry.get_id()
+
+    entry.set_data_attributes(owner_id = uuid4().hex)
+    entry.save()
+
+    assert owner_root_directory_cache.get(owner_id) is None
+    with pytest.raises(NothingMatchedException): Entry.load_owner_root_directory(owner_id)
+
+    assert Entry.load_or_create_owner_root_directory(owner_id).get_id() != entry_id
+#
+
+def test_stale_entry_id_not_returned(environment):
+    owner_id = uuid4().hex
+    owner_root_directory_cache = OwnerRootDirectoryCache.get_instance()
+
+    entry_id = Entry.load_or_create_owner_root_directory(owner_id).get_id()
+
+    # Cache the root directory of another owner as if the entry has been
+    # changed without invalidating the cache.
+    stale_entry_id = Entry.load_or_create_owner_root_directory(uuid4().hex).get_id()
+    owner_root_directory_cache.set(owner_id, stale_entry_id)
+
+    assert Entry.load_owner_root_directory(owner_id).get_id() == entry_id
+    assert owner_root_directory_cache.get(owner_id) == entry_id
+#
+
+def test_invalidated_on_delete(environment):
+    owner_id = uuid4().hex
+    owner_root_directory_cache = OwnerRootDirectoryCache.get_instance()
+
+    entry = Entry.load_or_create_owner_root_directory(owner_id)
+    entry_id = entry.get_id()
+
+    Entry.load_id(entry_id).delete()
+
+    assert owner_root_directory_cache.get(owner_id) is None
+    with pytest.raises(NothingMatchedException): Entry.load_owner_root_directory(owner_id)
+
+    assert Entry.load_or_create_owner_root_directory(owner_id).get_id() != entry_id
+#
+
+def test_owner_lock():
+    owner_root_directory_cache = OwnerRootDirectoryCache()
+    owner_ids_locked = [ ]
+
+    def _lock_owner(owner_id):
+        with owner_root_directory_cache.get_owner_lock(owner_id): owner_ids_locked.append(owner_id)
+    #
+
+    with owner_root_directory_cache.get_owner_lock("a"):
+        threads = [ Thread(target = _lock_owner, args = ( owner_id, )) for owner_id in ( "a", "b" ) ]
+        for thread in threads: thread.start()
+
+        threads[1].join(5)
+        threads[0].join(0.1)
+
+        assert threads[0].is_alive()
+        assert owner_ids_locked == [ "b" ]
+    #
+
+    threads[0].join(5)
+
+    assert owner_ids_locked == [ "b", "a" ]
+    assert owner_root_directory_cache.owner_locks == { }
+#
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name
+
+from uuid import uuid4
+
+import pytest
+
+from dNG.data.file_center.permission_batch import PermissionBatch
+from dNG.database.connection import Connection
+
+from conftest import new_directory
+
+class _UserProfile(object):
+    """
+User profile providing the methods used by PermissionBatch.
+
+:since: v0.2.00
+    """
+
+    def __init__(self, user_id, user_type = "me"):
+        """
+Constructor __init__(_UserProfile)
+
+:param user_id: User ID
+:param user_type: User type
+
+:since: v0.2.00
+        """
+
+        self.user_id = user_id
+        """
+User ID
+        """
+        self.user_type = user_type
+        """
+User type
+        """
+    #
+
+    def get_id(self):
+        """
+Returns the user ID.
+
+:return: (str) User ID
+:since:  v0.2.00
+        """
+
+        return self.user_id
+    #
+
+    def is_type(self, user_type):
+        """
+Returns true if the user is of the given type.
+
+:param user_type: User type
+
+:return: (bool) True if matching
+:since:  v0.2.00
+        """
+
+        return (self.user_type == user_type)
+    #
+#
+
+@pytest.fixture
+def user_profile():
+    """
+Returns the profile of a new registered user.
+
+:return: (object) User profile
+:since:  v0.2.00
+    """
+
+    return _UserProfile(uuid4().hex)
+#
+
+def _add_acl_entry(entry, owner_id, permission):
+    """
+Adds an ACL entry for the given entry.
+
+:param entry: Entry instance
+:param owner_id: User or group ID the ACL entry applies to
+:param permission: Permission granted
+
+:since: v0.2.00
+    """
+
+    ( db_acl_class, db_acl_owned_column ) = PermissionBatch._get_db_acl_data()
+
+    with Connection.get_instance() as connection:
+        connection.add(db_acl_class(**{ "id": uuid4().hex,
+                                        db_acl_owned_column.key: entry.get_id(),
+                                        "owner_id": owner_id,
+                                        "owner_permission": permission
+                                      }))
+    #
+#
+
+def _new_entry(parent, guest_permission = "", user_permission = "", is_locked = False, owner_id = None):
+    """
+Adds a new directory entry with the given permission settings to the given
+parent.
+
+:param parent: Parent entry
+:param guest_permission: Guest permission
+:param user_permission: Permission of registered users
+:param is_locked: True to lock the entry
+:param owner_id: Owner ID; a new one if not given
+
+:return: (object) Entry instance
+:since:  v0.2.00
+    """
+
+    _return = new_directory(parent, uuid4().hex)
+
+    _return.set_data_attributes(guest_permission = guest_permission,
+                                user_permission = user_permission,
+                                locked = is_locked,
+                                owner_id = (uuid4().hex if (owner_id is None) else owner_id)
+                               )
+
+    _return.save()
+
+    return _return
+#
+
+def test_owner_and_administrator(root_directory, user_profile):
+    entry = _new_entry(root_directory, owner_id = user_profile.get_id())
+    other_entry = _new_entry(root_directory)
+
+    permission_batch = PermissionBatch(user_profile)
+    assert permission_batch.is_writable(entry)
+    assert not permission_batch.is_readable(other_entry)
+
+    assert PermissionBatch(_UserProfile(uuid4().hex, "ad")).is_writable(other_entry)
+#
+
+def test_locked_entry_read_only_for_owner(root_directory, user_profile):
+    entry = _new_entry(root_directory, is_locked = True, owner_id = user_profile.get_id())
+
+    permission_batch = PermissionBatch(user_profile)
+
+    assert permission_batch.is_readable(entry)
+    assert not permission_batch.is_writable(entry)
+    assert not PermissionBatch(_UserProfile(uuid4().hex, "ad")).is_writable(entry)
+#
+
+def test_guest_and_user_permissions(root_directory, user_profile):
+    entry = _new_entry(root_directory, guest_permission = "r", user_permission = "w")
+
+    assert PermissionBatch().get_permissions([ entry ]) == { entry.get_id(): "r" }
+    assert PermissionBatch(user_profile).get_permissions([ entry ]) == { entry.get_id(): "w" }
+#
+
+def test_acl_permission_combined_with_user_permission(root_directory, user_profile):
+    entries = [ _new_entry(root_directory, user_permission = "w"),
+                _new_entry(root_directory, user_permission = "r"),
+                _new_entry(root_directory)
+              ]
+
+    _add_acl_entry(entries[0], user_profile.get_id(), "r")
+    _add_acl_entry(entries[1], user_profile.get_id(), "w")
+
+    group_id = uuid4().hex
+    _add_acl_entry(entries[2], group_id, "r")
+
+    expected_permissions = { entries[0].get_id(): "w", entries[1].get_id(): "w", entries[2].get_id(): "r" }
+
+    assert PermissionBatch(user_profile, [ group_id ]).get_permissions(entries) == expected_permissions
+    assert PermissionBatch(user_profile, [ group_id ]).get_permissions([ entry.get_id() for entry in entries ]) == expected_permissions
+
+    sub_entry_permissions = PermissionBatch(user_profile, [ group_id ]).get_sub_entry_permissions(root_directory)
+    assert { entry_id: sub_entry_permissions[entry_id] for entry_id in expected_permissions } == expected_permissions
+#
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name,unused-argument
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+from dNG.data.file_center.processing_queue import ProcessingQueue
+from dNG.data.settings import Settings
+from dNG.database.connection import Connection
+from dNG.database.instances.file_center_processing_job import FileCenterProcessingJob as _DbFileCenterProcessingJob
+
+from conftest import new_file
+
+@pytest.fixture
+def processing_enabled(environment):
+    """
+Enables post-ingest processing with the checksum and MIME type stages for
+one test.
+
+:since: v0.2.00
+    """
+
+    settings = { "pas_file_center_processing_enabled": True,
+                 "pas_file_center_processing_stages": [ "checksum", "mimetype" ]
+               }
+
+    settings_previous = { key: Settings.get(key) for key in settings }
+    for key in settings: Settings.set(key, settings[key])
+
+    yield
+
+    for key in settings_previous: Settings.set(key, settings_previous[key])
+#
+
+def _get_processing_job(entry_id):
+    """
+Returns the processing job of the given entry ID.
+
+:param entry_id: Entry ID
+
+:return: (object) SQLAlchemy database instance; None if not queued
+:since:  v0.2.00
+    """
+
+    connection = Connection.get_instance()
+    with connection: return connection.query(_DbFileCenterProcessingJob).get(entry_id)
+#
+
+def test_job_queued_on_insert_and_processed(root_directory, processing_enabled):
+    entry = new_file(root_directory, b"hello world", "readme.txt")
+    entry.close()
+
+    assert entry.get_processing_state() == Entry.PROCESSING_STATE_QUEUED
+    assert _get_processing_job(entry.get_id()) is not None
+
+    ProcessingQueue(workers = 1).run()
+
+    entry = Entry.load_id(entry.get_id())
+
+    assert entry.get_processing_state() == Entry.PROCESSING_STATE_DONE
+    assert entry.get_content_digest() is not None
+    assert _get_processing_job(entry.get_id()) is None
+#
+
+def test_job_deleted_with_entry(root_directory, processing_enabled):
+    entry = new_file(root_directory, b"hello world")
+    entry.close()
+
+    entry_id = entry.get_id()
+    entry.delete()
+
+    assert _get_processing_job(entry_id) is None
+#
+
+def test_no_job_queued_if_disabled(root_directory):
+    entry = new_file(root_directory, b"hello world")
+    entry.close()
+
+    assert entry.get_processing_state() is None
+    assert _get_processing_job(entry.get_id()) is None
+
+    entry.delete()
+#
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+import pytest
+
+from dNG.data.file_center.query_plan_check import QueryPlanCheck
+from dNG.database.instances.data_linker import DataLinker as _DbDataLinker
+from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+from dNG.runtime.value_exception import ValueException
+
+def test_query_plans_supported_by_indices():
+    query_plans = QueryPlanCheck().run()
+
+    assert set(query_plans) == { "content_list", "content_list_page", "owner_root_directory" }
+
+    for access_path in query_plans:
+        assert len(query_plans[access_path]) > 0
+        assert not any("TEMP B-TREE" in query_plan_line for query_plan_line in query_plans[access_path])
+    #
+#
+
+def test_query_plan_partial_sort_rejected(monkeypatch):
+    query_plan_check = QueryPlanCheck()
+
+    monkeypatch.setattr(query_plan_check,
+                        "get_content_list_query",
+                        lambda: (query_plan_check.db_session.query(_DbFileCenterEntry)
+                                 .filter(_DbDataLinker.id_parent == "0" * 32)
+                                 .order_by(_DbDataLinker.position.asc(), _DbFileCenterEntry.vfs_type.asc())
+                                )
+                       )
+
+    with pytest.raises(ValueException): query_plan_check.run()
+#
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,unused-argument
+
+from sqlalchemy import BIGINT, CHAR, Column, VARCHAR
+
+from dNG.database.connection import Connection
+from dNG.database.instances.abstract import Abstract
+from dNG.plugins.database.pas_file_center import _add_missing_columns
+
+class _MigrationTestEntry(Abstract):
+    """
+Table migrated by the tests below
+    """
+
+    __tablename__ = "pas_file_center_migration_test"
+
+    id = Column(VARCHAR(32), primary_key = True)
+    tree_size = Column(BIGINT, server_default = "0", nullable = False)
+    guest_permission = Column(CHAR(1), server_default = "", nullable = False)
+    processing_state = Column(VARCHAR(20))
+#
+
+def test_add_missing_columns_to_existing_rows(environment):
+    connection = Connection.get_instance()
+
+    with connection:
+        db_bind = connection.get_bind()
+
+        db_bind.execute("DROP TABLE IF EXISTS pas_file_center_migration_test")
+        db_bind.execute("CREATE TABLE pas_file_center_migration_test (id VARCHAR(32) PRIMARY KEY)")
+        db_bind.execute("INSERT INTO pas_file_center_migration_test (id) VALUES ('existing')")
+    #
+
+    assert (sorted(_add_missing_columns(_MigrationTestEntry))
+            == [ "guest_permission", "processing_state", "tree_size" ]
+           )
+
+    with connection:
+        db_row = connection.query(_MigrationTestEntry.tree_size,
+                                  _MigrationTestEntry.guest_permission,
+                                  _MigrationTestEntry.processing_state
+                                 ).filter(_MigrationTestEntry.id == "existing").one()
+    #
+
+    assert tuple(db_row) == ( 0, "", None )
+    assert _add_missing_columns(_MigrationTestEntry) == [ ]
+#
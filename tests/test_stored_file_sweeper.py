@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,unused-argument
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+from dNG.data.file_center.stored_file_sweeper import StoredFileSweeper
+from dNG.database.connection import Connection
+from dNG.database.instances.file_center_entry import FileCenterEntry as _DbFileCenterEntry
+from dNG.database.transaction_context import TransactionContext
+from dNG.runtime.value_exception import ValueException
+from dNG.vfs.implementation import Implementation
+
+from conftest import is_stored, new_file
+
+def _new_orphaned_stored_file(data):
+    """
+Creates a stored file not referenced by any entry.
+
+:param data: File data
+
+:return: (str) VFS URL
+:since:  v0.2.00
+    """
+
+    vfs_object = Implementation.new_vfs_url(Implementation.TYPE_FILE, "x-file-store://")
+
+    try:
+        vfs_object.write(data)
+        return vfs_object.get_url()
+    finally: vfs_object.close()
+#
+
+def test_normalized_vfs_url():
+    assert (StoredFileSweeper._get_normalized_vfs_url("x-file-store:///ab/cd")
+            == StoredFileSweeper._get_normalized_vfs_url("x-file-store://ab/cd")
+            == StoredFileSweeper._get_normalized_vfs_url("X-File-Store:///ab//cd/")
+            == StoredFileSweeper._get_normalized_vfs_url("x-file-store:///ab/%63d")
+            == "x-file-store:///ab/cd"
+           )
+#
+
+def test_sweeper_deletes_orphaned_stored_files_only(root_directory):
+    entry = new_file(root_directory, b"referenced")
+    entry_vfs_url = entry.get_data_attributes("vfs_url")['vfs_url']
+    entry.close()
+
+    orphaned_vfs_url = _new_orphaned_stored_file(b"orphaned")
+
+    stats = StoredFileSweeper(grace_period = 0, max_orphan_ratio = 1).run()
+
+    assert stats['deleted'] >= 1
+    assert is_stored(entry_vfs_url)
+    assert (not is_stored(orphaned_vfs_url))
+#
+
+def test_sweeper_matches_references_in_other_url_form(root_directory):
+    entry = new_file(root_directory, b"referenced")
+    entry_data = entry.get_data_attributes("id", "vfs_url")
+    entry.close()
+
+    # Store the reference without the empty authority used by the file store
+    vfs_url = entry_data['vfs_url'].replace(":///", "://", 1)
+
+    connection = Connection.get_instance()
+
+    with connection, TransactionContext():
+        db_instance = connection.query(_DbFileCenterEntry).get(entry_data['id'])
+        db_instance.vfs_url = vfs_url
+        db_instance.vfs_url_hash = Entry.get_vfs_url_hash(vfs_url)
+    #
+
+    StoredFileSweeper(grace_period = 0, max_orphan_ratio = 1).run()
+
+    assert is_stored(entry_data['vfs_url'])
+#
+
+def test_sweeper_refuses_to_delete_above_orphan_ratio(root_directory):
+    new_file(root_directory, b"referenced").close()
+    orphaned_vfs_urls = [ _new_orphaned_stored_file(b"orphaned") for _ in range(3) ]
+
+    with pytest.raises(ValueException):
+        StoredFileSweeper(grace_period = 0, max_orphan_ratio = 0).run()
+    #
+
+    assert all(is_stored(vfs_url) for vfs_url in orphaned_vfs_urls)
+
+    stats = StoredFileSweeper(grace_period = 0, is_dry_run = True, max_orphan_ratio = 0).run()
+    assert stats['orphaned'] >= 3
+    assert all(is_stored(vfs_url) for vfs_url in orphaned_vfs_urls)
+#
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name
+
+import pytest
+
+from dNG.data.file_center import entry as entry_module
+from dNG.data.file_center.entry import Entry
+from dNG.data.settings import Settings
+from dNG.database.connection import Connection
+from dNG.database.instances.file_center_stored_object import FileCenterStoredObject as _DbFileCenterStoredObject
+
+from conftest import new_directory, new_file
+
+@pytest.fixture
+def transaction_counter(monkeypatch):
+    """
+Counts the transactions started by Entry.
+
+:return: (list) List with the number of transactions started
+:since:  v0.2.00
+    """
+
+    _return = [ 0 ]
+    transaction_context_class = entry_module.TransactionContext
+
+    class _CountedTransactionContext(transaction_context_class):
+        """
+Transaction context counting the transactions started.
+        """
+
+        def __enter__(self):
+            _return[0] += 1
+            return transaction_context_class.__enter__(self)
+        #
+    #
+
+    monkeypatch.setattr(entry_module, "TransactionContext", _CountedTransactionContext)
+
+    return _return
+#
+
+@pytest.fixture
+def deduplicated_files(root_directory):
+    """
+Adds two files with the same content deduplicated to one stored file.
+
+:return: (tuple) Entry instances of the files
+:since:  v0.2.00
+    """
+
+    is_enabled = Settings.get("pas_file_center_deduplication_enabled", False)
+    Settings.set("pas_file_center_deduplication_enabled", True)
+
+    try:
+        _return = tuple(Entry.load_id(new_file(root_directory, b"abc").get_id()) for _ in range(2))
+    finally: Settings.set("pas_file_center_deduplication_enabled", is_enabled)
+
+    return _return
+#
+
+def _get_stored_file_data(entry):
+    """
+Returns the VFS URL, content digest and stored object reference count of
+the given entry.
+
+:param entry: Entry instance
+
+:return: (tuple) VFS URL, content digest and reference count
+:since:  v0.2.00
+    """
+
+    entry_data = Entry.load_id(entry.get_id()).get_data_attributes("vfs_url", "vfs_url_hash", "content_digest")
+
+    with Connection.get_instance() as connection:
+        reference_count = (connection.query(_DbFileCenterStoredObject.reference_count)
+                           .filter(_DbFileCenterStoredObject.vfs_url_hash == entry_data['vfs_url_hash'])
+                           .scalar()
+                          )
+    #
+
+    return ( entry_data['vfs_url'], entry_data['content_digest'], reference_count )
+#
+
+@pytest.fixture
+def shared_files(root_directory):
+    """
+Adds a file and a copy-on-write copy of it sharing the stored file.
+
+:return: (tuple) Entry instances of the file and of its copy
+:since:  v0.2.00
+    """
+
+    directory = new_directory(root_directory, "a")
+    file_entry = new_file(directory, b"abc", "b.txt")
+
+    directory_copy = directory.copy_subtree(root_directory)
+    file_entry_copy = next(directory_copy.iter_content_list())
+
+    return ( file_entry, file_entry_copy )
+#
+
+def test_detach_skipped_for_unshared_file(root_directory, transaction_counter):
+    entry = Entry.load_id(new_file(root_directory, b"abc").get_id())
+    vfs_url = entry.get_data_attributes("vfs_url")['vfs_url']
+
+    assert entry._detach_stored_object() == vfs_url
+    assert transaction_counter[0] == 0
+#
+
+def test_detach_shared_file(shared_files, transaction_counter):
+    ( file_entry, file_entry_copy ) = shared_files
+    vfs_url = file_entry.get_data_attributes("vfs_url")['vfs_url']
+
+    assert file_entry_copy.get_data_attributes("vfs_url")['vfs_url'] == vfs_url
+
+    vfs_url_copy = file_entry_copy._detach_stored_object()
+
+    assert vfs_url_copy != vfs_url
+    assert transaction_counter[0] == 1
+
+    assert file_entry._detach_stored_object() == vfs_url
+    assert transaction_counter[0] == 1
+#
+
+def test_load_vfs_url_deterministic(shared_files):
+    vfs_url = shared_files[0].get_data_attributes("vfs_url")['vfs_url']
+    entry_id = min(entry.get_id() for entry in shared_files)
+
+    assert Entry.load_vfs_url(vfs_url).get_id() == entry_id
+    assert Entry.load_vfs_urls([ vfs_url ])[vfs_url].get_id() == entry_id
+#
+
+def test_read_keeps_deduplicated_file(deduplicated_files):
+    stored_file_data = _get_stored_file_data(deduplicated_files[1])
+
+    assert stored_file_data[0] == _get_stored_file_data(deduplicated_files[0])[0]
+    assert stored_file_data[1] is not None
+    assert stored_file_data[2] == 2
+
+    entry = deduplicated_files[1]
+
+    assert entry.read() == b"abc"
+    entry.seek(1)
+    assert entry.read() == b"bc"
+    assert entry.get_size() == 3
+
+    entry.close()
+
+    assert _get_stored_file_data(entry) == stored_file_data
+#
+
+def test_write_detaches_deduplicated_file(deduplicated_files):
+    stored_file_data = _get_stored_file_data(deduplicated_files[0])
+    entry = deduplicated_files[1]
+
+    assert entry.read(1) == b"a"
+    entry.write(b"x")
+    entry.close()
+
+    assert _get_stored_file_data(entry)[0] != stored_file_data[0]
+    assert Entry.load_id(entry.get_id()).read() == b"axc"
+    assert Entry.load_id(deduplicated_files[0].get_id()).read() == b"abc"
+#
+
+def test_read_keeps_copy_on_write_file(shared_files):
+    stored_file_data = _get_stored_file_data(shared_files[0])
+    entry = Entry.load_id(shared_files[1].get_id())
+
+    assert _get_stored_file_data(entry) == stored_file_data
+    assert entry.read() == b"abc"
+
+    entry.close()
+
+    assert _get_stored_file_data(entry) == stored_file_data
+    assert _get_stored_file_data(shared_files[0]) == stored_file_data
+#
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,unused-argument
+
+from uuid import uuid4
+
+import pytest
+
+from dNG.data.file_center.entry import Entry
+from dNG.data.file_center.upload_session import UploadSession
+from dNG.database.connection import Connection
+from dNG.database.instances.file_center_upload_session import FileCenterUploadSession as _DbFileCenterUploadSession
+from dNG.database.transaction_context import TransactionContext
+from dNG.runtime.value_exception import ValueException
+
+from conftest import is_stored
+
+def test_chunks_committed(root_directory):
+    upload_session = UploadSession.new("upload.bin", uuid4().hex, 10)
+
+    assert upload_session.append_chunk(0, b"01234") == 5
+    assert UploadSession.load_id(upload_session.get_id()).append_chunk(3, b"34567") == 8
+
+    upload_session = UploadSession.load_id(upload_session.get_id())
+
+    assert upload_session.append_chunk(0, b"012") == 8
+    with pytest.raises(ValueException): upload_session.commit(root_directory)
+
+    assert upload_session.append_chunk(8, b"89") == 10
+
+    entry = upload_session.commit(root_directory)
+
+    assert b"".join(bytes(data) for data in entry.iter_range()) == b"0123456789"
+    entry.close()
+#
+
+def test_concurrent_chunk_rejected(environment):
+    upload_session = UploadSession.new("upload.bin", uuid4().hex)
+    assert upload_session.get_size_received() == 0
+
+    # Another process receives the first chunk in the meantime
+    db_table = _DbFileCenterUploadSession.__table__
+
+    Connection.get_instance().get_bind().execute(db_table.update()
+                                                 .where(db_table.c.id == upload_session.get_id())
+                                                 .values(size_received = 5)
+                                                )
+
+    with pytest.raises(ValueException): upload_session.append_chunk(0, b"01234")
+
+    entry = upload_session.get_entry()
+    entry.close()
+
+    assert entry.get_data_attributes("size")['size'] == 0
+    upload_session.abort()
+#
+
+def test_abort_deletes_stored_file_after_commit(environment):
+    upload_session = UploadSession.new("upload.bin", uuid4().hex)
+    upload_session.append_chunk(0, b"01234")
+
+    vfs_url = upload_session.get_entry().get_vfs_url()
+
+    with TransactionContext():
+        upload_session.abort()
+        assert is_stored(vfs_url)
+    #
+
+    assert (not is_stored(vfs_url))
+#
+
+def test_abort_rolled_back_keeps_stored_file(environment):
+    upload_session = UploadSession.new("upload.bin", uuid4().hex)
+    upload_session.append_chunk(0, b"01234")
+
+    upload_session_id = upload_session.get_id()
+    vfs_url = upload_session.get_entry().get_vfs_url()
+
+    with pytest.raises(RuntimeError):
+        with TransactionContext():
+            upload_session.abort()
+            raise RuntimeError("rollback")
+        #
+    #
+
+    assert is_stored(vfs_url)
+
+    upload_session = UploadSession.load_id(upload_session_id)
+    assert Entry.load_id(upload_session.get_entry().get_id()).get_vfs_url() == vfs_url
+
+    upload_session.abort()
+    assert (not is_stored(vfs_url))
+#
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_expire_counts_failures(environment, monkeypatch):
+    upload_sessions = [ UploadSession.new("upload.bin", uuid4().hex) for _ in range(3) ]
+    failing_id = upload_sessions[1].get_id()
+
+    abort = UploadSession.abort
+
+    def _abort(upload_session):
+        if (upload_session.get_id() == failing_id): raise IOError("abort failed")
+        abort(upload_session)
+    #
+
+    monkeypatch.setattr(UploadSession, "abort", _abort)
+
+    stats = UploadSession.expire(-1)
+
+    assert stats['aborted'] >= 2
+    assert stats['failed'] == 1
+
+    # Entries still open for aborted upload sessions are closed without
+    # synchronizing the size of the deleted stored file.
+    for upload_session in upload_sessions: upload_session.get_entry().close()
+#
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;file_center
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasFileCenterVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module,redefined-outer-name
+
+from threading import Timer
+
+import pytest
+
+from dNG.data.file_center.vfs_handle_pool import VfsHandlePool
+from dNG.runtime.io_exception import IOException
+
+from conftest import new_file
+
+@pytest.fixture
+def vfs_urls(root_directory):
+    """
+Adds three stored files to the root directory.
+
+:return: (list) VFS URLs
+:since:  v0.2.00
+    """
+
+    return [ new_file(root_directory, data).get_data_attributes("vfs_url")['vfs_url']
+             for data in ( b"a", b"b", b"c" )
+           ]
+#
+
+@pytest.fixture
+def vfs_handle_pool():
+    """
+Returns a new pool limited to two open VFS objects.
+
+:return: (object) VfsHandlePool instance
+:since:  v0.2.00
+    """
+
+    _return = VfsHandlePool()
+    _return.acquire_timeout = 0.2
+    _return.max_open = 2
+
+    yield _return
+
+    _return.clear()
+#
+
+def test_max_open_enforced(vfs_handle_pool, vfs_urls):
+    vfs_objects = [ vfs_handle_pool.acquire(vfs_url) for vfs_url in vfs_urls[:2] ]
+
+    with pytest.raises(IOException): vfs_handle_pool.acquire(vfs_urls[2])
+
+    assert vfs_handle_pool.get_stats()['open'] == 2
+    assert vfs_handle_pool.get_stats()['leased'] == 2
+
+    for ( vfs_url, vfs_object ) in zip(vfs_urls, vfs_objects): vfs_handle_pool.release(vfs_url, vfs_object)
+#
+
+def test_idle_vfs_object_closed_for_new_one(vfs_handle_pool, vfs_urls):
+    vfs_objects = [ vfs_handle_pool.acquire(vfs_url) for vfs_url in vfs_urls[:2] ]
+    vfs_handle_pool.release(vfs_urls[0], vfs_objects[0])
+
+    vfs_object = vfs_handle_pool.acquire(vfs_urls[2])
+    assert vfs_object.read() == b"c"
+
+    assert vfs_handle_pool.get_stats()['open'] == 2
+    assert vfs_handle_pool.get_stats()['idle'] == 0
+
+    vfs_handle_pool.release(vfs_urls[1], vfs_objects[1])
+    vfs_handle_pool.release(vfs_urls[2], vfs_object)
+
+    assert vfs_handle_pool.get_stats()['open'] == 2
+#
+
+def test_acquire_waits_for_release(vfs_handle_pool, vfs_urls):
+    vfs_handle_pool.acquire_timeout = 5
+
+    vfs_objects = [ vfs_handle_pool.acquire(vfs_url) for vfs_url in vfs_urls[:2] ]
+
+    timer = Timer(0.1, vfs_handle_pool.release, ( vfs_urls[0], vfs_objects[0] ))
+    timer.start()
+
+    vfs_object = vfs_handle_pool.acquire(vfs_urls[2])
+    timer.join()
+
+    assert vfs_object.read() == b"c"
+    assert vfs_handle_pool.get_stats()['open'] == 2
+
+    vfs_handle_pool.release(vfs_urls[1], vfs_objects[1])
+    vfs_handle_pool.release(vfs_urls[2], vfs_object)
+#